@@ -10,7 +10,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.core.database import Base
 from app.config import settings
-from app.models import User, Organization, Task  # Import all models
+from app.models import User, Organization, Task, TaskTombstone, TaskEvent, TenantShard, UserDirectory, WebhookEndpoint  # Import all models
 
 # this is the Alembic Config object
 config = context.config
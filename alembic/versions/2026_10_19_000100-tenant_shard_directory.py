@@ -0,0 +1,52 @@
+"""Tenant shard directory and global user index
+
+Revision ID: 0002_tenant_shard_directory
+Revises: 0001_initial
+Create Date: 2026-10-19 00:01:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0002_tenant_shard_directory'
+down_revision = '0001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tenant -> shard map (tenants without a row live on the default shard)
+    op.create_table(
+        'tenant_shards',
+        sa.Column('organization_id', sa.Integer(), nullable=False),
+        sa.Column('shard_key', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), server_default='active', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('organization_id')
+    )
+    op.create_index(op.f('ix_tenant_shards_shard_key'), 'tenant_shards', ['shard_key'], unique=False)
+    
+    # Global email index for logins
+    op.create_table(
+        'user_directory',
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('organization_id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('email')
+    )
+    op.create_index(op.f('ix_user_directory_organization_id'), 'user_directory', ['organization_id'], unique=False)
+    
+    # Backfill the index from existing users
+    op.execute(
+        "INSERT INTO user_directory (email, user_id, organization_id) "
+        "SELECT email, id, organization_id FROM users"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_directory_organization_id'), table_name='user_directory')
+    op.drop_table('user_directory')
+    
+    op.drop_index(op.f('ix_tenant_shards_shard_key'), table_name='tenant_shards')
+    op.drop_table('tenant_shards')
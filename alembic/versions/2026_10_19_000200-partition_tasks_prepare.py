@@ -0,0 +1,115 @@
+"""Create hash-partitioned tasks table and keep it in sync with the old one
+
+Revision ID: 0003_partition_tasks_prepare
+Revises: 0002_tenant_shard_directory
+Create Date: 2026-10-19 00:02:00.000000
+
+Online conversion of `tasks` to a table hash-partitioned on organization_id:
+
+1. This migration creates `tasks_partitioned` plus a trigger mirroring every
+   write on `tasks` into it. The application keeps using `tasks`.
+2. `python scripts/partition_tasks.py backfill` copies existing rows in batches
+   and records how far it got in `tasks_partition_backfill`.
+3. `python scripts/partition_tasks.py verify` checks both tables match.
+4. Migration 0004 swaps the tables in one short transaction (or, if it ran
+   before the backfill, `python scripts/partition_tasks.py swap` does).
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0003_partition_tasks_prepare'
+down_revision = '0002_tenant_shard_directory'
+branch_labels = None
+depends_on = None
+
+PARTITIONS = 16
+
+COLUMNS = "id, title, description, status, priority, organization_id, assignee_id, created_at, updated_at"
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE tasks_partitioned (
+            id INTEGER NOT NULL DEFAULT nextval('tasks_id_seq'),
+            title VARCHAR NOT NULL,
+            description TEXT,
+            status taskstatus NOT NULL,
+            priority taskpriority NOT NULL,
+            organization_id INTEGER NOT NULL,
+            assignee_id INTEGER,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            CONSTRAINT tasks_partitioned_pkey PRIMARY KEY (organization_id, id),
+            CONSTRAINT tasks_organization_id_fkey FOREIGN KEY (organization_id) REFERENCES organizations (id),
+            CONSTRAINT tasks_assignee_id_fkey FOREIGN KEY (assignee_id) REFERENCES users (id)
+        ) PARTITION BY HASH (organization_id)
+    """)
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE tasks_p{remainder} PARTITION OF tasks_partitioned "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+
+    # Local composite indexes (created on every partition); tenant first so each
+    # tenant-scoped lookup is an index range scan within one partition
+    op.create_index('ix_tasks_organization_id_status', 'tasks_partitioned', ['organization_id', 'status'])
+    op.create_index('ix_tasks_organization_id_assignee_id', 'tasks_partitioned', ['organization_id', 'assignee_id'])
+    op.create_index('ix_tasks_organization_id_title', 'tasks_partitioned', ['organization_id', 'title'])
+    # Id ranges of the backfill and its stale-row cleanup; dropped by the swap
+    op.create_index('ix_tasks_partitioned_id', 'tasks_partitioned', ['id'])
+
+    # High-water mark of each completed backfill pass: rows up to it were copied,
+    # later ones are mirrored by the trigger
+    op.create_table(
+        'tasks_partition_backfill',
+        sa.Column('backfilled_through', sa.Integer(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False)
+    )
+
+    # Mirror writes on the old table while the backfill runs
+    op.execute(f"""
+        CREATE FUNCTION tasks_sync_partitioned() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM tasks_partitioned
+                WHERE organization_id = OLD.organization_id AND id = OLD.id;
+                RETURN OLD;
+            END IF;
+            IF TG_OP = 'UPDATE' AND NEW.organization_id <> OLD.organization_id THEN
+                DELETE FROM tasks_partitioned
+                WHERE organization_id = OLD.organization_id AND id = OLD.id;
+            END IF;
+            INSERT INTO tasks_partitioned ({COLUMNS})
+            VALUES (NEW.id, NEW.title, NEW.description, NEW.status, NEW.priority,
+                    NEW.organization_id, NEW.assignee_id, NEW.created_at, NEW.updated_at)
+            ON CONFLICT (organization_id, id) DO UPDATE SET
+                title = EXCLUDED.title,
+                description = EXCLUDED.description,
+                status = EXCLUDED.status,
+                priority = EXCLUDED.priority,
+                assignee_id = EXCLUDED.assignee_id,
+                created_at = EXCLUDED.created_at,
+                updated_at = EXCLUDED.updated_at;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_sync_partitioned
+        AFTER INSERT OR UPDATE OR DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_sync_partitioned()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tasks_sync_partitioned ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS tasks_sync_partitioned()")
+    op.drop_table('tasks_partition_backfill')
+    op.drop_index('ix_tasks_partitioned_id', table_name='tasks_partitioned')
+    op.drop_index('ix_tasks_organization_id_title', table_name='tasks_partitioned')
+    op.drop_index('ix_tasks_organization_id_assignee_id', table_name='tasks_partitioned')
+    op.drop_index('ix_tasks_organization_id_status', table_name='tasks_partitioned')
+    # Dropping the parent drops every partition
+    op.drop_table('tasks_partitioned')
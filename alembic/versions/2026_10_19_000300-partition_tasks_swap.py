@@ -0,0 +1,142 @@
+"""Swap the hash-partitioned tasks table in
+
+Revision ID: 0004_partition_tasks_swap
+Revises: 0003_partition_tasks_prepare
+Create Date: 2026-10-19 00:03:00.000000
+
+Swaps only once `python scripts/partition_tasks.py backfill` has completed a
+pass (or `tasks` is empty, as in a new database). Otherwise the swap is
+skipped with a warning so `alembic upgrade head` keeps working: later
+migrations keep `tasks_partitioned` in step, and
+`python scripts/partition_tasks.py swap` runs the swap after the backfill.
+
+Row counts up to the backfill's high-water mark are compared before the lock
+is taken. Under the ACCESS EXCLUSIVE lock only rows written since (mirrored
+by the trigger) are checked, then the tables are renamed. The old heap is
+kept as `tasks_unpartitioned` so the swap can be reversed; drop it once the
+partitioned table has been validated.
+
+"""
+import logging
+from typing import Optional
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004_partition_tasks_swap'
+down_revision = '0003_partition_tasks_prepare'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# A queued ACCESS EXCLUSIVE request blocks every later query on tasks; give up instead
+LOCK_TIMEOUT = "5s"
+
+
+def swap_pending(bind) -> bool:
+    """Whether tasks_partitioned is still waiting to be swapped in."""
+    return bind.execute(sa.text("SELECT to_regclass('tasks_partitioned') IS NOT NULL")).scalar_one()
+
+
+def backfilled_through(bind) -> Optional[int]:
+    """High-water mark of the last backfill pass, 0 if there is nothing to copy, None if it has not run."""
+    mark = bind.execute(sa.text("SELECT max(backfilled_through) FROM tasks_partition_backfill")).scalar_one()
+    if mark is None and not bind.execute(sa.text("SELECT EXISTS (SELECT 1 FROM tasks)")).scalar_one():
+        return 0
+    return mark
+
+
+def swap_tables(bind) -> None:
+    """Check the copy and rename tasks_partitioned to tasks (also run by scripts/partition_tasks.py swap)."""
+    mark = backfilled_through(bind)
+    if mark is None:
+        raise RuntimeError("run `python scripts/partition_tasks.py backfill` before swapping")
+
+    # One statement, so both counts come from the same snapshot; no lock beyond ACCESS SHARE yet
+    old_count, new_count = bind.execute(
+        sa.text(
+            "SELECT (SELECT count(*) FROM tasks WHERE id <= :mark), "
+            "(SELECT count(*) FROM tasks_partitioned WHERE id <= :mark)"
+        ),
+        {"mark": mark},
+    ).one()
+    if old_count != new_count:
+        raise RuntimeError(
+            f"tasks has {old_count} rows up to id {mark} but tasks_partitioned has {new_count}; "
+            f"re-run `python scripts/partition_tasks.py backfill` before swapping"
+        )
+
+    bind.execute(sa.text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+    bind.execute(sa.text("LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE"))
+    bind.execute(sa.text("SET LOCAL lock_timeout TO DEFAULT"))
+
+    # Rows past the mark were mirrored by the trigger; only they are checked under the lock
+    missing = bind.execute(
+        sa.text(
+            "SELECT count(*) FROM tasks t WHERE t.id > :mark AND NOT EXISTS ("
+            "SELECT 1 FROM tasks_partitioned p WHERE p.organization_id = t.organization_id AND p.id = t.id)"
+        ),
+        {"mark": mark},
+    ).scalar_one()
+    if missing:
+        raise RuntimeError(f"{missing} rows written after the backfill are missing from tasks_partitioned")
+
+    bind.execute(sa.text("DROP TRIGGER IF EXISTS tasks_sync_partitioned ON tasks"))
+    bind.execute(sa.text("DROP FUNCTION IF EXISTS tasks_sync_partitioned()"))
+    bind.execute(sa.text("DROP INDEX ix_tasks_partitioned_id"))
+    bind.execute(sa.text("DROP TABLE tasks_partition_backfill"))
+    bind.execute(sa.text("ALTER TABLE tasks RENAME TO tasks_unpartitioned"))
+    bind.execute(sa.text("ALTER TABLE tasks_partitioned RENAME TO tasks"))
+    # The sequence must survive dropping the old table later
+    bind.execute(sa.text("ALTER SEQUENCE tasks_id_seq OWNED BY tasks.id"))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not swap_pending(bind):
+        # Already swapped by `python scripts/partition_tasks.py swap`
+        return
+    if backfilled_through(bind) is None:
+        logger.warning(
+            "tasks_partitioned has not been backfilled; skipping the swap. Run "
+            "`python scripts/partition_tasks.py backfill`, then `python scripts/partition_tasks.py swap`"
+        )
+        return
+    swap_tables(bind)
+
+
+def downgrade() -> None:
+    if swap_pending(op.get_bind()):
+        # The swap never ran; nothing to reverse
+        return
+
+    op.execute("LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE")
+
+    # Bring rows written after the swap back into the old heap
+    op.execute("""
+        INSERT INTO tasks_unpartitioned
+        SELECT id, title, description, status, priority, organization_id, assignee_id, created_at, updated_at
+        FROM tasks
+        ON CONFLICT (id) DO UPDATE SET
+            title = EXCLUDED.title,
+            description = EXCLUDED.description,
+            status = EXCLUDED.status,
+            priority = EXCLUDED.priority,
+            organization_id = EXCLUDED.organization_id,
+            assignee_id = EXCLUDED.assignee_id,
+            created_at = EXCLUDED.created_at,
+            updated_at = EXCLUDED.updated_at
+    """)
+    op.execute("DELETE FROM tasks_unpartitioned u WHERE NOT EXISTS (SELECT 1 FROM tasks t WHERE t.id = u.id)")
+
+    op.execute("ALTER SEQUENCE tasks_id_seq OWNED BY tasks_unpartitioned.id")
+    op.execute("ALTER TABLE tasks RENAME TO tasks_partitioned")
+    op.execute("ALTER TABLE tasks_unpartitioned RENAME TO tasks")
+    op.create_index('ix_tasks_partitioned_id', 'tasks_partitioned', ['id'])
+    op.create_table(
+        'tasks_partition_backfill',
+        sa.Column('backfilled_through', sa.Integer(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False)
+    )
+    # The sync trigger is not recreated: re-run the backfill before swapping again
@@ -0,0 +1,23 @@
+"""Add billing plan to organizations
+
+Revision ID: 0005_organization_plan
+Revises: 0004_partition_tasks_swap
+Create Date: 2026-10-19 00:04:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005_organization_plan'
+down_revision = '0004_partition_tasks_swap'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('organizations', sa.Column('plan', sa.String(), server_default='free', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('organizations', 'plan')
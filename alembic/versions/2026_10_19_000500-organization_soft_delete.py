@@ -0,0 +1,54 @@
+"""Soft delete for organizations and ON DELETE CASCADE for tenant children
+
+Revision ID: 0006_organization_soft_delete
+Revises: 0005_organization_plan
+Create Date: 2026-10-19 00:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006_organization_soft_delete'
+down_revision = '0005_organization_plan'
+branch_labels = None
+depends_on = None
+
+
+def _task_tables() -> list:
+    """tasks, plus tasks_partitioned while its swap (migration 0004) is still pending."""
+    pending = op.get_bind().execute(sa.text("SELECT to_regclass('tasks_partitioned') IS NOT NULL")).scalar_one()
+    return ['tasks', 'tasks_partitioned'] if pending else ['tasks']
+
+
+def upgrade() -> None:
+    op.add_column('organizations', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    
+    # Let the database remove children instead of the ORM loading them
+    op.drop_constraint('users_organization_id_fkey', 'users', type_='foreignkey')
+    op.create_foreign_key(
+        'users_organization_id_fkey', 'users', 'organizations',
+        ['organization_id'], ['id'], ondelete='CASCADE'
+    )
+    for table in _task_tables():
+        op.drop_constraint('tasks_organization_id_fkey', table, type_='foreignkey')
+        op.create_foreign_key(
+            'tasks_organization_id_fkey', table, 'organizations',
+            ['organization_id'], ['id'], ondelete='CASCADE'
+        )
+
+
+def downgrade() -> None:
+    for table in _task_tables():
+        op.drop_constraint('tasks_organization_id_fkey', table, type_='foreignkey')
+        op.create_foreign_key(
+            'tasks_organization_id_fkey', table, 'organizations',
+            ['organization_id'], ['id']
+        )
+    op.drop_constraint('users_organization_id_fkey', 'users', type_='foreignkey')
+    op.create_foreign_key(
+        'users_organization_id_fkey', 'users', 'organizations',
+        ['organization_id'], ['id']
+    )
+    
+    op.drop_column('organizations', 'deleted_at')
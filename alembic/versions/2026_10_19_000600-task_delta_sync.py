@@ -0,0 +1,68 @@
+"""Task tombstones and delta-sync index
+
+Revision ID: 0007_task_delta_sync
+Revises: 0006_organization_soft_delete
+Create Date: 2026-10-19 00:06:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007_task_delta_sync'
+down_revision = '0006_organization_soft_delete'
+branch_labels = None
+depends_on = None
+
+# Index of the old heap while the partition swap (migration 0004) is pending;
+# the canonical name goes to the partitioned table that becomes `tasks`
+UNPARTITIONED_INDEX = 'ix_tasks_unpartitioned_organization_id_updated_at_id'
+
+
+def _swap_pending() -> bool:
+    return op.get_bind().execute(sa.text("SELECT to_regclass('tasks_partitioned') IS NOT NULL")).scalar_one()
+
+
+def upgrade() -> None:
+    # Keyset order of GET /tasks/changes (created on every partition)
+    if _swap_pending():
+        op.create_index(UNPARTITIONED_INDEX, 'tasks', ['organization_id', 'updated_at', 'id'], unique=False)
+        op.create_index(
+            'ix_tasks_organization_id_updated_at_id',
+            'tasks_partitioned',
+            ['organization_id', 'updated_at', 'id'],
+            unique=False
+        )
+    else:
+        op.create_index(
+            'ix_tasks_organization_id_updated_at_id',
+            'tasks',
+            ['organization_id', 'updated_at', 'id'],
+            unique=False
+        )
+    
+    op.create_table(
+        'task_tombstones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('organization_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_task_tombstones_organization_id_deleted_at_id',
+        'task_tombstones',
+        ['organization_id', 'deleted_at', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_tombstones_organization_id_deleted_at_id', table_name='task_tombstones')
+    op.drop_table('task_tombstones')
+    if _swap_pending():
+        op.drop_index(UNPARTITIONED_INDEX, table_name='tasks')
+        op.drop_index('ix_tasks_organization_id_updated_at_id', table_name='tasks_partitioned')
+    else:
+        op.drop_index('ix_tasks_organization_id_updated_at_id', table_name='tasks')
@@ -0,0 +1,23 @@
+"""Add token version to users
+
+Revision ID: 0008_user_token_version
+Revises: 0007_task_delta_sync
+Create Date: 2026-10-19 00:07:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008_user_token_version'
+down_revision = '0007_task_delta_sync'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
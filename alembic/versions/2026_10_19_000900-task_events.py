@@ -0,0 +1,63 @@
+"""Task history: task_events, range-partitioned by month
+
+Revision ID: 0010_task_events
+Revises: 0009_webhook_endpoints
+Create Date: 2026-10-19 00:09:00.000000
+
+Creates the partitions for the current month and the next few; the daily
+`ensure_task_event_partitions` beat task keeps creating them ahead of time.
+Old months can be dropped (or detached and archived) one partition at a time.
+
+"""
+from datetime import date
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0010_task_events'
+down_revision = '0009_webhook_endpoints'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE task_events (
+            id BIGSERIAL NOT NULL,
+            organization_id INTEGER NOT NULL,
+            task_id INTEGER NOT NULL,
+            actor_id INTEGER,
+            event_type VARCHAR NOT NULL,
+            changes JSON NOT NULL DEFAULT '{}',
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            CONSTRAINT task_events_pkey PRIMARY KEY (created_at, id),
+            CONSTRAINT task_events_organization_id_fkey FOREIGN KEY (organization_id)
+                REFERENCES organizations (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (created_at)
+    """)
+    # Created on every partition; history pages are a range scan of one task
+    op.create_index(
+        'ix_task_events_organization_id_task_id_created_at_id',
+        'task_events',
+        ['organization_id', 'task_id', 'created_at', 'id']
+    )
+
+    this_month = date.today().replace(day=1)
+    for offset in range(MONTHS_AHEAD + 1):
+        start = _add_months(this_month, offset)
+        end = _add_months(start, 1)
+        op.execute(
+            f"CREATE TABLE task_events_y{start.year}m{start.month:02d} PARTITION OF task_events "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+
+
+def downgrade() -> None:
+    # Drops every partition with it
+    op.execute("DROP TABLE task_events")
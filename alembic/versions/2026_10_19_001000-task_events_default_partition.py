@@ -0,0 +1,27 @@
+"""DEFAULT partition for task_events
+
+Revision ID: 0011_task_events_default_partition
+Revises: 0010_task_events
+Create Date: 2026-10-19 00:10:00.000000
+
+Catches events of months whose partition does not exist yet (e.g. the
+`ensure_task_event_partitions` beat task lapsed), so inserts keep working.
+Creating a month's partition later moves its rows out of this one.
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0011_task_events_default_partition'
+down_revision = '0010_task_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE TABLE task_events_default PARTITION OF task_events DEFAULT")
+
+
+def downgrade() -> None:
+    # Rows still in it have no other partition to go to and are dropped with it
+    op.execute("DROP TABLE task_events_default")
@@ -1,52 +1,103 @@
+import secrets
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
-from app.core.security import decode_access_token
+from app.core.database import get_db, shard_router
+from app.config import settings
+from app.core.security import decode_access_token, get_token_version
 from app.models.user import User, UserRole
 from app.repositories.user_repository import UserRepository
 from app.schemas.auth import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    """Dependency to get current authenticated user."""
+async def _authenticate(token: Optional[str], db: AsyncSession) -> User:
+    """Resolve the user a token belongs to."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    payload = decode_access_token(token)
+    payload = decode_access_token(token) if token else None
     if payload is None:
         raise credentials_exception
     
     token_data = TokenData(
         user_id=payload.get("user_id"),
         organization_id=payload.get("organization_id"),
-        email=payload.get("email")
+        email=payload.get("email"),
+        role=payload.get("role"),
+        full_name=payload.get("full_name"),
+        token_version=payload.get("token_version")
     )
     
     if token_data.user_id is None:
         raise credentials_exception
     
     user_repo = UserRepository(db)
+    
+    if settings.AUTH_STATELESS and token_data.role is not None:
+        # Principal from claims alone; only the (cached) token version is checked
+        current_version = await get_token_version(
+            token_data.user_id,
+            lambda: user_repo.get_token_version(token_data.user_id, token_data.organization_id)
+        )
+        if current_version is None or current_version != token_data.token_version:
+            raise credentials_exception
+        return User(
+            id=token_data.user_id,
+            organization_id=token_data.organization_id,
+            email=token_data.email,
+            full_name=token_data.full_name,
+            role=UserRole(token_data.role),
+            token_version=token_data.token_version
+        )
+    
     user = await user_repo.get_by_id(
         token_data.user_id,
         token_data.organization_id
     )
     
-    if user is None:
+    # Tokens issued before token versions existed carry none (version 0)
+    if user is None or user.token_version != (token_data.token_version or 0):
         raise credentials_exception
     
     return user
 
 
+async def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Dependency to get current authenticated user."""
+    # Sub-requests of POST /batch reuse the principal the batch was authenticated as
+    batch_user = getattr(request.state, "batch_user", None)
+    if batch_user is not None:
+        return batch_user
+    return await _authenticate(token, db)
+
+
+async def get_streaming_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None, description="For clients that cannot set headers (EventSource)")
+) -> User:
+    """
+    Dependency to authenticate long-lived responses (streams).
+    The database session is only held while the user is loaded, not for the life of the stream.
+    """
+    token = token or access_token
+    payload = decode_access_token(token) if token else None
+    organization_id = payload.get("organization_id") if payload else None
+    
+    async with shard_router.session(organization_id) as db:
+        return await _authenticate(token, db)
+
+
 async def get_current_organization_id(
     current_user: User = Depends(get_current_user)
 ) -> int:
@@ -67,6 +118,22 @@ def require_role(allowed_roles: list[UserRole]):
     return role_checker
 
 
+async def require_metrics_token(request: Request) -> None:
+    """
+    Dependency guarding internal endpoints (/metrics) with METRICS_TOKEN.
+    They are not served at all while no token is configured.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
 # Convenience dependencies
 RequireAdmin = Depends(require_role([UserRole.ADMIN]))
 RequireMember = Depends(require_role([UserRole.MEMBER, UserRole.ADMIN]))
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import logging
+from itertools import groupby
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.exceptions import HTTPException
+from starlette.types import Message, Scope
+from app.config import settings
+from app.core.database import get_db, READ_ONLY_METHODS
+from app.core.metrics import metrics
+from app.core.quota import request_quota
+from app.api.deps import get_current_user
+from app.middleware.quota import quota_key
+from app.models.user import User
+from app.schemas.batch import BatchRequest, BatchRequestItem, BatchResponse, BatchResponseItem
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+BATCH_PATH = f"{settings.API_V1_PREFIX}/batch"
+
+# Outer request headers that describe the batch body, not the sub-request
+DROPPED_HEADERS = {b"content-length", b"content-type", b"accept-encoding"}
+# Sub-requests run as the batch's principal; they cannot switch credentials
+PROTECTED_HEADERS = {"authorization", "cookie", "host"}
+
+
+def _error(item: BatchRequestItem, status_code: int, detail: str) -> BatchResponseItem:
+    return BatchResponseItem(
+        id=item.id,
+        status=status_code,
+        headers={"content-type": "application/json"},
+        body={"detail": detail}
+    )
+
+
+def _sub_scope(scope: Scope, item: BatchRequestItem, state: dict) -> Scope:
+    """The batch's scope re-targeted at one sub-request (routing keys from the batch route removed)."""
+    path, _, query = item.path.partition("?")
+    headers = [(name, value) for name, value in scope["headers"] if name not in DROPPED_HEADERS]
+    headers += [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in item.headers.items()
+        if name.lower() not in PROTECTED_HEADERS
+    ]
+    if item.body is not None:
+        headers.append((b"content-type", b"application/json"))
+
+    sub_scope = {
+        key: value for key, value in scope.items()
+        if key not in ("route", "endpoint", "path_params", "fastapi_astack")
+    }
+    sub_scope.update(
+        method=item.method,
+        path=path,
+        raw_path=path.encode(),
+        query_string=query.encode(),
+        headers=headers,
+        state=state,
+    )
+    return sub_scope
+
+
+async def _run(request: Request, item: BatchRequestItem, state: dict) -> BatchResponseItem:
+    """Run one sub-request through the app's router (middleware is applied once, to the batch)."""
+    body = json.dumps(item.body).encode() if item.body is not None else b""
+    received = False
+
+    async def receive() -> Message:
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Nothing more will arrive; streaming endpoints stop right away
+        return {"type": "http.disconnect"}
+
+    response_status = 500
+    response_headers = {}
+    chunks: List[bytes] = []
+
+    async def send(message: Message) -> None:
+        nonlocal response_status
+        if message["type"] == "http.response.start":
+            response_status = message["status"]
+            response_headers.update(
+                (name.decode("latin-1"), value.decode("latin-1")) for name, value in message.get("headers", [])
+            )
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app.router(_sub_scope(request.scope, item, state), receive, send)
+    except HTTPException as e:
+        # Raised by the router itself (unknown path or method), outside any route's handlers
+        return _error(item, e.status_code, e.detail)
+    except Exception:
+        logger.exception(f"Batch sub-request {item.method} {item.path} failed")
+        return _error(item, 500, "Internal server error")
+
+    response_headers.pop("content-length", None)
+    raw = b"".join(chunks)
+    if not raw:
+        content = None
+    elif response_headers.get("content-type", "").startswith("application/json"):
+        content = json.loads(raw)
+    else:
+        content = raw.decode("utf-8", errors="replace")
+    return BatchResponseItem(id=item.id, status=response_status, headers=response_headers, body=content)
+
+
+def _validate(item: BatchRequestItem) -> Optional[str]:
+    if not item.path.startswith(f"{settings.API_V1_PREFIX}/"):
+        return f"Path must start with {settings.API_V1_PREFIX}/"
+    if item.path.partition("?")[0].rstrip("/") == BATCH_PATH:
+        return "Batch requests cannot be nested"
+    return None
+
+
+def _reserve_read_capacity(request: Request) -> None:
+    """
+    Make get_db take tenant capacity for the batch's concurrent reads too (it
+    runs before any other dependency opens the session). The reads' own sessions
+    then take no further slots, so concurrent batches of one tenant cannot end
+    up holding every slot while waiting on their reads.
+    """
+    request.state.db_weight = 1 + settings.BATCH_READ_CONCURRENCY
+
+
+@router.post("", response_model=BatchResponse, dependencies=[Depends(_reserve_read_capacity)])
+async def run_batch(
+    data: BatchRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Run several API calls in one round trip and return their responses in order.
+    The caller is authenticated once for all of them. Writes run one after another
+    on the batch's database session. Consecutive reads run concurrently (up to
+    BATCH_READ_CONCURRENCY, within the tenant capacity the batch holds), each with
+    its own session, and start only after every earlier request has finished.
+    """
+    items = data.requests
+    responses: List[Optional[BatchResponseItem]] = [None] * len(items)
+
+    # The batch itself was charged by QuotaMiddleware; charge every further sub-request too
+    if settings.QUOTA_ENABLED:
+        key, plan = quota_key(request)
+        for index in range(1, len(items)):
+            decision = await request_quota.charge(key, plan)
+            if not decision.allowed:
+                responses[index] = _error(
+                    items[index], status.HTTP_429_TOO_MANY_REQUESTS, "Request quota exceeded for your plan"
+                )
+
+    for index, item in enumerate(items):
+        error = _validate(item)
+        if error is not None and responses[index] is None:
+            responses[index] = _error(item, status.HTTP_400_BAD_REQUEST, error)
+
+    # Sub-requests inherit the batch's deadline (see DeadlineMiddleware)
+    shared_state = {
+        "batch_user": current_user,
+        "batch_db": db,
+        "deadline": getattr(request.state, "deadline", None)
+    }
+    read_state = {
+        "batch_user": current_user,
+        "batch_read": True,
+        "deadline": shared_state["deadline"]
+    }
+    # One unit of the capacity held by get_db is the batch's own session
+    read_slots = min(
+        settings.BATCH_READ_CONCURRENCY,
+        getattr(request.state, "db_capacity", 1 + settings.BATCH_READ_CONCURRENCY) - 1
+    )
+    semaphore = asyncio.Semaphore(max(1, read_slots))
+
+    async def run_read(index: int) -> None:
+        async with semaphore:
+            responses[index] = await _run(request, items[index], dict(read_state))
+
+    pending = [index for index in range(len(items)) if responses[index] is None]
+    for is_read, run in groupby(pending, key=lambda index: items[index].method in READ_ONLY_METHODS):
+        run = list(run)
+        if is_read and len(run) > 1 and read_slots > 0:
+            await asyncio.gather(*(run_read(index) for index in run))
+            continue
+        for index in run:
+            responses[index] = await _run(request, items[index], dict(shared_state))
+            if responses[index].status >= 500:
+                # Leave the shared session clean for the requests that follow
+                await db.rollback()
+
+    metrics.observe("batch_size", len(items))
+    return BatchResponse(responses=responses)
@@ -55,3 +55,22 @@ async def update_my_organization(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+
+
+@router.delete("/me", status_code=status.HTTP_202_ACCEPTED)
+async def delete_my_organization(
+    current_user: User = RequireAdmin,
+    organization_id: int = Depends(get_current_organization_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete current user's organization (admin only); data is purged in the background."""
+    org_service = OrganizationService(db)
+    deleted = await org_service.delete_organization(organization_id)
+    
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Organization not found"
+        )
+    
+    return {"status": "deleting", "organization_id": organization_id}
@@ -1,21 +1,34 @@
+import asyncio
+import json
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
 from app.core.database import get_db
+from app.core.events import task_event_hub
 from app.api.deps import (
     get_current_user,
     get_current_organization_id,
+    get_streaming_user,
     RequireMember
 )
+from app.models.task import TaskStatus
 from app.models.user import User
 from app.schemas.task import (
     TaskCreate,
     TaskUpdate,
     TaskResponse,
-    PaginatedTasks
+    TaskChanges,
+    TaskHistory,
+    TaskBoard,
+    BoardColumn,
+    PaginatedTasks,
+    PaginatedTaskFields
 )
-from app.services.task_service import TaskService
+from app.services.task_service import TaskService, parse_task_fields
 from app.utils.pagination import PaginationParams
+from app.utils.sync import InvalidSyncToken, SyncTokenExpired
 
 router = APIRouter()
 
@@ -43,38 +56,162 @@ async def create_task(
         )
 
 
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated task fields to return (id is always included), e.g. id,title,status"
+)
+
+
+def _parse_fields(fields: Optional[str]):
+    try:
+        return parse_task_fields(fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.get("", response_model=PaginatedTasks)
 async def list_tasks(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = FIELDS_QUERY,
     current_user: User = RequireMember,
     organization_id: int = Depends(get_current_organization_id),
     db: AsyncSession = Depends(get_db)
 ):
-    """List tasks with pagination."""
+    """
+    List tasks with pagination. Descriptions are shortened previews unless
+    `description` is requested explicitly with `fields`.
+    """
+    task_fields = _parse_fields(fields)
     task_service = TaskService(db)
     pagination = PaginationParams(page=page, page_size=page_size)
-    result = await task_service.list_tasks(organization_id, pagination)
     
-    return PaginatedTasks(
-        items=result.items,
-        total=result.total,
-        page=result.page,
-        page_size=result.page_size,
-        pages=result.pages
+    if task_fields is not None:
+        result = await task_service.list_task_fields(organization_id, pagination, task_fields)
+        sparse_page = PaginatedTaskFields.model_construct(
+            items=result.items,
+            total=result.total,
+            page=result.page,
+            page_size=result.page_size,
+            pages=result.pages
+        )
+        return Response(content=sparse_page.model_dump_json(exclude_unset=True), media_type="application/json")
+    
+    # Serialized once (or cached); returning the model would have FastAPI dump and re-validate every item
+    body = await task_service.list_tasks_json(organization_id, pagination)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/changes", response_model=TaskChanges)
+async def get_task_changes(
+    since: Optional[str] = Query(None, description="Token from a previous response; omit for a full sync"),
+    limit: int = Query(200, ge=1, le=settings.TASK_SYNC_MAX_BATCH_SIZE),
+    current_user: User = RequireMember,
+    organization_id: int = Depends(get_current_organization_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get tasks created, updated or deleted since a sync token."""
+    task_service = TaskService(db)
+    try:
+        return await task_service.get_changes(organization_id, since, limit)
+    except SyncTokenExpired as e:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=str(e)
+        )
+    except InvalidSyncToken as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/stream")
+async def stream_task_changes(
+    request: Request,
+    current_user: User = Depends(get_streaming_user)
+):
+    """
+    Server-Sent Events stream of task changes in the current organization.
+    Events carry a compact summary; on a `resync` event clients should refetch.
+    """
+    organization_id = current_user.organization_id
+    
+    async def event_stream():
+        async with task_event_hub.subscribe(organization_id) as subscription:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(),
+                        timeout=settings.TASK_STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
+@router.get("/board", response_model=TaskBoard)
+async def get_task_board(
+    per_column: int = Query(settings.TASK_BOARD_COLUMN_SIZE, ge=1, le=100),
+    current_user: User = RequireMember,
+    organization_id: int = Depends(get_current_organization_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Kanban board: the top tasks of every status (highest priority, then most
+    recently updated) with per-column totals. Load more of a column with
+    `GET /tasks/board/{status}?cursor=<next_cursor>`.
+    """
+    task_service = TaskService(db)
+    return await task_service.get_board(organization_id, per_column)
+
+
+@router.get("/board/{task_status}", response_model=BoardColumn)
+async def get_task_board_column(
+    task_status: TaskStatus,
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the column"),
+    limit: int = Query(settings.TASK_BOARD_COLUMN_SIZE, ge=1, le=100),
+    current_user: User = RequireMember,
+    organization_id: int = Depends(get_current_organization_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the next tasks of one board column."""
+    task_service = TaskService(db)
+    try:
+        return await task_service.get_board_column(organization_id, task_status, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
+    fields: Optional[str] = FIELDS_QUERY,
     current_user: User = RequireMember,
     organization_id: int = Depends(get_current_organization_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a task by ID."""
+    task_fields = _parse_fields(fields)
     task_service = TaskService(db)
-    task = await task_service.get_task(task_id, organization_id)
+    if task_fields is not None:
+        task = await task_service.get_task_fields(task_id, organization_id, task_fields)
+    else:
+        task = await task_service.get_task(task_id, organization_id)
     
     if not task:
         raise HTTPException(
@@ -82,7 +219,29 @@ async def get_task(
             detail="Task not found"
         )
     
-    return TaskResponse.model_validate(task)
+    if task_fields is not None:
+        return Response(content=task.model_dump_json(exclude_unset=True), media_type="application/json")
+    return task
+
+
+@router.get("/{task_id}/history", response_model=TaskHistory)
+async def get_task_history(
+    task_id: int,
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = RequireMember,
+    organization_id: int = Depends(get_current_organization_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get who changed a task and what, newest first (also kept after the task is deleted)."""
+    task_service = TaskService(db)
+    try:
+        return await task_service.get_history(task_id, organization_id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.patch("/{task_id}", response_model=TaskResponse)
@@ -96,7 +255,7 @@ async def update_task(
     """Update a task."""
     task_service = TaskService(db)
     try:
-        task = await task_service.update_task(task_id, organization_id, data)
+        task = await task_service.update_task(task_id, organization_id, data, actor_id=current_user.id)
         if not task:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -119,7 +278,7 @@ async def delete_task(
 ):
     """Delete a task."""
     task_service = TaskService(db)
-    deleted = await task_service.delete_task(task_id, organization_id)
+    deleted = await task_service.delete_task(task_id, organization_id, actor_id=current_user.id)
     
     if not deleted:
         raise HTTPException(
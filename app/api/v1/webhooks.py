@@ -0,0 +1,108 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.api.deps import get_current_organization_id, RequireAdmin
+from app.models.user import User
+from app.schemas.webhook import (
+    WebhookEndpointCreate,
+    WebhookEndpointUpdate,
+    WebhookEndpointResponse,
+    WebhookEndpointCreated
+)
+from app.services.webhook_service import WebhookService
+
+router = APIRouter()
+
+
+@router.post("", response_model=WebhookEndpointCreated, status_code=status.HTTP_201_CREATED)
+async def create_webhook(
+    data: WebhookEndpointCreate,
+    current_user: User = RequireAdmin,
+    organization_id: int = Depends(get_current_organization_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Register a webhook endpoint (admin only); the signing secret is only returned here."""
+    webhook_service = WebhookService(db)
+    try:
+        endpoint = await webhook_service.create_endpoint(organization_id, data)
+        return WebhookEndpointCreated.model_validate(endpoint)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("", response_model=list[WebhookEndpointResponse])
+async def list_webhooks(
+    current_user: User = RequireAdmin,
+    organization_id: int = Depends(get_current_organization_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """List webhook endpoints (admin only)."""
+    webhook_service = WebhookService(db)
+    endpoints = await webhook_service.list_endpoints(organization_id)
+    return [WebhookEndpointResponse.model_validate(endpoint) for endpoint in endpoints]
+
+
+@router.get("/{endpoint_id}", response_model=WebhookEndpointResponse)
+async def get_webhook(
+    endpoint_id: int,
+    current_user: User = RequireAdmin,
+    organization_id: int = Depends(get_current_organization_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a webhook endpoint (admin only)."""
+    webhook_service = WebhookService(db)
+    endpoint = await webhook_service.get_endpoint(endpoint_id, organization_id)
+    
+    if not endpoint:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Webhook endpoint not found"
+        )
+    
+    return WebhookEndpointResponse.model_validate(endpoint)
+
+
+@router.patch("/{endpoint_id}", response_model=WebhookEndpointResponse)
+async def update_webhook(
+    endpoint_id: int,
+    data: WebhookEndpointUpdate,
+    current_user: User = RequireAdmin,
+    organization_id: int = Depends(get_current_organization_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Update a webhook endpoint (admin only)."""
+    webhook_service = WebhookService(db)
+    try:
+        endpoint = await webhook_service.update_endpoint(endpoint_id, organization_id, data)
+        if not endpoint:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Webhook endpoint not found"
+            )
+        return WebhookEndpointResponse.model_validate(endpoint)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.delete("/{endpoint_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_webhook(
+    endpoint_id: int,
+    current_user: User = RequireAdmin,
+    organization_id: int = Depends(get_current_organization_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete a webhook endpoint (admin only)."""
+    webhook_service = WebhookService(db)
+    deleted = await webhook_service.delete_endpoint(endpoint_id, organization_id)
+    
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Webhook endpoint not found"
+        )
@@ -5,6 +5,153 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    # asyncpg prepared statements kept per connection (LRU); set 0 behind pgbouncer in transaction mode
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    
+    # Sharding (DATABASE_URL is the "default" shard and hosts the tenant directory)
+    SHARD_DATABASE_URLS: dict[str, str] = {}
+    DEFAULT_SHARD: str = "default"
+    SHARD_MAP_CACHE_TTL_SECONDS: int = 60
+    
+    # Per-tenant database concurrency
+    TENANT_DB_CONCURRENCY: int = 10
+    TENANT_DB_CONCURRENCY_OVERRIDES: dict[int, int] = {}
+    TENANT_DB_ACQUIRE_TIMEOUT_SECONDS: float = 5.0
+    
+    # Per-tenant API quotas (requests per sliding window, by plan)
+    QUOTA_ENABLED: bool = True
+    QUOTA_WINDOW_SECONDS: int = 60
+    QUOTA_PLAN_LIMITS: dict[str, int] = {"anonymous": 60, "free": 600, "pro": 3000, "enterprise": 12000}
+    QUOTA_DEFAULT_PLAN: str = "free"
+    QUOTA_LOCAL_BATCH_SIZE: int = 10
+    QUOTA_LOCAL_HEADROOM_RATIO: float = 0.2
+    
+    # Tenant deletion
+    ORG_PURGE_BATCH_SIZE: int = 1000
+    
+    # Task list views: descriptions are cut to this many characters unless
+    # requested with ?fields= (0 returns full descriptions)
+    TASK_DESCRIPTION_PREVIEW_LENGTH: int = 200
+    # Tasks per column of GET /tasks/board (and per "load more" page)
+    TASK_BOARD_COLUMN_SIZE: int = 20
+    
+    # Task history (task_events): buffered in process, flushed by size or time
+    TASK_HISTORY_ENABLED: bool = True
+    TASK_HISTORY_FLUSH_SIZE: int = 500
+    TASK_HISTORY_FLUSH_INTERVAL_SECONDS: float = 1.0
+    TASK_HISTORY_MAX_BUFFER: int = 50000
+    TASK_HISTORY_PARTITIONS_AHEAD: int = 3
+    
+    # Real-time task change stream
+    TASK_STREAM_QUEUE_SIZE: int = 100
+    TASK_STREAM_HEARTBEAT_SECONDS: int = 15
+    
+    # Delta sync
+    TASK_SYNC_MAX_BATCH_SIZE: int = 500
+    # Watermark lag on databases other than PostgreSQL, which uses its oldest open transaction instead
+    TASK_SYNC_SAFETY_LAG_SECONDS: int = 2
+    TASK_TOMBSTONE_RETENTION_DAYS: int = 30
+    
+    # Single-flight coalescing of hot reads (Redis extends it across processes)
+    SINGLEFLIGHT_REDIS_ENABLED: bool = False
+    SINGLEFLIGHT_REDIS_LOCK_MS: int = 2000
+    SINGLEFLIGHT_REDIS_WAIT_MS: int = 500
+    SINGLEFLIGHT_REDIS_RESULT_TTL_MS: int = 500
+    
+    # Organization cache (local LRU + Redis, invalidated over pub/sub)
+    ORG_CACHE_ENABLED: bool = True
+    ORG_CACHE_LOCAL_TTL_SECONDS: int = 30
+    ORG_CACHE_LOCAL_MAX_SIZE: int = 10000
+    ORG_CACHE_REDIS_TTL_SECONDS: int = 3600
+    
+    # Task list result cache (first pages, per-tenant data version)
+    TASK_LIST_CACHE_ENABLED: bool = True
+    TASK_LIST_CACHE_MAX_PAGE: int = 1
+    TASK_LIST_CACHE_TTL_SECONDS: int = 300
+    TASK_LIST_CACHE_LOCAL_TTL_SECONDS: int = 30
+    TASK_LIST_CACHE_LOCAL_MAX_SIZE: int = 10000
+    
+    # Celery fair dispatch (round-robin across organizations within a queue)
+    CELERY_FAIR_DISPATCH_ENABLED: bool = True
+    CELERY_FAIR_DISPATCH_BATCH_SIZE: int = 100
+    CELERY_FAIR_DISPATCH_MAX_BACKLOG: int = 200
+    
+    # Batch jobs (tenant-wide maintenance in keyset chunks)
+    BATCH_JOB_CHUNK_SIZE: int = 500
+    BATCH_JOB_MAX_PARALLEL: int = 4
+    BATCH_JOB_CHUNKS_PER_TASK: int = 20
+    BATCH_JOB_STALE_SECONDS: int = 600
+    STALE_TASK_DAYS: int = 14
+    
+    # Webhooks
+    WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    WEBHOOK_MAX_CONNECTIONS: int = 100
+    WEBHOOK_PER_HOST_CONCURRENCY: int = 8
+    WEBHOOK_BATCH_SIZE: int = 50
+    WEBHOOK_BATCH_WINDOW_MS: int = 500
+    WEBHOOK_MAX_ATTEMPTS: int = 6
+    WEBHOOK_BACKOFF_BASE_SECONDS: float = 2.0
+    WEBHOOK_BACKOFF_MAX_SECONDS: float = 600.0
+    WEBHOOK_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    WEBHOOK_CIRCUIT_RESET_SECONDS: int = 60
+    # Allow loopback/private endpoint URLs (local stub servers, development)
+    WEBHOOK_ALLOW_PRIVATE_HOSTS: bool = False
+    
+    # Startup warmup and readiness (/ready)
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5
+    WARMUP_REDIS_CONNECTIONS: int = 5
+    READY_CHECK_TIMEOUT_SECONDS: float = 2.0
+    READY_MAX_LATENCY_MS: float = 500.0
+    
+    # Batch endpoint (POST /api/v1/batch)
+    BATCH_MAX_REQUESTS: int = 20
+    BATCH_READ_CONCURRENCY: int = 4
+    
+    # Response compression (br and zstd need the optional brotli/zstandard packages)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ALGORITHMS: list[str] = ["zstd", "br", "gzip"]  # server preference on equal q-values
+    COMPRESSION_MIN_SIZE_BYTES: int = 1024
+    # Chunks at least this large are compressed in a worker thread
+    COMPRESSION_THREAD_THRESHOLD_BYTES: int = 262144
+    # Long-lived event streams would each keep a compressor's window in memory
+    COMPRESSION_EXCLUDED_CONTENT_TYPES: list[str] = ["text/event-stream"]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    
+    # Load shedding (per-process admission control with an adaptive in-flight limit)
+    LOAD_SHED_ENABLED: bool = True
+    LOAD_SHED_INITIAL_LIMIT: int = 20
+    LOAD_SHED_MIN_LIMIT: int = 4
+    LOAD_SHED_MAX_LIMIT: int = 200
+    LOAD_SHED_QUEUE_SIZE: int = 100
+    LOAD_SHED_QUEUE_TIMEOUT_MS: int = 1000
+    # Window latency above this multiple of the long-term average shrinks the limit
+    LOAD_SHED_LATENCY_TOLERANCE: float = 2.0
+    LOAD_SHED_SMOOTHING: float = 0.2
+    LOAD_SHED_WINDOW_SECONDS: float = 1.0
+    LOAD_SHED_RETRY_AFTER_SECONDS: int = 1
+    LOAD_SHED_EXEMPT_PATHS: list[str] = ["/health", "/ready", "/metrics", "/api/v1/tasks/stream"]
+    LOAD_SHED_HIGH_PRIORITY_PREFIXES: list[str] = ["/api/v1/auth"]
+    LOAD_SHED_LOW_PRIORITY_ROUTES: list[str] = ["GET /api/v1/tasks", "GET /api/v1/tasks/changes", "POST /api/v1/batch"]
+    
+    # Request deadlines ("METHOD /route/{template}" -> ms; 0 disables), also applied as statement_timeout
+    DEADLINE_ENABLED: bool = True
+    DEADLINE_DEFAULT_MS: int = 10000
+    DEADLINE_ROUTE_MS: dict[str, int] = {
+        "GET /api/v1/tasks": 5000,
+        "GET /api/v1/tasks/{task_id}": 3000,
+        "GET /api/v1/tasks/stream": 0,
+        "POST /api/v1/batch": 20000,
+    }
+    
+    # Metrics: /metrics answers only requests bearing METRICS_TOKEN (unset disables it)
+    METRICS_TOKEN: str | None = None
+    # Per-tenant series: these tenants plus the first METRICS_TENANT_LABEL_LIMIT seen
+    # are labelled by ID; the rest share the "other" label
+    METRICS_TENANT_LABELS: list[int] = []
+    METRICS_TENANT_LABEL_LIMIT: int = 50
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -13,6 +160,15 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Asymmetric signing (RS*/ES* algorithms): PEM private key plus the public keys
+    # verifiers accept, by key ID, so keys can be rotated and verification spread out
+    JWT_PRIVATE_KEY: str | None = None
+    JWT_KEY_ID: str | None = None
+    JWT_PUBLIC_KEYS: dict[str, str] = {}
+    # Build the principal from token claims; revocation goes through token versions
+    AUTH_STATELESS: bool = False
+    TOKEN_VERSION_LOCAL_TTL_SECONDS: int = 5
+    TOKEN_VERSION_REDIS_TTL_SECONDS: int = 86400
     
     # Application
     ENVIRONMENT: str = "development"
@@ -0,0 +1,194 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional
+from app.config import settings
+from app.core.metrics import metrics
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+PRIORITY_NAMES = {PRIORITY_HIGH: "high", PRIORITY_NORMAL: "normal", PRIORITY_LOW: "low"}
+
+# Weight of each window's average latency in the long-term average
+LONG_LATENCY_ALPHA = 0.05
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Request shed: {reason}")
+        self.reason = reason
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    future: asyncio.Future = field(compare=False)
+
+
+class AdmissionController:
+    """
+    Per-process admission control in front of the application.
+
+    At most `limit` requests run at once; the rest wait in a bounded queue,
+    served by priority and then arrival, for at most `queue_timeout` seconds.
+    When the queue is full a new request displaces the newest waiter of a lower
+    priority, or is rejected itself.
+
+    The limit adapts to latency (a simplified gradient limiter): every
+    `window_seconds` the window's average latency is compared with a long-term
+    average. Latency above `tolerance` times the long-term average shrinks the
+    limit by up to half; otherwise it grows by about sqrt(limit). The limit only
+    grows while it is actually being used.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        queue_size: int,
+        queue_timeout: float,
+        tolerance: float,
+        smoothing: float,
+        window_seconds: float,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.window_seconds = window_seconds
+        self.in_flight = 0
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._long_latency: Optional[float] = None
+        self._window_started = time.monotonic()
+        self._window_sum = 0.0
+        self._window_count = 0
+        self._window_peak = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    @asynccontextmanager
+    async def admit(self, priority: int = PRIORITY_NORMAL) -> AsyncIterator[None]:
+        """Hold one slot for the duration of the block; raises Overloaded when shed."""
+        await self._acquire(priority)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - started)
+
+    async def _acquire(self, priority: int) -> None:
+        if not self._queue and self.in_flight < int(self.limit):
+            self._take_slot()
+            return
+
+        if len(self._queue) >= self.queue_size:
+            worst = max(self._queue, default=None)
+            if worst is None or worst.priority <= priority:
+                raise Overloaded("queue_full")
+            self._queue.remove(worst)
+            heapq.heapify(self._queue)
+            worst.future.set_exception(Overloaded("displaced"))
+
+        waiter = _Waiter(priority, next(self._seq), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, waiter)
+        started = time.perf_counter()
+        try:
+            # asyncio.wait leaves the future alone on timeout, unlike wait_for
+            done, _ = await asyncio.wait({waiter.future}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if not done:
+            self._abandon(waiter)
+            raise Overloaded("queue_timeout")
+        waiter.future.result()
+        metrics.observe("load_shed_queue_wait_seconds", time.perf_counter() - started)
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+            # The slot was handed over just as we gave up; pass it on
+            self.in_flight -= 1
+            self._wake()
+            return
+        waiter.future.cancel()
+        if waiter in self._queue:
+            self._queue.remove(waiter)
+            heapq.heapify(self._queue)
+
+    def _take_slot(self) -> None:
+        self.in_flight += 1
+        self._window_peak = max(self._window_peak, self.in_flight)
+
+    def _release(self, latency: float) -> None:
+        self.in_flight -= 1
+        self._record(latency)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._queue and self.in_flight < int(self.limit):
+            waiter = heapq.heappop(self._queue)
+            if waiter.future.done():
+                continue
+            self._take_slot()
+            waiter.future.set_result(None)
+
+    def _record(self, latency: float) -> None:
+        self._window_sum += latency
+        self._window_count += 1
+        now = time.monotonic()
+        if now - self._window_started < self.window_seconds:
+            return
+
+        short = self._window_sum / self._window_count
+        peak = self._window_peak
+        self._window_started = now
+        self._window_sum = 0.0
+        self._window_count = 0
+        self._window_peak = self.in_flight
+
+        if self._long_latency is None:
+            self._long_latency = short
+        else:
+            self._long_latency += (short - self._long_latency) * LONG_LATENCY_ALPHA
+            if self._long_latency > short * 2:
+                # Recovering from a long overload: forget how slow it was
+                self._long_latency = short
+
+        gradient = max(0.5, min(1.0, self.tolerance * self._long_latency / max(short, 1e-6)))
+        new_limit = self.limit * gradient + math.sqrt(self.limit)
+        if new_limit > self.limit and peak < self.limit / 2:
+            # Not limited by us; growing would only remove protection
+            new_limit = self.limit
+        new_limit = self.limit * (1 - self.smoothing) + new_limit * self.smoothing
+        self.limit = max(self.min_limit, min(self.max_limit, new_limit))
+
+        metrics.set_gauge("load_shed_limit", int(self.limit))
+        metrics.observe("load_shed_window_latency_seconds", short)
+
+
+admission_controller = AdmissionController(
+    initial_limit=settings.LOAD_SHED_INITIAL_LIMIT,
+    min_limit=settings.LOAD_SHED_MIN_LIMIT,
+    max_limit=settings.LOAD_SHED_MAX_LIMIT,
+    queue_size=settings.LOAD_SHED_QUEUE_SIZE,
+    queue_timeout=settings.LOAD_SHED_QUEUE_TIMEOUT_MS / 1000,
+    tolerance=settings.LOAD_SHED_LATENCY_TOLERANCE,
+    smoothing=settings.LOAD_SHED_SMOOTHING,
+    window_seconds=settings.LOAD_SHED_WINDOW_SECONDS,
+)
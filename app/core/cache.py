@@ -0,0 +1,297 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.core.metrics import metrics
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+
+
+class LocalLRU:
+    """Bounded in-process LRU whose entries also expire after a TTL."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class CacheInvalidationBus:
+    """
+    Broadcasts cache invalidations to every API and worker process over Redis
+    pub/sub. Each process keeps one subscriber task that evicts the named key
+    from its local cache. If the subscription drops, local caches are cleared,
+    since invalidations may have been missed meanwhile.
+    """
+
+    def __init__(self):
+        # cache name -> (evict one key, clear everything)
+        self._caches: Dict[str, Tuple[Callable[[str], None], Callable[[], None]]] = {}
+        self._reader: Optional[asyncio.Task] = None
+
+    def register(self, cache: "TwoLevelCache") -> None:
+        self.subscribe(cache.name, cache.local.delete, cache.local.clear)
+
+    def subscribe(self, cache_name: str, evict: Callable[[str], None], clear: Callable[[], None]) -> None:
+        """Receive invalidations of an in-process cache that is not a TwoLevelCache."""
+        self._caches[cache_name] = (evict, clear)
+
+    async def publish(self, cache_name: str, key: str) -> None:
+        try:
+            redis = await get_redis()
+            await redis.publish(CACHE_INVALIDATION_CHANNEL, json.dumps({"cache": cache_name, "key": key}))
+        except Exception as e:
+            logger.warning(f"Failed to publish invalidation of {cache_name}:{key}: {e}")
+            metrics.increment("cache_invalidation_errors_total", cache=cache_name)
+
+    def ensure_listening(self) -> None:
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_forever())
+
+    async def _read_forever(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                pubsub = (await get_redis()).pubsub()
+                await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        self._dispatch(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscription lost, reconnecting: {e}")
+                for _, clear in self._caches.values():
+                    clear()
+                await asyncio.sleep(1)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.close()
+                    except Exception:
+                        pass
+
+    def _dispatch(self, data: str) -> None:
+        message = json.loads(data)
+        handlers = self._caches.get(message["cache"])
+        if handlers is not None:
+            handlers[0](message["key"])
+            metrics.increment("cache_invalidations_received_total", cache=message["cache"])
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader = None
+
+
+cache_bus = CacheInvalidationBus()
+
+
+class TwoLevelCache:
+    """
+    Read-through / write-through cache: an in-process LRU in front of Redis.
+
+    Reads populate Redis only if the key is absent (SET NX), so a slow reader
+    can never overwrite a newer value written through by `set`. Local entries
+    live at most `local_ttl` seconds, which bounds staleness even when an
+    invalidation message is lost.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dump: Callable[[Any], str],
+        load: Callable[[str], Any],
+        local_ttl: float,
+        local_max_size: int,
+        redis_ttl: int,
+        enabled: bool = True,
+    ):
+        self.name = name
+        self.dump = dump
+        self.load = load
+        self.redis_ttl = redis_ttl
+        self.enabled = enabled
+        self.local = LocalLRU(local_max_size, local_ttl)
+        cache_bus.register(self)
+
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.name}:{key}"
+
+    async def get(self, key: str) -> Any:
+        """Get a cached value, or None on a miss."""
+        if not self.enabled:
+            return None
+        cache_bus.ensure_listening()
+
+        value = self.local.get(key)
+        if value is not None:
+            metrics.increment("cache_hits_total", cache=self.name, level="local")
+            return value
+
+        try:
+            raw = await (await get_redis()).get(self._redis_key(key))
+        except Exception as e:
+            logger.warning(f"Cache read failed for {self.name}:{key}: {e}")
+            raw = None
+        if raw is None:
+            metrics.increment("cache_misses_total", cache=self.name)
+            return None
+
+        value = self.load(raw)
+        self.local.set(key, value)
+        metrics.increment("cache_hits_total", cache=self.name, level="redis")
+        return value
+
+    async def populate(self, key: str, value: Any) -> None:
+        """Store a value read from the database unless a newer one was written meanwhile."""
+        await self._store(key, value, only_if_absent=True)
+
+    async def set(self, key: str, value: Any) -> None:
+        """Write a new value through to every process."""
+        await self._store(key, value, only_if_absent=False)
+        await cache_bus.publish(self.name, key)
+
+    async def invalidate(self, key: str) -> None:
+        """Drop a key from Redis and from every process's local cache."""
+        if not self.enabled:
+            return
+        self.local.delete(key)
+        try:
+            await (await get_redis()).delete(self._redis_key(key))
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed for {self.name}:{key}: {e}")
+        await cache_bus.publish(self.name, key)
+
+    async def _store(self, key: str, value: Any, only_if_absent: bool) -> None:
+        if not self.enabled:
+            return
+        if not only_if_absent:
+            # A write-through value is the newest one, whatever happens in Redis
+            self.local.set(key, value)
+        try:
+            stored = await (await get_redis()).set(
+                self._redis_key(key), self.dump(value), ex=self.redis_ttl, nx=only_if_absent
+            )
+        except Exception as e:
+            logger.warning(f"Cache write failed for {self.name}:{key}: {e}")
+            return
+        if only_if_absent and stored:
+            # Keep a read value only if Redis took it: a refused SET NX means a newer one was written
+            self.local.set(key, value)
+
+
+class TenantVersionedCache:
+    """
+    Result cache whose keys include a per-tenant data version kept in Redis.
+
+    Writers bump the version (a single INCR) instead of finding and deleting
+    keys; entries of older versions are never read again and expire on their
+    own. Readers fetch the version before querying the database, so a result
+    computed concurrently with a write is stored under the version it may be
+    stale for. Versioned entries never change, so the local LRU needs no
+    invalidation. Values are stored as already-serialized strings.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: int,
+        local_ttl: float,
+        local_max_size: int,
+        enabled: bool = True,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.enabled = enabled
+        self.local = LocalLRU(local_max_size, local_ttl)
+
+    def _version_key(self, organization_id: int) -> str:
+        return f"cache:{self.name}:version:{organization_id}"
+
+    def _entry_key(self, organization_id: int, version: str, key: str) -> str:
+        return f"cache:{self.name}:{organization_id}:v{version}:{key}"
+
+    async def version(self, organization_id: int) -> Optional[str]:
+        """Current data version of a tenant, or None when Redis is unavailable (do not cache)."""
+        if not self.enabled:
+            return None
+        try:
+            version = await (await get_redis()).get(self._version_key(organization_id))
+        except Exception as e:
+            logger.warning(f"Cache version read failed for {self.name}:{organization_id}: {e}")
+            return None
+        return version or "0"
+
+    async def get(self, organization_id: int, version: str, key: str) -> Optional[str]:
+        """Get a cached value for a tenant version, or None on a miss."""
+        entry_key = self._entry_key(organization_id, version, key)
+        value = self.local.get(entry_key)
+        if value is not None:
+            metrics.increment("cache_hits_total", cache=self.name, level="local")
+            return value
+
+        try:
+            value = await (await get_redis()).get(entry_key)
+        except Exception as e:
+            logger.warning(f"Cache read failed for {entry_key}: {e}")
+            value = None
+        if value is None:
+            metrics.increment("cache_misses_total", cache=self.name)
+            return None
+
+        self.local.set(entry_key, value)
+        metrics.increment("cache_hits_total", cache=self.name, level="redis")
+        return value
+
+    async def set(self, organization_id: int, version: str, key: str, value: str) -> None:
+        """Store a value computed after `version` was read."""
+        entry_key = self._entry_key(organization_id, version, key)
+        self.local.set(entry_key, value)
+        try:
+            await (await get_redis()).set(entry_key, value, ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Cache write failed for {entry_key}: {e}")
+
+    async def bump(self, organization_id: int) -> None:
+        """Invalidate every entry of a tenant; call after its data changed (and was committed)."""
+        if not self.enabled:
+            return
+        try:
+            await (await get_redis()).incr(self._version_key(organization_id))
+        except Exception as e:
+            logger.warning(f"Cache version bump failed for {self.name}:{organization_id}: {e}")
+            metrics.increment("cache_invalidation_errors_total", cache=self.name)
@@ -1,28 +1,113 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import time
+from contextlib import nullcontext
+from fastapi import HTTPException, Request, status
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.config import settings
+from app.core.cache import cache_bus
+from app.core.security import get_request_organization_id
+from app.core.sharding import ShardRouter
+from app.core.tenant_limiter import TenantLimitExceeded, tenant_limiter
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.ENVIRONMENT == "development",
-    future=True,
-)
 
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+def create_engine_for_url(url: str) -> AsyncEngine:
+    """Create an async engine with the application's engine settings."""
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        # Hot statements are compiled once by SQLAlchemy; asyncpg then reuses their server-side plans
+        connect_args["prepared_statement_cache_size"] = settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+    return create_async_engine(
+        url,
+        echo=settings.ENVIRONMENT == "development",
+        future=True,
+        connect_args=connect_args,
+    )
+
+
+def create_sessionmaker(bind: AsyncEngine) -> async_sessionmaker:
+    """Create a session factory bound to an engine."""
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+engine = create_engine_for_url(settings.DATABASE_URL)
+
+AsyncSessionLocal = create_sessionmaker(engine)
+
+shard_router = ShardRouter(
+    default_engine=engine,
+    shard_urls=settings.SHARD_DATABASE_URLS,
+    default_shard=settings.DEFAULT_SHARD,
+    engine_factory=create_engine_for_url,
+    session_factory=create_sessionmaker,
+    cache_ttl=settings.SHARD_MAP_CACHE_TTL_SECONDS,
+    invalidation_bus=cache_bus,
 )
 
 Base = declarative_base()
 
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def apply_deadline(session: AsyncSession, deadline: float) -> None:
+    """Cap every transaction of a session at the time left until a monotonic deadline (PostgreSQL)."""
+    if session.bind.dialect.name != "postgresql":
+        return
+
+    @event.listens_for(session.sync_session, "after_begin")
+    def set_statement_timeout(sync_session, transaction, connection):
+        remaining_ms = max(1, int((deadline - time.monotonic()) * 1000))
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {remaining_ms}")
+
+
+async def get_db(request: Request) -> AsyncSession:
+    """Dependency for getting a database session on the current tenant's shard."""
+    # Sequential sub-requests of POST /batch share the batch's session (closed by the batch)
+    batch_db = getattr(request.state, "batch_db", None)
+    if batch_db is not None:
+        yield batch_db
+        return
+
+    organization_id = get_request_organization_id(request)
+    placement = await shard_router.resolve(organization_id)
+
+    # Tenants being moved between shards are read-only until the move finishes
+    if placement.is_moving and request.method not in READ_ONLY_METHODS:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Organization is being migrated, please retry shortly",
+            headers={"Retry-After": str(settings.SHARD_MAP_CACHE_TTL_SECONDS)},
+        )
+
+    # Concurrent reads fanned out by POST /batch run on the capacity the batch reserved
+    # (request.state.db_weight) instead of taking further slots while the batch holds one
+    if getattr(request.state, "batch_read", False):
+        limiter = nullcontext(0)
+    else:
+        limiter = tenant_limiter.acquire(organization_id, getattr(request.state, "db_weight", 1))
 
-async def get_db() -> AsyncSession:
-    """Dependency for getting database session."""
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+    try:
+        # Cap how much of the pool a single tenant can hold
+        async with limiter as held:
+            request.state.db_capacity = held
+            async with shard_router.sessionmaker(placement.shard_key)() as session:
+                # Set by DeadlineMiddleware: the server stops queries the client no longer waits for
+                deadline = getattr(request.state, "deadline", None)
+                if deadline is not None:
+                    apply_deadline(session, deadline)
+                try:
+                    yield session
+                finally:
+                    await session.close()
+    except TenantLimitExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
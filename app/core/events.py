@@ -0,0 +1,140 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+from app.config import settings
+from app.core.metrics import metrics
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+TASK_CHANNEL_PREFIX = "tasks:org:"
+
+# Sent to a subscriber that missed events (slow consumer or lost Redis connection)
+RESYNC_EVENT = {"type": "resync"}
+
+
+def task_channel(organization_id: int) -> str:
+    """Redis pub/sub channel carrying a tenant's task changes."""
+    return f"{TASK_CHANNEL_PREFIX}{organization_id}"
+
+
+async def publish_task_event(organization_id: int, event: dict) -> None:
+    """Publish a compact task change event; failures never break the write path."""
+    try:
+        redis = await get_redis()
+        await redis.publish(task_channel(organization_id), json.dumps(event, default=str))
+    except Exception as e:
+        logger.warning(f"Failed to publish task event for organization {organization_id}: {e}")
+        metrics.increment("task_events_publish_errors_total")
+
+
+class TaskEventSubscription:
+    """A single client's bounded event queue."""
+
+    def __init__(self, organization_id: int, max_size: int):
+        self.organization_id = organization_id
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+
+    def deliver(self, event: dict) -> None:
+        """Queue an event; a full queue is replaced by one resync notice."""
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Backpressure: drop the backlog rather than buffering without bound
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(RESYNC_EVENT)
+            metrics.increment(
+                "task_stream_overflows_total", organization_id=metrics.tenant_label(self.organization_id)
+            )
+
+    async def get(self) -> dict:
+        return await self._queue.get()
+
+
+class TaskEventHub:
+    """
+    Fans task change events out to every streaming client of this process.
+    One Redis pub/sub connection (pattern subscription on all tenant channels)
+    serves any number of clients.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[TaskEventSubscription]] = {}
+        self._reader: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def subscribe(self, organization_id: int) -> AsyncIterator[TaskEventSubscription]:
+        """Register a client for a tenant's events for the duration of the block."""
+        self._ensure_reader()
+        subscription = TaskEventSubscription(organization_id, self.queue_size)
+        self._subscribers.setdefault(organization_id, set()).add(subscription)
+        metrics.set_gauge("task_stream_clients", self.client_count)
+        try:
+            yield subscription
+        finally:
+            clients = self._subscribers.get(organization_id)
+            if clients is not None:
+                clients.discard(subscription)
+                if not clients:
+                    del self._subscribers[organization_id]
+            metrics.set_gauge("task_stream_clients", self.client_count)
+
+    @property
+    def client_count(self) -> int:
+        return sum(len(clients) for clients in self._subscribers.values())
+
+    def _ensure_reader(self) -> None:
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_forever())
+
+    async def _read_forever(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                pubsub = (await get_redis()).pubsub()
+                await pubsub.psubscribe(f"{TASK_CHANNEL_PREFIX}*")
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message["type"] == "pmessage":
+                        self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task event subscription lost, reconnecting: {e}")
+                # Clients may have missed events while disconnected
+                for clients in self._subscribers.values():
+                    for subscription in clients:
+                        subscription.deliver(RESYNC_EVENT)
+                await asyncio.sleep(1)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.close()
+                    except Exception:
+                        pass
+
+    def _dispatch(self, channel: str, data: str) -> None:
+        organization_id = int(channel[len(TASK_CHANNEL_PREFIX):])
+        clients = self._subscribers.get(organization_id)
+        if not clients:
+            return
+        event = json.loads(data)
+        for subscription in clients:
+            subscription.deliver(event)
+        metrics.increment("task_stream_events_delivered_total", len(clients))
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader = None
+
+
+task_event_hub = TaskEventHub(queue_size=settings.TASK_STREAM_QUEUE_SIZE)
@@ -0,0 +1,90 @@
+"""
+Job dispatch interface for the API process.
+
+Jobs are sent by task name, so the API never imports the worker modules; Celery
+itself is only imported on the first dispatch. Queue names and priorities live
+here and are shared with app/workers/celery_app.py.
+"""
+import json
+from typing import Optional
+from app.config import settings
+from app.core.metrics import metrics
+from app.core.redis import get_redis
+
+# Queues, most latency-sensitive first; workers consume them in this order
+QUEUE_CRITICAL = "critical"
+QUEUE_DEFAULT = "default"
+QUEUE_BULK = "bulk"
+
+# Redis transport priorities: 0 is served first, other steps live in "<queue>:<step>" lists
+BROKER_PRIORITY_STEPS = [0, 3, 6, 9]
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 3
+PRIORITY_LOW = 6
+
+# Per-queue ring of organizations with pending jobs, plus one job list per organization.
+# An organization is in the ring exactly while its list is non-empty.
+FAIR_ENQUEUE_LUA = """
+local ring_key = KEYS[1]
+local jobs_key = KEYS[2]
+if redis.call('RPUSH', jobs_key, ARGV[2]) == 1 then
+    redis.call('RPUSH', ring_key, ARGV[1])
+end
+"""
+
+
+def fair_ring_key(queue: str) -> str:
+    return f"fair:{queue}:ring"
+
+
+def fair_jobs_prefix(queue: str) -> str:
+    return f"fair:{queue}:org:"
+
+
+def send_job(
+    task_name: str,
+    kwargs: dict,
+    queue: Optional[str] = None,
+    priority: Optional[int] = None,
+    countdown: Optional[float] = None
+) -> None:
+    """Publish a job by task name; routing and priority default to the task's route."""
+    from app.workers.celery_app import celery_app
+
+    options = {}
+    if queue is not None:
+        options["queue"] = queue
+    if priority is not None:
+        options["priority"] = priority
+    if countdown is not None:
+        options["countdown"] = countdown
+    celery_app.send_task(task_name, kwargs=kwargs, **options)
+
+
+async def enqueue_fair(
+    task_name: str,
+    organization_id: int,
+    kwargs: dict,
+    queue: str,
+    priority: Optional[int] = None
+) -> None:
+    """
+    Queue a job behind the tenant's other pending jobs of the same queue.
+    The dispatcher (app/workers/fair_queue.py) hands jobs to Celery round-robin
+    across organizations, so a tenant's burst never delays other tenants by
+    more than one job each.
+    """
+    if not settings.CELERY_FAIR_DISPATCH_ENABLED:
+        send_job(task_name, kwargs, queue=queue, priority=priority)
+        return
+
+    redis = await get_redis()
+    job = json.dumps({"task": task_name, "kwargs": kwargs, "priority": priority})
+    await redis.eval(
+        FAIR_ENQUEUE_LUA, 2, fair_ring_key(queue), f"{fair_jobs_prefix(queue)}{organization_id}", organization_id, job
+    )
+    metrics.increment("fair_queue_enqueued_total", queue=queue)
+
+    # Wake the dispatcher right away (at most a few times a second); beat is the fallback
+    if await redis.set(f"fair:{queue}:kick", "1", nx=True, px=200):
+        send_job("dispatch_fair_queue", {"queue": queue})
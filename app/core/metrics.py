@@ -0,0 +1,96 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Set, Tuple
+from app.config import settings
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: dict) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process metrics registry (counters, gauges and summaries).
+    Each API/worker process keeps its own numbers; scrape every process.
+    """
+
+    def __init__(self, tenant_label_limit: int = 50, pinned_tenants: Iterable[int] = ()):
+        self._lock = threading.Lock()
+        self._counters: Dict[LabelKey, float] = defaultdict(float)
+        self._gauges: Dict[LabelKey, float] = {}
+        self._summaries: Dict[LabelKey, list] = {}
+        self.tenant_label_limit = tenant_label_limit
+        self.pinned_tenants = set(pinned_tenants)
+        self._labelled_tenants: Set[int] = set()
+
+    def tenant_label(self, organization_id: int) -> str:
+        """
+        Label value for a per-tenant series. Pinned tenants and the first
+        `tenant_label_limit` others seen get their own series; later tenants share
+        "other", so the number of series stays bounded.
+        """
+        with self._lock:
+            if organization_id in self.pinned_tenants or organization_id in self._labelled_tenants:
+                return str(organization_id)
+            if len(self._labelled_tenants) < self.tenant_label_limit:
+                self._labelled_tenants.add(organization_id)
+                return str(organization_id)
+            return "other"
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        """Increase a counter."""
+        with self._lock:
+            self._counters[_key(name, labels)] += value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        """Set a gauge to its current value."""
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Record one observation (count, sum and max are kept)."""
+        with self._lock:
+            summary = self._summaries.setdefault(_key(name, labels), [0, 0.0, 0.0])
+            summary[0] += 1
+            summary[1] += value
+            summary[2] = max(summary[2], value)
+
+    def snapshot(self) -> dict:
+        """Return every metric as JSON-serializable data."""
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in self._counters.items()
+                ],
+                "gauges": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in self._gauges.items()
+                ],
+                "summaries": [
+                    {
+                        "name": name,
+                        "labels": dict(labels),
+                        "count": count,
+                        "sum": total,
+                        "avg": total / count if count else 0.0,
+                        "max": maximum,
+                    }
+                    for (name, labels), (count, total, maximum) in self._summaries.items()
+                ],
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+            self._labelled_tenants.clear()
+
+
+metrics = MetricsRegistry(
+    tenant_label_limit=settings.METRICS_TENANT_LABEL_LIMIT,
+    pinned_tenants=settings.METRICS_TENANT_LABELS,
+)
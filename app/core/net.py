@@ -0,0 +1,30 @@
+import asyncio
+import ipaddress
+import socket
+from typing import Optional
+
+
+class UnsafeAddress(ValueError):
+    """Raised when a host resolves to a loopback, private or otherwise non-public address."""
+
+
+def port_for(scheme: str, port: Optional[int]) -> int:
+    """Port a URL connects to, filling in the scheme's default."""
+    return port or (443 if scheme == "https" else 80)
+
+
+async def resolve_public_address(host: str, port: int) -> str:
+    """
+    Resolve a host and return the address to connect to.
+    Every address the name resolves to must be public, so a record set that
+    mixes public and internal addresses is rejected as a whole. Raises
+    UnsafeAddress for non-public addresses and socket.gaierror when the name
+    does not resolve.
+    """
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    addresses = [info[4][0] for info in infos]
+    for address in addresses:
+        # Drop an IPv6 zone ("fe80::1%eth0") before parsing
+        if not ipaddress.ip_address(address.split("%", 1)[0]).is_global:
+            raise UnsafeAddress(f"Host {host} resolves to a non-public address")
+    return addresses[0]
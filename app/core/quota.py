@@ -0,0 +1,169 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from app.config import settings
+from app.core.metrics import metrics
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+MAX_LOCAL_KEYS = 10_000
+
+# Sliding-window counter: the previous fixed window is weighted by how much of it
+# still overlaps the sliding window. Requests already admitted locally (`pending`)
+# are always charged; only the current request can be rejected.
+SLIDING_WINDOW_LUA = """
+local current_key = KEYS[1]
+local previous_key = KEYS[2]
+local limit = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local elapsed_ms = tonumber(ARGV[3])
+local pending = tonumber(ARGV[4])
+
+local previous = tonumber(redis.call('GET', previous_key) or '0')
+local current = tonumber(redis.call('GET', current_key) or '0')
+if pending > 0 then
+    current = redis.call('INCRBY', current_key, pending)
+    redis.call('PEXPIRE', current_key, window_ms * 2)
+end
+
+local used = math.floor(previous * (window_ms - elapsed_ms) / window_ms + current)
+if used + 1 > limit then
+    return {0, used}
+end
+
+redis.call('INCR', current_key)
+redis.call('PEXPIRE', current_key, window_ms * 2)
+return {1, used + 1}
+"""
+
+
+@dataclass
+class QuotaDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: int
+
+
+@dataclass
+class _LocalWindow:
+    remaining: int = 0
+    pending: int = 0
+    # Taken out of `pending` by a Redis call that has not returned yet
+    charging: int = 0
+    synced_at: float = 0.0
+    blocked_until: float = 0.0
+
+
+class SlidingWindowQuota:
+    """
+    Per-key request quota shared by every process through Redis.
+
+    To avoid a Redis round trip per request, each process admits requests
+    locally while its last known remaining quota is comfortably above the
+    limit, and charges them to Redis in batches. Keys that hit the limit are
+    rejected locally for a second before Redis is asked again.
+    """
+
+    def __init__(
+        self,
+        window_seconds: int,
+        plan_limits: Dict[str, int],
+        default_plan: str,
+        local_batch_size: int,
+        local_headroom_ratio: float,
+    ):
+        self.window_ms = window_seconds * 1000
+        self.plan_limits = plan_limits
+        self.default_plan = default_plan
+        self.local_batch_size = local_batch_size
+        self.local_headroom_ratio = local_headroom_ratio
+        self._local: Dict[str, _LocalWindow] = {}
+        self._script = None
+
+    def limit_for(self, plan: Optional[str]) -> int:
+        """Get the request limit per window of a plan."""
+        return self.plan_limits.get(plan or self.default_plan, self.plan_limits[self.default_plan])
+
+    async def charge(self, key: str, plan: Optional[str]) -> QuotaDecision:
+        """Charge one request to a key and decide whether it may proceed."""
+        limit = self.limit_for(plan)
+        now_ms = int(time.time() * 1000)
+        window_index, elapsed_ms = divmod(now_ms, self.window_ms)
+        reset_seconds = max(1, (self.window_ms - elapsed_ms + 999) // 1000)
+        now = time.monotonic()
+
+        if len(self._local) > MAX_LOCAL_KEYS:
+            self._prune(now)
+        state = self._local.setdefault(key, _LocalWindow())
+        if state.blocked_until > now:
+            metrics.increment("quota_rejections_total", plan=plan or self.default_plan, source="local")
+            return QuotaDecision(False, limit, 0, reset_seconds)
+
+        headroom = limit * self.local_headroom_ratio
+        if (
+            state.remaining - state.pending > headroom
+            and state.pending < self.local_batch_size
+            and now - state.synced_at < 1.0
+        ):
+            state.pending += 1
+            metrics.increment("quota_local_admits_total")
+            return QuotaDecision(True, limit, state.remaining - state.pending, reset_seconds)
+
+        # Concurrent calls must not charge the same pending requests twice
+        pending, state.pending = state.pending, 0
+        state.charging += pending
+        try:
+            allowed, used = await self._eval(key, window_index, limit, elapsed_ms, pending)
+        except Exception as e:
+            # Fail open: a Redis outage must not take the API down with it.
+            # Locally admitted requests stay pending and are charged by the next call.
+            state.pending += pending
+            logger.warning(f"Quota check failed for {key}: {e}")
+            metrics.increment("quota_errors_total")
+            return QuotaDecision(True, limit, limit, reset_seconds)
+        finally:
+            state.charging -= pending
+
+        state.remaining = max(0, limit - used)
+        state.synced_at = now
+        if not allowed:
+            # Re-check with Redis at most once a second while over the limit
+            state.blocked_until = now + min(reset_seconds, 1)
+            metrics.increment("quota_rejections_total", plan=plan or self.default_plan, source="redis")
+            return QuotaDecision(False, limit, 0, reset_seconds)
+        return QuotaDecision(True, limit, state.remaining, reset_seconds)
+
+    def _prune(self, now: float) -> None:
+        """Forget keys that are neither blocked, recently synced nor owed to Redis."""
+        stale = [
+            key for key, state in self._local.items()
+            if state.blocked_until <= now
+            and now - state.synced_at > self.window_ms / 1000
+            and state.pending == 0
+            and state.charging == 0
+        ]
+        for key in stale:
+            del self._local[key]
+
+    async def _eval(self, key: str, window_index: int, limit: int, elapsed_ms: int, pending: int):
+        if self._script is None:
+            self._script = (await get_redis()).register_script(SLIDING_WINDOW_LUA)
+        metrics.increment("quota_redis_calls_total")
+        # Hash tag keeps both windows of a key in the same cluster slot
+        allowed, used = await self._script(
+            keys=[f"quota:{{{key}}}:{window_index}", f"quota:{{{key}}}:{window_index - 1}"],
+            args=[limit, self.window_ms, elapsed_ms, pending],
+        )
+        return bool(int(allowed)), int(used)
+
+
+request_quota = SlidingWindowQuota(
+    window_seconds=settings.QUOTA_WINDOW_SECONDS,
+    plan_limits=settings.QUOTA_PLAN_LIMITS,
+    default_plan=settings.QUOTA_DEFAULT_PLAN,
+    local_batch_size=settings.QUOTA_LOCAL_BATCH_SIZE,
+    local_headroom_ratio=settings.QUOTA_LOCAL_HEADROOM_RATIO,
+)
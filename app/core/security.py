@@ -1,8 +1,10 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from starlette.requests import HTTPConnection
 from app.config import settings
+from app.core.cache import TwoLevelCache
 
 # Configure bcrypt with compatible settings
 pwd_context = CryptContext(
@@ -23,6 +25,20 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _is_asymmetric() -> bool:
+    return not settings.ALGORITHM.startswith("HS")
+
+
+def _verification_key(token: str) -> Optional[str]:
+    """Pick the key a token must be verified with (by its key ID for asymmetric algorithms)."""
+    if not _is_asymmetric():
+        return settings.SECRET_KEY
+    kid = jwt.get_unverified_header(token).get("kid")
+    if kid is None and len(settings.JWT_PUBLIC_KEYS) == 1:
+        return next(iter(settings.JWT_PUBLIC_KEYS.values()))
+    return settings.JWT_PUBLIC_KEYS.get(kid)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -32,6 +48,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
+    if _is_asymmetric():
+        headers = {"kid": settings.JWT_KEY_ID} if settings.JWT_KEY_ID else None
+        return jwt.encode(to_encode, settings.JWT_PRIVATE_KEY, algorithm=settings.ALGORITHM, headers=headers)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -39,7 +58,67 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 def decode_access_token(token: str) -> Optional[dict]:
     """Decode and verify a JWT token."""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        key = _verification_key(token)
+        if key is None:
+            return None
+        payload = jwt.decode(token, key, algorithms=[settings.ALGORITHM])
         return payload
     except JWTError:
         return None
+
+
+# user_id -> current token version, shared by every process (revocations are broadcast)
+token_version_cache = TwoLevelCache(
+    "token_version",
+    dump=str,
+    load=int,
+    local_ttl=settings.TOKEN_VERSION_LOCAL_TTL_SECONDS,
+    local_max_size=100_000,
+    redis_ttl=settings.TOKEN_VERSION_REDIS_TTL_SECONDS,
+)
+
+
+async def get_token_version(
+    user_id: int,
+    loader: Callable[[], Awaitable[Optional[int]]]
+) -> Optional[int]:
+    """Current token version of a user; `loader` reads it from the database on a cache miss."""
+    version = await token_version_cache.get(str(user_id))
+    if version is not None:
+        return version
+    version = await loader()
+    if version is not None:
+        await token_version_cache.populate(str(user_id), version)
+    return version
+
+
+async def publish_token_version(user_id: int, version: int) -> None:
+    """Make a bumped token version visible to every process."""
+    await token_version_cache.set(str(user_id), version)
+
+
+def get_request_token_payload(request: HTTPConnection) -> Optional[dict]:
+    """
+    Decode the bearer token of a request without touching the database.
+    The result is cached on request.state so it is decoded once per request.
+    """
+    if hasattr(request.state, "token_payload"):
+        return request.state.token_payload
+    
+    payload = None
+    authorization = request.headers.get("Authorization")
+    if authorization:
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            payload = decode_access_token(token)
+    
+    request.state.token_payload = payload
+    return payload
+
+
+def get_request_organization_id(request: HTTPConnection) -> Optional[int]:
+    """Get the tenant a request is authenticated for, if any."""
+    payload = get_request_token_payload(request)
+    if payload is None:
+        return None
+    return payload.get("organization_id")
@@ -0,0 +1,162 @@
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+TENANT_ACTIVE = "active"
+TENANT_MOVING = "moving"
+
+# Name of the shard map on the cache invalidation bus
+SHARD_MAP_CACHE = "shard_map"
+
+
+class TenantMoving(Exception):
+    """A write was attempted for a tenant that is read-only while it moves between shards."""
+
+    def __init__(self, organization_id: int):
+        super().__init__(f"Organization {organization_id} is being moved between shards")
+        self.organization_id = organization_id
+
+
+@dataclass(frozen=True)
+class TenantPlacement:
+    """Where a tenant's rows live and whether they currently accept writes."""
+    shard_key: str
+    status: str = TENANT_ACTIVE
+
+    @property
+    def is_moving(self) -> bool:
+        return self.status == TENANT_MOVING
+
+
+class ShardRouter:
+    """
+    Routes tenants (organization_id) to database engines.
+
+    The default engine hosts the `tenant_shards` directory table. Tenants
+    without a directory row live on the default shard, so a single-database
+    deployment never touches the directory at all. Placements are cached for
+    `cache_ttl` seconds; with an invalidation bus, `publish_invalidation`
+    evicts a tenant's placement in every process right away.
+    """
+
+    def __init__(
+        self,
+        default_engine: AsyncEngine,
+        shard_urls: Dict[str, str],
+        default_shard: str,
+        engine_factory: Callable[[str], AsyncEngine],
+        session_factory: Callable[[AsyncEngine], async_sessionmaker],
+        cache_ttl: int = 60,
+        invalidation_bus: Any = None,
+    ):
+        self.default_shard = default_shard
+        self.cache_ttl = cache_ttl
+        self._shard_urls = {k: v for k, v in shard_urls.items() if k != default_shard}
+        self._engine_factory = engine_factory
+        self._session_factory = session_factory
+        self._engines: Dict[str, AsyncEngine] = {default_shard: default_engine}
+        self._sessionmakers: Dict[str, async_sessionmaker] = {
+            default_shard: session_factory(default_engine)
+        }
+        self._placements: Dict[int, Tuple[TenantPlacement, float]] = {}
+        self._invalidation_bus = invalidation_bus
+        if invalidation_bus is not None:
+            invalidation_bus.subscribe(SHARD_MAP_CACHE, lambda key: self.invalidate(int(key)), self.invalidate)
+
+    @property
+    def is_sharded(self) -> bool:
+        """Whether any shard besides the default one is configured."""
+        return bool(self._shard_urls)
+
+    @property
+    def shard_keys(self) -> list[str]:
+        return [self.default_shard, *self._shard_urls]
+
+    @property
+    def directory_sessionmaker(self) -> async_sessionmaker:
+        """Session factory for the directory (default) database."""
+        return self._sessionmakers[self.default_shard]
+
+    def engine(self, shard_key: str) -> AsyncEngine:
+        """Get (creating lazily) the engine for a shard."""
+        engine = self._engines.get(shard_key)
+        if engine is None:
+            if shard_key not in self._shard_urls:
+                raise KeyError(f"Unknown shard '{shard_key}'")
+            engine = self._engine_factory(self._shard_urls[shard_key])
+            self._engines[shard_key] = engine
+        return engine
+
+    def sessionmaker(self, shard_key: str) -> async_sessionmaker:
+        """Get the session factory for a shard."""
+        factory = self._sessionmakers.get(shard_key)
+        if factory is None:
+            factory = self._session_factory(self.engine(shard_key))
+            self._sessionmakers[shard_key] = factory
+        return factory
+
+    async def resolve(self, organization_id: Optional[int]) -> TenantPlacement:
+        """Resolve a tenant's placement, using the in-process shard map cache."""
+        if organization_id is None or not self.is_sharded:
+            return TenantPlacement(self.default_shard)
+        if self._invalidation_bus is not None:
+            self._invalidation_bus.ensure_listening()
+
+        cached = self._placements.get(organization_id)
+        now = time.monotonic()
+        if cached and cached[1] > now:
+            return cached[0]
+
+        placement = await self._load_placement(organization_id)
+        self._placements[organization_id] = (placement, now + self.cache_ttl)
+        return placement
+
+    async def _load_placement(self, organization_id: int) -> TenantPlacement:
+        async with self.directory_sessionmaker() as session:
+            result = await session.execute(
+                text(
+                    "SELECT shard_key, status FROM tenant_shards "
+                    "WHERE organization_id = :organization_id"
+                ),
+                {"organization_id": organization_id},
+            )
+            row = result.first()
+
+        if row is None:
+            return TenantPlacement(self.default_shard)
+        return TenantPlacement(shard_key=row.shard_key, status=row.status)
+
+    async def get_sessionmaker(self, organization_id: Optional[int]) -> async_sessionmaker:
+        """Get the session factory for the shard hosting a tenant."""
+        placement = await self.resolve(organization_id)
+        return self.sessionmaker(placement.shard_key)
+
+    @asynccontextmanager
+    async def session(self, organization_id: Optional[int], write: bool = False) -> AsyncIterator[AsyncSession]:
+        """Open a session on the shard hosting a tenant; `write` raises TenantMoving while it is being moved."""
+        placement = await self.resolve(organization_id)
+        if write and placement.is_moving:
+            raise TenantMoving(organization_id)
+        async with self.sessionmaker(placement.shard_key)() as session:
+            yield session
+
+    def invalidate(self, organization_id: Optional[int] = None) -> None:
+        """Drop cached placements (all of them when no tenant is given)."""
+        if organization_id is None:
+            self._placements.clear()
+        else:
+            self._placements.pop(organization_id, None)
+
+    async def publish_invalidation(self, organization_id: int) -> None:
+        """Drop a tenant's cached placement here and, through the invalidation bus, in every other process."""
+        self.invalidate(organization_id)
+        if self._invalidation_bus is not None:
+            await self._invalidation_bus.publish(SHARD_MAP_CACHE, str(organization_id))
+
+    async def dispose(self) -> None:
+        """Dispose every shard engine."""
+        for engine in self._engines.values():
+            await engine.dispose()
@@ -0,0 +1,141 @@
+import asyncio
+import functools
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.config import settings
+from app.core.metrics import metrics
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class ResultCodec:
+    """How a result crosses process boundaries (only needed for Redis dedupe)."""
+    dump: Callable[[Any], str]
+    load: Callable[[str], Any]
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is in flight,
+    later callers in this process await the same result instead of issuing their
+    own query. With a codec and SINGLEFLIGHT_REDIS_ENABLED, a short Redis lock
+    extends the dedupe across processes: the lock holder publishes its result for
+    SINGLEFLIGHT_REDIS_RESULT_TTL_MS and other processes wait for it briefly.
+    """
+
+    def __init__(self, name: str, codec: Optional[ResultCodec] = None):
+        self.name = name
+        self.codec = codec
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._calls = 0
+        self._shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn for key, or join the identical call already in flight."""
+        self._calls += 1
+        metrics.increment("singleflight_calls_total", flight=self.name)
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self._record_shared("local")
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader's request went away, not ours: run the call ourselves
+                return await fn()
+
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting; never warn about an unretrieved exception
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            result = await self._run(key, fn)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if self.codec is None or not settings.SINGLEFLIGHT_REDIS_ENABLED:
+            return await fn()
+
+        redis_key = f"singleflight:{self.name}:{key}"
+        try:
+            redis = await get_redis()
+            token = uuid.uuid4().hex
+            acquired = await redis.set(
+                f"{redis_key}:lock", token, nx=True, px=settings.SINGLEFLIGHT_REDIS_LOCK_MS
+            )
+            if not acquired:
+                shared = await self._wait_for_remote(redis, redis_key)
+                if shared is not _MISSING:
+                    self._record_shared("redis")
+                    return shared
+                return await fn()
+        except Exception as e:
+            logger.warning(f"Single-flight Redis dedupe unavailable for {self.name}: {e}")
+            return await fn()
+
+        try:
+            result = await fn()
+            await redis.set(
+                f"{redis_key}:result", self.codec.dump(result), px=settings.SINGLEFLIGHT_REDIS_RESULT_TTL_MS
+            )
+            return result
+        finally:
+            # Release only our own lock
+            if await redis.get(f"{redis_key}:lock") == token:
+                await redis.delete(f"{redis_key}:lock")
+
+    async def _wait_for_remote(self, redis, redis_key: str) -> Any:
+        waited = 0
+        while waited < settings.SINGLEFLIGHT_REDIS_WAIT_MS:
+            raw = await redis.get(f"{redis_key}:result")
+            if raw is not None:
+                return self.codec.load(raw)
+            await asyncio.sleep(0.02)
+            waited += 20
+        return _MISSING
+
+    def _record_shared(self, source: str) -> None:
+        self._shared += 1
+        metrics.increment("singleflight_shared_total", flight=self.name, source=source)
+        metrics.set_gauge("singleflight_coalescing_ratio", self._shared / self._calls, flight=self.name)
+
+
+def singleflight(name: str, key: Callable[..., tuple], codec: Optional[ResultCodec] = None):
+    """
+    Decorator for read-only service methods. `key` takes the method's arguments
+    (not self) and returns the parts of the call key, e.g.
+    `lambda task_id, organization_id: ("task", organization_id, task_id)`; it must
+    include the tenant and every argument that changes the result.
+    Callers sharing a result get the same object; treat it as read-only.
+    """
+    flight = SingleFlight(name, codec)
+
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            call_key = ":".join(str(part) for part in key(*args, **kwargs))
+            return await flight.do(call_key, lambda: method(self, *args, **kwargs))
+
+        wrapper.flight = flight
+        return wrapper
+
+    return decorator
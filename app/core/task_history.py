@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from sqlalchemy.exc import DBAPIError, DisconnectionError, InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+from app.config import settings
+from app.core.database import shard_router
+from app.core.metrics import metrics
+from app.repositories.task_event_repository import TaskEventRepository
+
+logger = logging.getLogger(__name__)
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Whether a failed write is worth retrying (connection and timeout trouble, not bad data or schema)."""
+    if isinstance(exc, (OperationalError, InterfaceError, DisconnectionError, PoolTimeoutError, OSError, asyncio.TimeoutError)):
+        return True
+    return isinstance(exc, DBAPIError) and exc.connection_invalidated
+
+
+class TaskHistoryWriter:
+    """
+    Keeps task history off the request path: events are buffered in process and
+    written with multi-row INSERTs (one transaction per shard) once
+    TASK_HISTORY_FLUSH_SIZE events are waiting or TASK_HISTORY_FLUSH_INTERVAL_SECONDS
+    have passed. Writes that fail transiently (lost connections, timeouts) are
+    retried on the next flush; any other failure would fail again, so those events
+    are dropped, counted and logged. The buffer is bounded
+    by TASK_HISTORY_MAX_BUFFER (newer events are dropped and counted beyond it), and
+    events still buffered when a process dies without shutting down are lost.
+    """
+
+    def __init__(self):
+        self._buffer: List[dict] = []
+        self._wakeup = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def record(
+        self,
+        organization_id: int,
+        task_id: int,
+        event_type: str,
+        changes: dict,
+        actor_id: Optional[int] = None
+    ) -> None:
+        """Queue one event, stamped now; never waits for the database."""
+        if not settings.TASK_HISTORY_ENABLED:
+            return
+        if len(self._buffer) >= settings.TASK_HISTORY_MAX_BUFFER:
+            metrics.increment("task_history_dropped_total")
+            return
+
+        self._buffer.append({
+            "organization_id": organization_id,
+            "task_id": task_id,
+            "actor_id": actor_id,
+            "event_type": event_type,
+            "changes": changes,
+            "created_at": datetime.now(timezone.utc),
+        })
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run())
+        if len(self._buffer) >= settings.TASK_HISTORY_FLUSH_SIZE:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        # Runs only while there is something to write; record() starts it again
+        while self._buffer:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.TASK_HISTORY_FLUSH_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if self._closing:
+                break
+
+    async def flush(self) -> None:
+        """Write every buffered event now."""
+        if not self._buffer:
+            return
+        events, self._buffer = self._buffer, []
+
+        by_organization: Dict[int, List[dict]] = defaultdict(list)
+        for event in events:
+            by_organization[event["organization_id"]].append(event)
+        by_shard: Dict[str, List[dict]] = defaultdict(list)
+        for organization_id, organization_events in by_organization.items():
+            try:
+                placement = await shard_router.resolve(organization_id)
+            except Exception as e:
+                # The flusher must survive a failed lookup, or nothing is written again
+                logger.warning(f"Failed to resolve the shard of organization {organization_id}: {e}")
+                metrics.increment("task_history_write_errors_total", shard="unresolved")
+                self._requeue(organization_events)
+                continue
+            if placement.is_moving:
+                # Read-only while it moves between shards; written to the new shard afterwards
+                self._requeue(organization_events)
+                continue
+            by_shard[placement.shard_key].extend(organization_events)
+
+        for shard_key, shard_events in by_shard.items():
+            try:
+                async with shard_router.sessionmaker(shard_key)() as session:
+                    await TaskEventRepository(session).insert_many(shard_events, settings.TASK_HISTORY_FLUSH_SIZE)
+            except Exception as e:
+                metrics.increment("task_history_write_errors_total", shard=shard_key)
+                if is_transient(e):
+                    logger.warning(f"Failed to write {len(shard_events)} task events to shard '{shard_key}': {e}")
+                    self._requeue(shard_events)
+                else:
+                    logger.error(f"Dropping {len(shard_events)} task events that shard '{shard_key}' rejected: {e}")
+                    metrics.increment("task_history_dropped_total", len(shard_events))
+                continue
+            metrics.increment("task_history_written_total", len(shard_events), shard=shard_key)
+            metrics.observe("task_history_flush_rows", len(shard_events), shard=shard_key)
+
+    def _requeue(self, events: List[dict]) -> None:
+        room = max(0, settings.TASK_HISTORY_MAX_BUFFER - len(self._buffer))
+        if len(events) > room:
+            metrics.increment("task_history_dropped_total", len(events) - room)
+        # Older events go back in front of anything recorded meanwhile
+        self._buffer[:0] = events[:room]
+
+    async def close(self) -> None:
+        """Write what is left (called on shutdown)."""
+        self._closing = True
+        if self._flusher is not None and not self._flusher.done():
+            self._wakeup.set()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        await self.flush()
+
+
+task_history_writer = TaskHistoryWriter()
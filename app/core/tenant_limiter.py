@@ -0,0 +1,122 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+from app.config import settings
+from app.core.metrics import metrics
+
+
+class TenantLimitExceeded(Exception):
+    """Raised when a tenant could not get a slot before the acquire timeout."""
+
+
+class _TenantSlots:
+    __slots__ = ("in_use", "waiters")
+
+    def __init__(self):
+        self.in_use = 0
+        self.waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+
+
+class TenantConcurrencyLimiter:
+    """
+    Weighted per-tenant semaphore in front of database session acquisition.
+
+    Each organization may hold at most `limit_for(organization_id)` weight units
+    at once, so a single tenant can never take every connection in the pool.
+    Waiters are served strictly in arrival order: a heavy waiter at the head is
+    not overtaken by lighter ones arriving later.
+    """
+
+    def __init__(self, default_limit: int, overrides: Dict[int, int], timeout: float):
+        self.default_limit = default_limit
+        self.overrides = overrides
+        self.timeout = timeout
+        self._tenants: Dict[int, _TenantSlots] = {}
+
+    def limit_for(self, organization_id: int) -> int:
+        """Get the concurrency cap of a tenant."""
+        return self.overrides.get(organization_id, self.default_limit)
+
+    def in_use(self, organization_id: int) -> int:
+        slots = self._tenants.get(organization_id)
+        return slots.in_use if slots else 0
+
+    @asynccontextmanager
+    async def acquire(self, organization_id: Optional[int], weight: int = 1) -> AsyncIterator[int]:
+        """
+        Hold `weight` units of a tenant's capacity (at most its whole limit) for the
+        duration of the block; yields the units actually held.
+        """
+        if organization_id is None:
+            # Unauthenticated requests (login, register) are not tenant traffic
+            yield weight
+            return
+
+        limit = self.limit_for(organization_id)
+        weight = min(weight, limit)
+        slots = self._tenants.setdefault(organization_id, _TenantSlots())
+        started = time.perf_counter()
+
+        if not slots.waiters and slots.in_use + weight <= limit:
+            slots.in_use += weight
+        else:
+            waiter = (weight, asyncio.get_running_loop().create_future())
+            slots.waiters.append(waiter)
+            try:
+                # asyncio.wait leaves the future alone on timeout, unlike wait_for
+                done, _ = await asyncio.wait({waiter[1]}, timeout=self.timeout)
+            except asyncio.CancelledError:
+                self._abandon(organization_id, slots, waiter)
+                raise
+            if not done:
+                self._abandon(organization_id, slots, waiter)
+                metrics.increment("tenant_db_rejections_total", organization_id=metrics.tenant_label(organization_id))
+                raise TenantLimitExceeded(
+                    f"Organization {organization_id} exceeded its {limit} concurrent database sessions"
+                )
+
+        label = metrics.tenant_label(organization_id)
+        metrics.observe("tenant_db_wait_seconds", time.perf_counter() - started, organization_id=label)
+        # A gauge shared by the "other" tenants would only show the last one to set it
+        track_in_use = label != "other"
+        if track_in_use:
+            metrics.set_gauge("tenant_db_in_use", slots.in_use, organization_id=label)
+        try:
+            yield weight
+        finally:
+            slots.in_use -= weight
+            self._wake(organization_id, slots)
+            if track_in_use:
+                metrics.set_gauge("tenant_db_in_use", slots.in_use, organization_id=label)
+
+    def _abandon(self, organization_id: int, slots: _TenantSlots, waiter: Tuple[int, asyncio.Future]) -> None:
+        weight, future = waiter
+        if future.done() and not future.cancelled():
+            # The units were handed over just as we gave up; pass them on
+            slots.in_use -= weight
+        else:
+            future.cancel()
+            slots.waiters.remove(waiter)
+        # A heavy waiter leaving the head may let the ones behind it in
+        self._wake(organization_id, slots)
+
+    def _wake(self, organization_id: int, slots: _TenantSlots) -> None:
+        limit = self.limit_for(organization_id)
+        while slots.waiters and slots.in_use + slots.waiters[0][0] <= limit:
+            weight, future = slots.waiters.popleft()
+            if future.done():
+                continue
+            slots.in_use += weight
+            future.set_result(None)
+        if slots.in_use == 0 and not slots.waiters and self._tenants.get(organization_id) is slots:
+            # Idle tenants are dropped, whichever way their last holder or waiter left
+            del self._tenants[organization_id]
+
+
+tenant_limiter = TenantConcurrencyLimiter(
+    default_limit=settings.TENANT_DB_CONCURRENCY,
+    overrides=settings.TENANT_DB_CONCURRENCY_OVERRIDES,
+    timeout=settings.TENANT_DB_ACQUIRE_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from app.config import settings
+from app.core.database import shard_router
+from app.core.metrics import metrics
+from app.core.redis import get_redis
+from app.repositories.organization_repository import OrganizationRepository
+from app.repositories.task_repository import TaskRepository
+from app.repositories.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+# No organization has this ID: hot statements run against it return nothing
+WARMUP_ORGANIZATION_ID = 0
+
+
+class WarmupState:
+    """Progress of this process's startup warmup, reported by /ready."""
+
+    def __init__(self):
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.attempts = 0
+        self.last_error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "attempts": self.attempts,
+            "duration_ms": (
+                round((self.finished_at - self.started_at) * 1000, 1)
+                if self.finished_at and self.started_at else None
+            ),
+            "last_error": self.last_error,
+        }
+
+
+warmup_state = WarmupState()
+
+
+async def _warm_engine(engine: AsyncEngine, connections: int) -> None:
+    """Open `connections` pooled connections at once so later requests find them idle."""
+    # Overflow connections are closed on release; only the pool's own slots stay open
+    connections = min(connections, engine.pool.size())
+
+    async def hold(ready: asyncio.Event, opened: list):
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                opened.append(conn)
+                if len(opened) == connections:
+                    ready.set()
+                await ready.wait()
+        except BaseException:
+            # Release the others rather than leaving them waiting for a connection that never opens
+            ready.set()
+            raise
+
+    ready = asyncio.Event()
+    opened: list = []
+    await asyncio.gather(*(hold(ready, opened) for _ in range(connections)))
+
+
+async def _warm_statements(session: AsyncSession) -> None:
+    """
+    Run the hot read paths once so SQLAlchemy compiles and caches their SQL
+    (and asyncpg prepares it) before real traffic arrives.
+    """
+    organization_id = WARMUP_ORGANIZATION_ID
+    task_repo = TaskRepository(session)
+    user_repo = UserRepository(session)
+    await task_repo.get_by_id(0, organization_id)
+    await task_repo.get_all(organization_id, skip=0, limit=20)
+    await task_repo.count(organization_id)
+    await user_repo.get_by_id(0, organization_id)
+    await user_repo.get_by_email("")
+    await user_repo.get_token_version(0, organization_id)
+    await OrganizationRepository(session).get_by_id(organization_id, organization_id)
+
+
+async def _warm_redis(connections: int) -> None:
+    redis = await get_redis()
+    # Concurrent commands make the pool open that many connections
+    await asyncio.gather(*(redis.ping() for _ in range(connections)))
+
+
+async def warm_up() -> None:
+    """Pre-open DB and Redis connections and pre-compile hot statements on every shard."""
+    for shard_key in shard_router.shard_keys:
+        await _warm_engine(shard_router.engine(shard_key), settings.WARMUP_DB_CONNECTIONS)
+        async with shard_router.sessionmaker(shard_key)() as session:
+            await _warm_statements(session)
+    await _warm_redis(settings.WARMUP_REDIS_CONNECTIONS)
+
+
+async def run_warmup() -> None:
+    """Warm up until it succeeds (dependencies may still be starting), then mark the process ready."""
+    warmup_state.started_at = time.perf_counter()
+    delay = 1.0
+    while True:
+        warmup_state.attempts += 1
+        try:
+            await warm_up()
+        except Exception as e:
+            warmup_state.last_error = f"{type(e).__name__}: {e}"
+            logger.warning(f"Warmup attempt {warmup_state.attempts} failed, retrying in {delay:.0f}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+            continue
+        warmup_state.finished_at = time.perf_counter()
+        warmup_state.ready = True
+        warmup_state.last_error = None
+        metrics.observe("warmup_seconds", warmup_state.finished_at - warmup_state.started_at)
+        logger.info(f"Warmup finished in {warmup_state.finished_at - warmup_state.started_at:.2f}s")
+        return
+
+
+async def _timed(check) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(check(), timeout=settings.READY_CHECK_TIMEOUT_SECONDS)
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    latency_ms = (time.perf_counter() - started) * 1000
+    return {"ok": latency_ms <= settings.READY_MAX_LATENCY_MS, "latency_ms": round(latency_ms, 1)}
+
+
+async def check_dependencies() -> Dict[str, Dict[str, Any]]:
+    """Ping every shard database and Redis concurrently, with latencies."""
+    def database_check(shard_key: str):
+        async def check():
+            async with shard_router.engine(shard_key).connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        return check
+
+    async def redis_check():
+        await (await get_redis()).ping()
+
+    names = [f"database:{shard_key}" for shard_key in shard_router.shard_keys] + ["redis"]
+    checks = [database_check(shard_key) for shard_key in shard_router.shard_keys] + [redis_check]
+    results = await asyncio.gather(*(_timed(check) for check in checks))
+    for name, result in zip(names, results):
+        if "latency_ms" in result:
+            metrics.observe("ready_check_seconds", result["latency_ms"] / 1000, dependency=name)
+    return dict(zip(names, results))
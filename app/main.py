@@ -1,16 +1,65 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.config import settings
-from app.api.v1 import auth, tasks, organizations
+from app.api.deps import require_metrics_token
+from app.api.v1 import auth, batch, tasks, organizations, webhooks
+from app.core.database import shard_router
 from app.core.redis import close_redis
+from app.core.metrics import metrics
+from app.core.events import task_event_hub
+from app.core.cache import cache_bus
+from app.core.task_history import task_history_writer
+from app.core.warmup import check_dependencies, run_warmup, warmup_state
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.deadline import DeadlineMiddleware
+from app.middleware.load_shedding import LoadSheddingMiddleware
+from app.middleware.quota import QuotaMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background: /health answers right away, /ready once warm
+    warmup = asyncio.create_task(run_warmup()) if settings.WARMUP_ENABLED else None
+    if warmup is None:
+        warmup_state.ready = True
+    yield
+    if warmup is not None:
+        warmup.cancel()
+    await task_history_writer.close()
+    await task_event_hub.close()
+    await cache_bus.close()
+    await close_redis()
+    await shard_router.dispose()
+
 
 app = FastAPI(
     title="TaskFlow SaaS API",
     description="Multi-tenant SaaS backend API with FastAPI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# CORS middleware
+# Per-route time budgets (inside quotas and load shedding, so queueing does not count)
+if settings.DEADLINE_ENABLED:
+    app.add_middleware(DeadlineMiddleware)
+
+# Per-tenant request quotas
+if settings.QUOTA_ENABLED:
+    app.add_middleware(QuotaMiddleware)
+
+# Admission control: shed load with 503s before it reaches quotas and the database
+if settings.LOAD_SHED_ENABLED:
+    app.add_middleware(LoadSheddingMiddleware)
+
+# Response compression (every response body passes through it)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# CORS middleware (added last, so it is outermost: 429 and 503 responses from the
+# middleware above carry CORS headers too and browsers can read them)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Configure appropriately for production
@@ -23,6 +72,8 @@ app.add_middleware(
 app.include_router(auth.router, prefix=f"{settings.API_V1_PREFIX}/auth", tags=["auth"])
 app.include_router(tasks.router, prefix=f"{settings.API_V1_PREFIX}/tasks", tags=["tasks"])
 app.include_router(organizations.router, prefix=f"{settings.API_V1_PREFIX}/organizations", tags=["organizations"])
+app.include_router(webhooks.router, prefix=f"{settings.API_V1_PREFIX}/webhooks", tags=["webhooks"])
+app.include_router(batch.router, prefix=f"{settings.API_V1_PREFIX}/batch", tags=["batch"])
 
 
 @app.get("/")
@@ -36,9 +87,29 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+    """Liveness: the process is up (no dependency checks)."""
     return {"status": "healthy"}
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    await close_redis()
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: warmup finished and every dependency answers within READY_MAX_LATENCY_MS."""
+    if not warmup_state.ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "warming", "warmup": warmup_state.as_dict()}
+        )
+    
+    checks = await check_dependencies()
+    ready = all(check["ok"] for check in checks.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "degraded", "checks": checks, "warmup": warmup_state.as_dict()}
+    )
+
+
+@app.get("/metrics", dependencies=[Depends(require_metrics_token)])
+async def metrics_snapshot():
+    """In-process metrics of this API worker (needs METRICS_TOKEN as a bearer token)."""
+    return metrics.snapshot()
+
@@ -0,0 +1,212 @@
+import asyncio
+import time
+import zlib
+from typing import Callable, Dict, Optional, Sequence, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.core.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install zstandard
+    zstandard = None
+
+COMPRESSIBLE_TYPE_PREFIXES = ("text/", "application/json", "application/javascript", "application/xml")
+COMPRESSIBLE_TYPE_SUFFIXES = ("+json", "+xml")
+
+
+class GzipEncoder:
+    def __init__(self):
+        # wbits=31: zlib stream with a gzip header and trailer
+        self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        )
+
+
+class BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.process(data)
+        return output + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class ZstdEncoder:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+
+ENCODERS: Dict[str, Callable] = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+
+
+def negotiate_encoding(accept_encoding: str, available: Sequence[str]) -> Optional[str]:
+    """
+    Pick the encoding with the highest q-value in Accept-Encoding; ties go to the
+    first of `available` (the server's preference). None if nothing is acceptable.
+    """
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _compress_timed(encoder, data: bytes, final: bool) -> Tuple[bytes, float]:
+    # Thread CPU time, so offloaded work is measured on the thread that did it
+    started = time.thread_time()
+    output = encoder.compress(data, final)
+    return output, time.thread_time() - started
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with the best encoding the client accepts (zstd, br or gzip,
+    by COMPRESSION_ALGORITHMS). Complete bodies under COMPRESSION_MIN_SIZE_BYTES,
+    already-encoded and non-text responses are sent as is. Streaming responses are
+    compressed chunk by chunk with a flush after each chunk, so clients still get
+    data as it is produced. Chunks of COMPRESSION_THREAD_THRESHOLD_BYTES or more are
+    compressed in a worker thread to keep the event loop free.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.available = [name for name in settings.COMPRESSION_ALGORITHMS if name in ENCODERS]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.available)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, CompressingSender(encoding, send))
+
+
+class CompressingSender:
+    """Per-response send wrapper: decides on the first body chunk, then compresses or passes through."""
+
+    def __init__(self, encoding: str, send: Send):
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(scope=start)
+            reason = self._skip_reason(headers, body, more_body)
+            if reason is not None:
+                metrics.increment("compression_skipped_total", reason=reason)
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            self.encoder = ENCODERS[self.encoding]()
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+            else:
+                data = await self._compress(body, final=True)
+                headers["Content-Length"] = str(len(data))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": data})
+                self._record()
+                return
+            await self.send(start)
+
+        data = await self._compress(body, final=not more_body)
+        if data or not more_body:
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+        if not more_body:
+            self._record()
+
+    @staticmethod
+    def _skip_reason(headers: MutableHeaders, body: bytes, more_body: bool) -> Optional[str]:
+        if "content-encoding" in headers:
+            return "encoded"
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type in settings.COMPRESSION_EXCLUDED_CONTENT_TYPES or not (
+            content_type.startswith(COMPRESSIBLE_TYPE_PREFIXES)
+            or content_type.endswith(COMPRESSIBLE_TYPE_SUFFIXES)
+        ):
+            return "content_type"
+        if not more_body and len(body) < settings.COMPRESSION_MIN_SIZE_BYTES:
+            return "small"
+        return None
+
+    async def _compress(self, data: bytes, final: bool) -> bytes:
+        if not data and not final:
+            return b""
+        if len(data) >= settings.COMPRESSION_THREAD_THRESHOLD_BYTES:
+            metrics.increment("compression_offloaded_total", encoding=self.encoding)
+            output, cpu_seconds = await asyncio.to_thread(_compress_timed, self.encoder, data, final)
+        else:
+            output, cpu_seconds = _compress_timed(self.encoder, data, final)
+        self.bytes_in += len(data)
+        self.bytes_out += len(output)
+        self.cpu_seconds += cpu_seconds
+        return output
+
+    def _record(self) -> None:
+        metrics.increment("compression_responses_total", encoding=self.encoding)
+        metrics.increment("compression_bytes_in_total", self.bytes_in, encoding=self.encoding)
+        metrics.increment("compression_bytes_out_total", self.bytes_out, encoding=self.encoding)
+        metrics.observe("compression_ratio", self.bytes_in / max(self.bytes_out, 1), encoding=self.encoding)
+        metrics.observe("compression_cpu_seconds", self.cpu_seconds, encoding=self.encoding)
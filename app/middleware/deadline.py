@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import time
+from sqlalchemy.exc import DBAPIError
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL query_canceled: statement_timeout fired
+QUERY_CANCELED_SQLSTATE = "57014"
+
+
+def route_label(scope: Scope) -> str:
+    """"METHOD /path/{template}" of the route a request matches, or "unmatched"."""
+    app = scope.get("app")
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return f"{scope['method']} {route.path}"
+    return "unmatched"
+
+
+def is_statement_timeout(error: BaseException) -> bool:
+    return isinstance(error, DBAPIError) and getattr(error.orig, "sqlstate", None) == QUERY_CANCELED_SQLSTATE
+
+
+class DeadlineMiddleware:
+    """
+    Gives every request a time budget: DEADLINE_ROUTE_MS by route template, else
+    DEADLINE_DEFAULT_MS (0 disables it). The deadline goes into request.state,
+    where get_db turns the remaining budget into a PostgreSQL statement_timeout
+    for each transaction. The handler is cancelled (which cancels a running
+    asyncpg query) when the budget runs out or the client disconnects; timeouts
+    answer 504 if no response has been started.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = route_label(scope)
+        budget_ms = settings.DEADLINE_ROUTE_MS.get(route, settings.DEADLINE_DEFAULT_MS)
+        if budget_ms <= 0:
+            await self.app(scope, receive, send)
+            return
+        scope.setdefault("state", {})["deadline"] = time.monotonic() + budget_ms / 1000
+
+        # The request stream is read by a pump, so a disconnect is seen even while the handler is busy
+        messages: asyncio.Queue = asyncio.Queue()
+        response_started = False
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        handler = asyncio.create_task(self.app(scope, messages.get, send_tracking))
+        pump = asyncio.create_task(self._pump(receive, messages))
+        try:
+            done, _ = await asyncio.wait(
+                {handler, pump}, timeout=budget_ms / 1000, return_when=asyncio.FIRST_COMPLETED
+            )
+            if handler not in done:
+                await self._cancel(handler)
+                if pump in done:
+                    metrics.increment("request_disconnects_total", route=route)
+                    return
+                await self._timed_out(route, "deadline", response_started, scope, receive, send)
+                return
+            try:
+                handler.result()
+            except DBAPIError as e:
+                if not is_statement_timeout(e):
+                    raise
+                await self._timed_out(route, "statement_timeout", response_started, scope, receive, send)
+        finally:
+            pump.cancel()
+            await self._cancel(handler)
+
+    @staticmethod
+    async def _pump(receive: Receive, messages: asyncio.Queue) -> None:
+        while True:
+            message = await receive()
+            messages.put_nowait(message)
+            if message["type"] == "http.disconnect":
+                return
+
+    @staticmethod
+    async def _cancel(task: asyncio.Task) -> None:
+        if task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"Cancelled request handler raised: {e}")
+
+    @staticmethod
+    async def _timed_out(
+        route: str,
+        cause: str,
+        response_started: bool,
+        scope: Scope,
+        receive: Receive,
+        send: Send
+    ) -> None:
+        metrics.increment("request_timeouts_total", route=route, cause=cause)
+        if response_started:
+            # Too late for a status code; the response just ends early
+            return
+        response = JSONResponse(status_code=504, content={"detail": "Request timed out"})
+        await response(scope, receive, send)
+
@@ -0,0 +1,57 @@
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.config import settings
+from app.core.admission import (
+    AdmissionController,
+    Overloaded,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NAMES,
+    PRIORITY_NORMAL,
+    admission_controller,
+)
+from app.core.metrics import metrics
+
+
+def request_priority(method: str, path: str) -> int:
+    """Auth is served first; list, sync and batch calls are shed first."""
+    path = path.rstrip("/") or "/"
+    if any(path.startswith(prefix) for prefix in settings.LOAD_SHED_HIGH_PRIORITY_PREFIXES):
+        return PRIORITY_HIGH
+    if f"{method} {path}" in settings.LOAD_SHED_LOW_PRIORITY_ROUTES:
+        return PRIORITY_LOW
+    return PRIORITY_NORMAL
+
+
+class LoadSheddingMiddleware:
+    """
+    Admission control for HTTP requests (see AdmissionController). Requests that
+    cannot be admitted get an immediate 503 with Retry-After instead of piling
+    up on the database pool. Health, readiness and metrics probes and the
+    long-lived event stream (LOAD_SHED_EXEMPT_PATHS) are never queued or shed.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController = admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].rstrip("/") in settings.LOAD_SHED_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        priority = request_priority(scope["method"], scope["path"])
+        try:
+            async with self.controller.admit(priority):
+                metrics.set_gauge("load_shed_in_flight", self.controller.in_flight)
+                await self.app(scope, receive, send)
+        except Overloaded as e:
+            metrics.increment("load_shed_rejected_total", reason=e.reason, priority=PRIORITY_NAMES[priority])
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is overloaded, please retry shortly"},
+                headers={"Retry-After": str(settings.LOAD_SHED_RETRY_AFTER_SECONDS)},
+            )
+            await response(scope, receive, send)
+        finally:
+            metrics.set_gauge("load_shed_queued", self.controller.queued)
@@ -0,0 +1,65 @@
+from typing import Optional, Tuple
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.core.quota import SlidingWindowQuota, QuotaDecision, request_quota
+from app.core.security import get_request_token_payload
+
+
+def quota_key(connection: HTTPConnection) -> Tuple[str, Optional[str]]:
+    """The quota a request is charged to: its organization, or the client IP when unauthenticated."""
+    payload = get_request_token_payload(connection)
+    if payload and payload.get("organization_id") is not None:
+        return f"org:{payload['organization_id']}", payload.get("plan")
+    client = connection.client.host if connection.client else "unknown"
+    return f"ip:{client}", "anonymous"
+
+
+class QuotaMiddleware:
+    """
+    Charges every API request to its organization's quota (or to the client IP
+    for unauthenticated calls) and answers 429 once the plan limit is reached.
+    """
+
+    def __init__(self, app: ASGIApp, quota: SlidingWindowQuota = request_quota):
+        self.app = app
+        self.quota = quota
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(settings.API_V1_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        key, plan = quota_key(HTTPConnection(scope))
+        decision = await self.quota.charge(key, plan)
+        headers = self._headers(decision)
+
+        if not decision.allowed:
+            headers["Retry-After"] = str(decision.reset_seconds)
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Request quota exceeded for your plan"},
+                headers=headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in headers.items()
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    @staticmethod
+    def _headers(decision: QuotaDecision) -> dict:
+        return {
+            "X-RateLimit-Limit": str(decision.limit),
+            "X-RateLimit-Remaining": str(decision.remaining),
+            "X-RateLimit-Reset": str(decision.reset_seconds),
+        }
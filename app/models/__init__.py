@@ -1,5 +1,9 @@
 from app.models.user import User
 from app.models.organization import Organization
 from app.models.task import Task
+from app.models.task_tombstone import TaskTombstone
+from app.models.task_event import TaskEvent
+from app.models.shard import TenantShard, UserDirectory
+from app.models.webhook import WebhookEndpoint
 
-__all__ = ["User", "Organization", "Task"]
+__all__ = ["User", "Organization", "Task", "TaskTombstone", "TaskEvent", "TenantShard", "UserDirectory", "WebhookEndpoint"]
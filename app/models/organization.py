@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, synonym
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -10,12 +10,19 @@ class Organization(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
     slug = Column(String, unique=True, index=True, nullable=False)
+    # Billing plan, drives per-tenant API quotas
+    plan = Column(String, nullable=False, default="free", server_default="free")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Soft delete: set immediately, children are purged in the background
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
     
-    # Relationships
-    users = relationship("User", back_populates="organization", cascade="all, delete-orphan")
-    tasks = relationship("Task", back_populates="organization", cascade="all, delete-orphan")
+    # An organization is its own tenant; lets BaseRepository scope queries uniformly
+    organization_id = synonym("id")
+    
+    # Relationships (children are removed by ON DELETE CASCADE, never loaded for deletes)
+    users = relationship("User", back_populates="organization", cascade="all, delete-orphan", passive_deletes=True)
+    tasks = relationship("Task", back_populates="organization", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self):
         return f"<Organization(id={self.id}, name={self.name}, slug={self.slug})>"
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class TenantShard(Base):
+    """Directory entry mapping a tenant to the shard hosting its rows."""
+    __tablename__ = "tenant_shards"
+    
+    # No foreign key: the organization row may live on another shard
+    organization_id = Column(Integer, primary_key=True)
+    shard_key = Column(String, nullable=False, index=True)
+    status = Column(String, nullable=False, default="active", server_default="active")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<TenantShard(org_id={self.organization_id}, shard={self.shard_key}, status={self.status})>"
+
+
+class UserDirectory(Base):
+    """Global email index used to find a user's tenant before its shard is known."""
+    __tablename__ = "user_directory"
+    
+    email = Column(String, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    organization_id = Column(Integer, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<UserDirectory(email={self.email}, user_id={self.user_id}, org_id={self.organization_id})>"
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum as SQLEnum, DateTime
+from sqlalchemy import (
+    Column, Integer, String, Text, ForeignKey, Enum as SQLEnum, DateTime, Index, PrimaryKeyConstraint, Sequence
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -19,18 +21,30 @@ class TaskPriority(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    # Hash-partitioned on organization_id with primary key (organization_id, id), as
+    # created by migrations 0003/0004 (the constraint keeps its pre-swap name); ids
+    # still come from the single tasks_id_seq sequence (the ORM calls nextval itself).
+    __table_args__ = (
+        PrimaryKeyConstraint("organization_id", "id", name="tasks_partitioned_pkey"),
+        Index("ix_tasks_organization_id_status", "organization_id", "status"),
+        Index("ix_tasks_organization_id_assignee_id", "organization_id", "assignee_id"),
+        Index("ix_tasks_organization_id_title", "organization_id", "title"),
+        # Keyset order of the delta-sync feed
+        Index("ix_tasks_organization_id_updated_at_id", "organization_id", "updated_at", "id"),
+        {"postgresql_partition_by": "HASH (organization_id)"},
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, nullable=False, index=True)
+    id = Column(Integer, Sequence("tasks_id_seq"))
+    title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
-    status = Column(SQLEnum(TaskStatus), default=TaskStatus.TODO, nullable=False, index=True)
+    status = Column(SQLEnum(TaskStatus), default=TaskStatus.TODO, nullable=False)
     priority = Column(SQLEnum(TaskPriority), default=TaskPriority.MEDIUM, nullable=False)
     
     # Multi-tenancy: task belongs to one organization
-    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False, index=True)
+    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
     
     # Task assignment
-    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
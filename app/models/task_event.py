@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, JSON, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class TaskEvent(Base):
+    """Append-only history entry of a task change: who did it and which fields changed."""
+    __tablename__ = "task_events"
+    # In PostgreSQL the table is range-partitioned by month on created_at (see
+    # migration 0010) with primary key (created_at, id); the ORM identity stays on id.
+    __table_args__ = (
+        Index("ix_task_events_organization_id_task_id_created_at_id", "organization_id", "task_id", "created_at", "id"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    # No foreign keys: history outlives the task and the acting user
+    task_id = Column(Integer, nullable=False)
+    actor_id = Column(Integer, nullable=True)
+    event_type = Column(String, nullable=False)
+    changes = Column(JSON, nullable=False, default=dict)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<TaskEvent(task_id={self.task_id}, type={self.event_type}, org_id={self.organization_id})>"
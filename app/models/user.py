@@ -17,9 +17,11 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     full_name = Column(String, nullable=True)
     role = Column(SQLEnum(UserRole), default=UserRole.MEMBER, nullable=False)
+    # Bumped to revoke every access token issued to the user
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     
     # Multi-tenancy: user belongs to one organization
-    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False, index=True)
+    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Relationships
     organization = relationship("Organization", back_populates="users")
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class WebhookEndpoint(Base):
+    """An organization's URL that receives task events."""
+    __tablename__ = "webhook_endpoints"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String, nullable=False)
+    # HMAC-SHA256 signing secret for the X-Webhook-Signature header
+    secret = Column(String, nullable=False)
+    event_types = Column(JSON, nullable=False, default=list)
+    is_active = Column(Boolean, nullable=False, default=True, server_default="true")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Multi-tenancy
+    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<WebhookEndpoint(id={self.id}, url={self.url}, org_id={self.organization_id})>"
@@ -1,11 +1,19 @@
-from typing import Generic, TypeVar, Type, Optional, List
+from typing import Any, Callable, Dict, Generic, TypeVar, Type, Optional, List, Tuple, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, exists, func, bindparam, Integer
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Executable
+from sqlalchemy.sql.elements import BindParameter
 from app.core.database import Base
+from app.models.organization import Organization
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Hot-path statements, built once per (model, query, variant) and shared by every
+# repository instance. Values are bound at execution, so SQLAlchemy also computes
+# each statement's cache key only once instead of on every request.
+_statements: Dict[tuple, Executable] = {}
+
 
 class BaseRepository(Generic[ModelType]):
     """Base repository with tenant scoping."""
@@ -14,6 +22,29 @@ class BaseRepository(Generic[ModelType]):
         self.model = model
         self.db = db
     
+    def _cached_statement(self, name: str, build: Callable[[], Executable], *variant: Any) -> Executable:
+        """Get a pre-built statement, building it on first use."""
+        key = (self.model, name, *variant)
+        statement = _statements.get(key)
+        if statement is None:
+            statement = _statements[key] = build()
+        return statement
+    
+    def _with_relationships(self, query, load_relationships: Optional[List[str]]):
+        for rel in load_relationships or ():
+            query = query.options(selectinload(getattr(self.model, rel)))
+        return query
+    
+    def _tenant_scope(self, organization_id: Union[int, BindParameter]) -> list:
+        """Conditions scoping a query to a tenant that has not been (soft) deleted."""
+        if self.model is Organization:
+            return [Organization.id == organization_id, Organization.deleted_at.is_(None)]
+        return [
+            self.model.organization_id == organization_id,
+            # Uncorrelated, so PostgreSQL evaluates this primary key probe once per query
+            exists().where(Organization.id == organization_id, Organization.deleted_at.is_(None))
+        ]
+    
     async def get_by_id(
         self,
         id: int,
@@ -21,16 +52,19 @@ class BaseRepository(Generic[ModelType]):
         load_relationships: Optional[List[str]] = None
     ) -> Optional[ModelType]:
         """Get a record by ID scoped to organization."""
-        query = select(self.model).where(
-            self.model.id == id,
-            self.model.organization_id == organization_id
+        query = self._cached_statement(
+            "get_by_id",
+            lambda: self._with_relationships(
+                select(self.model).where(
+                    self.model.id == bindparam("id"),
+                    *self._tenant_scope(bindparam("organization_id"))
+                ),
+                load_relationships
+            ),
+            tuple(load_relationships or ())
         )
         
-        if load_relationships:
-            for rel in load_relationships:
-                query = query.options(selectinload(getattr(self.model, rel)))
-        
-        result = await self.db.execute(query)
+        result = await self.db.execute(query, {"id": id, "organization_id": organization_id})
         return result.scalar_one_or_none()
     
     async def get_all(
@@ -41,24 +75,63 @@ class BaseRepository(Generic[ModelType]):
         load_relationships: Optional[List[str]] = None
     ) -> List[ModelType]:
         """Get all records scoped to organization."""
-        query = select(self.model).where(
-            self.model.organization_id == organization_id
-        ).offset(skip).limit(limit)
-        
-        if load_relationships:
-            for rel in load_relationships:
-                query = query.options(selectinload(getattr(self.model, rel)))
+        query = self._cached_statement(
+            "get_all",
+            lambda: self._with_relationships(
+                select(self.model).where(
+                    *self._tenant_scope(bindparam("organization_id"))
+                ).offset(bindparam("skip", type_=Integer)).limit(bindparam("limit", type_=Integer)),
+                load_relationships
+            ),
+            tuple(load_relationships or ())
+        )
         
-        result = await self.db.execute(query)
+        result = await self.db.execute(
+            query, {"organization_id": organization_id, "skip": skip, "limit": limit}
+        )
         return result.scalars().all()
     
+    async def get_chunk(
+        self,
+        organization_id: int,
+        after_id: int,
+        limit: int,
+        conditions: Optional[list] = None
+    ) -> List[ModelType]:
+        """Get the next keyset page (id order) of a tenant's records, for batch processing."""
+        query = select(self.model).where(
+            self.model.organization_id == organization_id,
+            self.model.id > after_id,
+            *(conditions or [])
+        ).order_by(self.model.id).limit(limit)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+    
+    async def count_chunk(
+        self,
+        organization_id: int,
+        after_id: int,
+        limit: int,
+        conditions: Optional[list] = None
+    ) -> Tuple[int, Optional[int]]:
+        """Count the next keyset page of a tenant's records in SQL; returns the count and the page's last id."""
+        page = select(self.model.id).where(
+            self.model.organization_id == organization_id,
+            self.model.id > after_id,
+            *(conditions or [])
+        ).order_by(self.model.id).limit(limit).subquery()
+        result = await self.db.execute(select(func.count(), func.max(page.c.id)))
+        return tuple(result.one())
+    
     async def count(self, organization_id: int) -> int:
         """Count records scoped to organization."""
-        from sqlalchemy import func
-        query = select(func.count()).select_from(self.model).where(
-            self.model.organization_id == organization_id
+        query = self._cached_statement(
+            "count",
+            lambda: select(func.count()).select_from(self.model).where(
+                *self._tenant_scope(bindparam("organization_id"))
+            )
         )
-        result = await self.db.execute(query)
+        result = await self.db.execute(query, {"organization_id": organization_id})
         return result.scalar_one() or 0
     
     async def create(self, obj: ModelType) -> ModelType:
@@ -72,7 +145,7 @@ class BaseRepository(Generic[ModelType]):
         """Update a record scoped to organization."""
         query = update(self.model).where(
             self.model.id == id,
-            self.model.organization_id == organization_id
+            *self._tenant_scope(organization_id)
         ).values(**update_data).returning(self.model)
         
         result = await self.db.execute(query)
@@ -83,7 +156,7 @@ class BaseRepository(Generic[ModelType]):
         """Delete a record scoped to organization."""
         query = delete(self.model).where(
             self.model.id == id,
-            self.model.organization_id == organization_id
+            *self._tenant_scope(organization_id)
         )
         result = await self.db.execute(query)
         await self.db.commit()
@@ -0,0 +1,50 @@
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from app.models.shard import TenantShard, UserDirectory
+
+
+class DirectoryRepository:
+    """Repository for the global tenant directory (lives on the default shard)."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_user_entry(self, email: str) -> Optional[UserDirectory]:
+        """Get the directory entry for an email."""
+        query = select(UserDirectory).where(UserDirectory.email == email)
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+    
+    async def add_user_entry(self, email: str, user_id: int, organization_id: int) -> UserDirectory:
+        """Register a user in the global email index."""
+        entry = UserDirectory(email=email, user_id=user_id, organization_id=organization_id)
+        self.db.add(entry)
+        await self.db.commit()
+        return entry
+    
+    async def get_tenant_shard(self, organization_id: int) -> Optional[TenantShard]:
+        """Get the directory row for a tenant."""
+        query = select(TenantShard).where(TenantShard.organization_id == organization_id)
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+    
+    async def set_tenant_shard(self, organization_id: int, shard_key: str, status: str) -> None:
+        """Create or update the directory row for a tenant."""
+        query = insert(TenantShard).values(
+            organization_id=organization_id,
+            shard_key=shard_key,
+            status=status
+        ).on_conflict_do_update(
+            index_elements=[TenantShard.organization_id],
+            set_={"shard_key": shard_key, "status": status, "updated_at": func.now()}
+        )
+        await self.db.execute(query)
+        await self.db.commit()
+    
+    async def remove_tenant(self, organization_id: int) -> None:
+        """Drop a tenant's users and placement from the directory."""
+        await self.db.execute(delete(UserDirectory).where(UserDirectory.organization_id == organization_id))
+        await self.db.execute(delete(TenantShard).where(TenantShard.organization_id == organization_id))
+        await self.db.commit()
@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import List, Optional, Type
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, delete, func
+from app.core.database import Base
 from app.models.organization import Organization
 from app.repositories.base import BaseRepository
 
@@ -13,10 +14,21 @@ class OrganizationRepository(BaseRepository[Organization]):
     
     async def get_by_slug(self, slug: str) -> Optional[Organization]:
         """Get organization by slug."""
-        query = select(Organization).where(Organization.slug == slug)
+        query = select(Organization).where(
+            Organization.slug == slug,
+            Organization.deleted_at.is_(None)
+        )
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
     
+    async def get_active_ids(self) -> List[int]:
+        """Get the IDs of all organizations that are not deleted."""
+        query = select(Organization.id).where(
+            Organization.deleted_at.is_(None)
+        ).order_by(Organization.id)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+    
     async def create(self, name: str, slug: str) -> Organization:
         """Create a new organization."""
         org = Organization(name=name, slug=slug)
@@ -24,3 +36,44 @@ class OrganizationRepository(BaseRepository[Organization]):
         await self.db.commit()
         await self.db.refresh(org)
         return org
+    
+    async def soft_delete(self, organization_id: int) -> bool:
+        """Mark an organization deleted and release its slug for reuse."""
+        query = update(Organization).where(
+            Organization.id == organization_id,
+            Organization.deleted_at.is_(None)
+        ).values(
+            deleted_at=func.now(),
+            slug=Organization.slug + f"--deleted-{organization_id}"
+        )
+        result = await self.db.execute(query)
+        await self.db.commit()
+        return result.rowcount > 0
+    
+    async def delete_children_batch(
+        self,
+        model: Type[Base],
+        organization_id: int,
+        batch_size: int
+    ) -> int:
+        """Delete up to batch_size rows of a tenant-scoped model; returns the number deleted."""
+        batch = select(model.id).where(
+            model.organization_id == organization_id
+        ).limit(batch_size).scalar_subquery()
+        query = delete(model).where(
+            model.organization_id == organization_id,
+            model.id.in_(batch)
+        )
+        result = await self.db.execute(query)
+        await self.db.commit()
+        return result.rowcount
+    
+    async def hard_delete(self, organization_id: int) -> bool:
+        """Delete a soft-deleted organization row (remaining children cascade in the database)."""
+        query = delete(Organization).where(
+            Organization.id == organization_id,
+            Organization.deleted_at.is_not(None)
+        )
+        result = await self.db.execute(query)
+        await self.db.commit()
+        return result.rowcount > 0
@@ -0,0 +1,69 @@
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, text, tuple_
+from app.models.task_event import TaskEvent
+from app.repositories.base import BaseRepository
+
+
+def next_month(month: date) -> date:
+    """First day of the month after `month` (which must be a first day)."""
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+class TaskEventRepository(BaseRepository[TaskEvent]):
+    """Repository for TaskEvent model."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(TaskEvent, db)
+
+    async def insert_many(self, events: List[dict], chunk_size: int) -> None:
+        """Append events as multi-row INSERTs of up to chunk_size rows, in one transaction."""
+        for start in range(0, len(events), chunk_size):
+            await self.db.execute(insert(TaskEvent).values(events[start:start + chunk_size]))
+        await self.db.commit()
+
+    async def get_history(
+        self,
+        organization_id: int,
+        task_id: int,
+        before: Optional[Tuple[datetime, int]],
+        limit: int
+    ) -> List[TaskEvent]:
+        """Get a task's events, newest first, older than a (created_at, id) position."""
+        query = select(TaskEvent).where(
+            *self._tenant_scope(organization_id),
+            TaskEvent.task_id == task_id
+        )
+        if before is not None:
+            # Bounding created_at also lets PostgreSQL skip newer monthly partitions
+            query = query.where(tuple_(TaskEvent.created_at, TaskEvent.id) < tuple_(*before))
+        query = query.order_by(TaskEvent.created_at.desc(), TaskEvent.id.desc()).limit(limit)
+
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def create_month_partition(self, month: date) -> str:
+        """
+        Create the partition for a month if it does not exist yet (PostgreSQL); returns its name.
+        Rows of that month written to the DEFAULT partition meanwhile are moved into it.
+        """
+        name = f"task_events_y{month.year}m{month.month:02d}"
+        # Serializes creators (beat runs overlapping, manual runs)
+        await self.db.execute(text("SELECT pg_advisory_xact_lock(hashtext('task_events_partitions'))"))
+        exists = (await self.db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})).scalar_one()
+        if not exists:
+            # Same literals as the partition bounds, so rows are moved exactly as they will be routed
+            start, end = f"'{month.isoformat()}'", f"'{next_month(month).isoformat()}'"
+            await self.db.execute(text(f"CREATE TABLE {name} (LIKE task_events INCLUDING DEFAULTS)"))
+            await self.db.execute(text(
+                f"WITH moved AS ("
+                f"  DELETE FROM task_events_default WHERE created_at >= {start} AND created_at < {end} RETURNING *"
+                f") INSERT INTO {name} SELECT * FROM moved"
+            ))
+            # Attaching builds the partitioned indexes on it and checks the DEFAULT partition holds no such rows
+            await self.db.execute(text(
+                f"ALTER TABLE task_events ATTACH PARTITION {name} FOR VALUES FROM ({start}) TO ({end})"
+            ))
+        await self.db.commit()
+        return name
@@ -1,9 +1,44 @@
-from typing import Optional, List
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from app.models.task import Task, TaskStatus
+from sqlalchemy import select, and_, delete, tuple_, func, bindparam, case, text, Integer, RowMapping
+from sqlalchemy.orm import load_only
+from app.models.task import Task, TaskStatus, TaskPriority
+from app.models.task_tombstone import TaskTombstone
 from app.repositories.base import BaseRepository
 
+# Columns that can be selected by name (the fields of TaskResponse)
+TASK_COLUMNS = {
+    column.key: column
+    for column in (
+        Task.id,
+        Task.title,
+        Task.description,
+        Task.status,
+        Task.priority,
+        Task.organization_id,
+        Task.assignee_id,
+        Task.created_at,
+        Task.updated_at,
+    )
+}
+
+# Board order: most important first, then most recently updated
+PRIORITY_RANK = {TaskPriority.LOW: 0, TaskPriority.MEDIUM: 1, TaskPriority.HIGH: 2}
+
+
+def _priority_rank():
+    # Explicit comparisons, so the enum values are bound through the column's type
+    return case(*((Task.priority == priority, rank) for priority, rank in PRIORITY_RANK.items()))
+
+
+def _row_columns(fields: Tuple[str, ...], description_preview: bool) -> list:
+    return [
+        func.substr(Task.description, 1, bindparam("preview_length", type_=Integer)).label("description")
+        if name == "description" and description_preview else TASK_COLUMNS[name]
+        for name in fields
+    ]
+
 
 class TaskRepository(BaseRepository[Task]):
     """Repository for Task model."""
@@ -11,6 +46,115 @@ class TaskRepository(BaseRepository[Task]):
     def __init__(self, db: AsyncSession):
         super().__init__(Task, db)
     
+    async def get_by_id_only(
+        self,
+        id: int,
+        organization_id: int,
+        fields: Tuple[str, ...]
+    ) -> Optional[Task]:
+        """Get a task with only `fields` loaded (load_only); other attributes must not be accessed."""
+        query = self._cached_statement(
+            "get_by_id_only",
+            lambda: select(Task).options(
+                load_only(*(TASK_COLUMNS[name] for name in fields))
+            ).where(
+                Task.id == bindparam("id"),
+                *self._tenant_scope(bindparam("organization_id"))
+            ),
+            fields
+        )
+        
+        result = await self.db.execute(query, {"id": id, "organization_id": organization_id})
+        return result.scalar_one_or_none()
+    
+    async def get_all_rows(
+        self,
+        organization_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Tuple[str, ...]] = None,
+        description_preview: Optional[int] = None
+    ) -> List[RowMapping]:
+        """
+        Get tasks as read-only row mappings, in the same order as get_all.
+        Only `fields` are selected (all by default); with `description_preview` the
+        description is cut to that many characters in SQL. No ORM objects are built
+        or added to the session's identity map.
+        """
+        fields = fields or tuple(TASK_COLUMNS)
+        preview = description_preview is not None
+        query = self._cached_statement(
+            "get_all_rows",
+            lambda: select(*_row_columns(fields, preview)).where(
+                *self._tenant_scope(bindparam("organization_id"))
+            ).offset(bindparam("skip", type_=Integer)).limit(bindparam("limit", type_=Integer)),
+            fields,
+            preview
+        )
+        
+        params = {"organization_id": organization_id, "skip": skip, "limit": limit}
+        if preview:
+            params["preview_length"] = description_preview
+        result = await self.db.execute(query, params)
+        return result.mappings().all()
+    
+    async def get_board_rows(
+        self,
+        organization_id: int,
+        per_column: int,
+        description_preview: Optional[int] = None
+    ) -> List[RowMapping]:
+        """
+        Get the first `per_column` tasks of every status in board order, in one
+        query: row_number() and count() over each status partition give every
+        row its position and its column's total (`position`, `column_total`).
+        """
+        preview = description_preview is not None
+        
+        def build():
+            board_order = (_priority_rank().desc(), Task.updated_at.desc(), Task.id.desc())
+            ranked = select(
+                *_row_columns(tuple(TASK_COLUMNS), preview),
+                func.row_number().over(partition_by=Task.status, order_by=board_order).label("position"),
+                func.count().over(partition_by=Task.status).label("column_total")
+            ).where(
+                *self._tenant_scope(bindparam("organization_id"))
+            ).subquery("ranked")
+            return select(ranked).where(
+                ranked.c.position <= bindparam("per_column", type_=Integer)
+            ).order_by(ranked.c.status, ranked.c.position)
+        
+        query = self._cached_statement("get_board_rows", build, preview)
+        params = {"organization_id": organization_id, "per_column": per_column}
+        if preview:
+            params["preview_length"] = description_preview
+        result = await self.db.execute(query, params)
+        return result.mappings().all()
+    
+    async def get_column_rows(
+        self,
+        organization_id: int,
+        status: TaskStatus,
+        after: Optional[Tuple[TaskPriority, datetime, int]],
+        limit: int,
+        description_preview: Optional[int] = None
+    ) -> List[RowMapping]:
+        """Get tasks of one status in board order, after a (priority, updated_at, id) position."""
+        rank = _priority_rank()
+        query = select(*_row_columns(tuple(TASK_COLUMNS), description_preview is not None)).where(
+            *self._tenant_scope(organization_id),
+            Task.status == status
+        )
+        if after is not None:
+            priority, updated_at, after_id = after
+            # Descending order, so "after" means a smaller (rank, updated_at, id)
+            query = query.where(tuple_(rank, Task.updated_at, Task.id) < tuple_(PRIORITY_RANK[priority], updated_at, after_id))
+        query = query.order_by(rank.desc(), Task.updated_at.desc(), Task.id.desc()).limit(limit)
+        
+        params = {"preview_length": description_preview} if description_preview is not None else {}
+        result = await self.db.execute(query, params)
+        return result.mappings().all()
+    
     async def get_by_status(
         self,
         organization_id: int,
@@ -19,14 +163,19 @@ class TaskRepository(BaseRepository[Task]):
         limit: int = 100
     ) -> List[Task]:
         """Get tasks by status scoped to organization."""
-        query = select(Task).where(
-            and_(
-                Task.organization_id == organization_id,
-                Task.status == status
-            )
-        ).offset(skip).limit(limit)
+        query = self._cached_statement(
+            "get_by_status",
+            lambda: select(Task).where(
+                and_(
+                    *self._tenant_scope(bindparam("organization_id")),
+                    Task.status == bindparam("status")
+                )
+            ).offset(bindparam("skip", type_=Integer)).limit(bindparam("limit", type_=Integer))
+        )
         
-        result = await self.db.execute(query)
+        result = await self.db.execute(
+            query, {"organization_id": organization_id, "status": status, "skip": skip, "limit": limit}
+        )
         return result.scalars().all()
     
     async def get_by_assignee(
@@ -37,12 +186,98 @@ class TaskRepository(BaseRepository[Task]):
         limit: int = 100
     ) -> List[Task]:
         """Get tasks by assignee scoped to organization."""
+        query = self._cached_statement(
+            "get_by_assignee",
+            lambda: select(Task).where(
+                and_(
+                    *self._tenant_scope(bindparam("organization_id")),
+                    Task.assignee_id == bindparam("assignee_id")
+                )
+            ).offset(bindparam("skip", type_=Integer)).limit(bindparam("limit", type_=Integer))
+        )
+        
+        result = await self.db.execute(
+            query, {"organization_id": organization_id, "assignee_id": assignee_id, "skip": skip, "limit": limit}
+        )
+        return result.scalars().all()
+    
+    async def delete(self, id: int, organization_id: int) -> bool:
+        """Delete a task, leaving a tombstone in the same transaction."""
+        query = delete(Task).where(
+            Task.id == id,
+            *self._tenant_scope(organization_id)
+        ).returning(Task.id)
+        result = await self.db.execute(query)
+        if result.scalar_one_or_none() is None:
+            await self.db.rollback()
+            return False
+        
+        self.db.add(TaskTombstone(task_id=id, organization_id=organization_id))
+        await self.db.commit()
+        return True
+    
+    async def get_changed_since(
+        self,
+        organization_id: int,
+        updated_at: datetime,
+        after_id: int,
+        until: datetime,
+        limit: int
+    ) -> List[Task]:
+        """Get tasks changed after a (updated_at, id) position and before a watermark."""
         query = select(Task).where(
-            and_(
-                Task.organization_id == organization_id,
-                Task.assignee_id == assignee_id
-            )
-        ).offset(skip).limit(limit)
+            *self._tenant_scope(organization_id),
+            tuple_(Task.updated_at, Task.id) > tuple_(updated_at, after_id),
+            Task.updated_at < until
+        ).order_by(Task.updated_at, Task.id).limit(limit)
         
         result = await self.db.execute(query)
         return result.scalars().all()
+    
+    async def get_tombstones_since(
+        self,
+        organization_id: int,
+        deleted_at: datetime,
+        after_id: int,
+        until: datetime,
+        limit: int
+    ) -> List[TaskTombstone]:
+        """Get task tombstones after a (deleted_at, id) position and before a watermark."""
+        query = select(TaskTombstone).where(
+            TaskTombstone.organization_id == organization_id,
+            tuple_(TaskTombstone.deleted_at, TaskTombstone.id) > tuple_(deleted_at, after_id),
+            TaskTombstone.deleted_at < until
+        ).order_by(TaskTombstone.deleted_at, TaskTombstone.id).limit(limit)
+        
+        result = await self.db.execute(query)
+        return result.scalars().all()
+    
+    async def get_sync_watermark(self, lag: timedelta) -> datetime:
+        """
+        Time before which every task write is committed. updated_at and deleted_at
+        are transaction start times, so on PostgreSQL this is the start of the oldest
+        transaction still open on the database (or now() if none is): anything that
+        started earlier has committed and is visible to the next statement. Other
+        databases fall back to database time minus `lag`.
+        """
+        if self.db.bind.dialect.name != "postgresql":
+            result = await self.db.execute(select(func.now()))
+            return result.scalar_one() - lag
+        
+        # Sessions of other roles hide xact_start unless this role has pg_read_all_stats
+        result = await self.db.execute(text(
+            "SELECT least(now(), min(xact_start)) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND backend_type = 'client backend' "
+            "AND xact_start IS NOT NULL AND pid <> pg_backend_pid()"
+        ))
+        return result.scalar_one()
+    
+    async def delete_tombstones(self, ids: List[int], organization_id: int) -> int:
+        """Delete task tombstones by ID; returns the number deleted."""
+        query = delete(TaskTombstone).where(
+            TaskTombstone.organization_id == organization_id,
+            TaskTombstone.id.in_(ids)
+        )
+        result = await self.db.execute(query)
+        await self.db.commit()
+        return result.rowcount
@@ -1,7 +1,9 @@
-from typing import Optional
+from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
 from app.models.user import User
+from app.models.organization import Organization
 from app.repositories.base import BaseRepository
 
 
@@ -11,9 +13,21 @@ class UserRepository(BaseRepository[User]):
     def __init__(self, db: AsyncSession):
         super().__init__(User, db)
     
-    async def get_by_email(self, email: str) -> Optional[User]:
-        """Get user by email (no tenant scoping for auth purposes)."""
-        query = select(User).where(User.email == email)
+    async def get_by_email(
+        self,
+        email: str,
+        load_relationships: Optional[List[str]] = None
+    ) -> Optional[User]:
+        """Get user by email (no tenant scoping for auth purposes, deleted tenants are hidden)."""
+        query = select(User).join(Organization, User.organization_id == Organization.id).where(
+            User.email == email,
+            Organization.deleted_at.is_(None)
+        )
+        
+        if load_relationships:
+            for rel in load_relationships:
+                query = query.options(selectinload(getattr(User, rel)))
+        
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
     
@@ -25,7 +39,25 @@ class UserRepository(BaseRepository[User]):
         """Get user by email scoped to organization."""
         query = select(User).where(
             User.email == email,
-            User.organization_id == organization_id
+            *self._tenant_scope(organization_id)
         )
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
+    
+    async def get_token_version(self, id: int, organization_id: int) -> Optional[int]:
+        """Get the current token version of a user."""
+        query = select(User.token_version).where(
+            User.id == id,
+            *self._tenant_scope(organization_id)
+        )
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+    
+    async def bump_organization_token_versions(self, organization_id: int) -> List[tuple[int, int]]:
+        """Invalidate the tokens of every user of a tenant; returns (user_id, new version) pairs."""
+        query = update(User).where(
+            User.organization_id == organization_id
+        ).values(token_version=User.token_version + 1).returning(User.id, User.token_version)
+        result = await self.db.execute(query)
+        await self.db.commit()
+        return [tuple(row) for row in result.all()]
@@ -0,0 +1,22 @@
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.models.webhook import WebhookEndpoint
+from app.repositories.base import BaseRepository
+
+
+class WebhookRepository(BaseRepository[WebhookEndpoint]):
+    """Repository for WebhookEndpoint model."""
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(WebhookEndpoint, db)
+    
+    async def get_active_for_event(self, organization_id: int, event_type: str) -> List[WebhookEndpoint]:
+        """Get a tenant's active endpoints subscribed to an event type."""
+        query = select(WebhookEndpoint).where(
+            WebhookEndpoint.is_active.is_(True),
+            *self._tenant_scope(organization_id)
+        ).order_by(WebhookEndpoint.id)
+        result = await self.db.execute(query)
+        # Few endpoints per tenant: filter the JSON list here rather than per dialect in SQL
+        return [endpoint for endpoint in result.scalars().all() if event_type in endpoint.event_types]
@@ -10,6 +10,10 @@ class TokenData(BaseModel):
     user_id: int | None = None
     organization_id: int | None = None
     email: str | None = None
+    plan: str | None = None
+    role: str | None = None
+    full_name: str | None = None
+    token_version: int | None = None
 
 
 class UserLogin(BaseModel):
@@ -0,0 +1,26 @@
+from typing import Any, Literal
+from pydantic import BaseModel, Field
+from app.config import settings
+
+
+class BatchRequestItem(BaseModel):
+    id: str | None = Field(default=None, description="Echoed back on the matching response")
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(description="API path with optional query string, e.g. /api/v1/tasks?page=1")
+    headers: dict[str, str] = {}
+    body: Any = None
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchRequestItem] = Field(min_length=1, max_length=settings.BATCH_MAX_REQUESTS)
+
+
+class BatchResponseItem(BaseModel):
+    id: str | None = None
+    status: int
+    headers: dict[str, str]
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: list[BatchResponseItem]
@@ -33,9 +33,65 @@ class TaskResponse(TaskBase):
         from_attributes = True
 
 
+class TaskFieldsResponse(BaseModel):
+    """A task limited to the fields requested with ?fields=; the others are left out of the body."""
+    id: int
+    title: str | None = None
+    description: str | None = None
+    status: TaskStatus | None = None
+    priority: TaskPriority | None = None
+    assignee_id: int | None = None
+    organization_id: int | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
 class PaginatedTasks(BaseModel):
     items: list[TaskResponse]
     total: int
     page: int
     page_size: int
     pages: int
+
+
+class PaginatedTaskFields(BaseModel):
+    items: list[TaskFieldsResponse]
+    total: int
+    page: int
+    page_size: int
+    pages: int
+
+
+class TaskEventResponse(BaseModel):
+    id: int
+    task_id: int
+    actor_id: int | None = None
+    event_type: str
+    changes: dict
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class TaskHistory(BaseModel):
+    items: list[TaskEventResponse]
+    next_cursor: str | None = None
+
+
+class TaskChanges(BaseModel):
+    changed: list[TaskResponse]
+    deleted: list[int]
+    next_token: str
+    has_more: bool
+
+
+class BoardColumn(BaseModel):
+    status: TaskStatus
+    total: int | None = None
+    items: list[TaskResponse]
+    next_cursor: str | None = None
+
+
+class TaskBoard(BaseModel):
+    columns: list[BoardColumn]
@@ -0,0 +1,37 @@
+from typing import Literal
+from pydantic import BaseModel, AnyHttpUrl, Field
+from datetime import datetime
+
+# Events a webhook endpoint can subscribe to
+WebhookEventType = Literal["task.created"]
+
+
+class WebhookEndpointBase(BaseModel):
+    url: AnyHttpUrl
+    event_types: list[WebhookEventType] = Field(default_factory=lambda: ["task.created"], min_length=1)
+    is_active: bool = True
+
+
+class WebhookEndpointCreate(WebhookEndpointBase):
+    pass
+
+
+class WebhookEndpointUpdate(BaseModel):
+    url: AnyHttpUrl | None = None
+    event_types: list[WebhookEventType] | None = Field(default=None, min_length=1)
+    is_active: bool | None = None
+
+
+class WebhookEndpointResponse(WebhookEndpointBase):
+    id: int
+    organization_id: int
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class WebhookEndpointCreated(WebhookEndpointResponse):
+    """Returned once on creation: the only time the signing secret is shown."""
+    secret: str
@@ -2,8 +2,11 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from app.models.user import User, UserRole
+from app.models.organization import Organization
 from app.repositories.user_repository import UserRepository
 from app.repositories.organization_repository import OrganizationRepository
+from app.repositories.directory_repository import DirectoryRepository
+from app.core.database import shard_router
 from app.core.security import verify_password, get_password_hash, create_access_token, decode_access_token
 from app.schemas.auth import UserLogin, UserRegister, TokenData
 from app.config import settings
@@ -16,10 +19,31 @@ class AuthService:
         self.db = db
         self.user_repo = UserRepository(db)
         self.org_repo = OrganizationRepository(db)
+        self.directory_repo = DirectoryRepository(db)
+    
+    async def get_user_by_email(
+        self,
+        email: str,
+        load_relationships: Optional[list[str]] = None
+    ) -> Optional[User]:
+        """
+        Find a user by email across all shards.
+        The global user directory tells which tenant (and so which shard) owns the email;
+        single-database deployments query the users table directly.
+        """
+        if not shard_router.is_sharded:
+            return await self.user_repo.get_by_email(email, load_relationships)
+        
+        entry = await self.directory_repo.get_user_entry(email)
+        if entry is None:
+            return None
+        
+        async with shard_router.session(entry.organization_id) as session:
+            return await UserRepository(session).get_by_email(email, load_relationships)
     
     async def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """Authenticate a user by email and password."""
-        user = await self.user_repo.get_by_email(email)
+        user = await self.get_user_by_email(email, load_relationships=["organization"])
         if not user:
             return None
         
@@ -35,8 +59,8 @@ class AuthService:
         if existing_org:
             raise ValueError(f"Organization with slug '{data.organization_slug}' already exists")
         
-        # Check if user email already exists
-        existing_user = await self.user_repo.get_by_email(data.email)
+        # Check if user email already exists (the directory also covers tenants pending purge)
+        existing_user = await self.directory_repo.get_user_entry(data.email)
         if existing_user:
             raise ValueError(f"User with email '{data.email}' already exists")
         
@@ -57,23 +81,28 @@ class AuthService:
         )
         
         user = await self.user_repo.create(user)
+        await self.directory_repo.add_user_entry(user.email, user.id, user.organization_id)
         
         # Generate token
-        token_data = TokenData(
-            user_id=user.id,
-            organization_id=user.organization_id,
-            email=user.email
-        )
-        access_token = create_access_token(token_data.dict())
+        access_token = self.create_access_token_for_user(user, organization)
         
         return user, access_token
     
-    def create_access_token_for_user(self, user: User) -> str:
-        """Create an access token for a user."""
+    def create_access_token_for_user(
+        self,
+        user: User,
+        organization: Optional[Organization] = None
+    ) -> str:
+        """Create an access token for a user (the user's organization must be loaded or given)."""
+        organization = organization or user.organization
         token_data = TokenData(
             user_id=user.id,
             organization_id=user.organization_id,
-            email=user.email
+            email=user.email,
+            plan=organization.plan,
+            role=user.role.value,
+            full_name=user.full_name,
+            token_version=user.token_version
         )
         return create_access_token(token_data.dict())
     
@@ -86,5 +115,9 @@ class AuthService:
         return TokenData(
             user_id=payload.get("user_id"),
             organization_id=payload.get("organization_id"),
-            email=payload.get("email")
+            email=payload.get("email"),
+            plan=payload.get("plan"),
+            role=payload.get("role"),
+            full_name=payload.get("full_name"),
+            token_version=payload.get("token_version")
         )
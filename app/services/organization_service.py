@@ -2,7 +2,29 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.organization import Organization
 from app.repositories.organization_repository import OrganizationRepository
-from app.schemas.organization import OrganizationUpdate
+from app.repositories.user_repository import UserRepository
+from app.schemas.organization import OrganizationUpdate, OrganizationResponse
+from app.config import settings
+from app.core.cache import TwoLevelCache
+from app.core.security import publish_token_version
+from app.core.singleflight import ResultCodec, singleflight
+from app.core.jobs import QUEUE_BULK, enqueue_fair
+
+# get_organization returns the response schema on both the local and the Redis path
+ORGANIZATION_CODEC = ResultCodec(
+    dump=lambda org: org.model_dump_json() if org else "null",
+    load=lambda raw: None if raw == "null" else OrganizationResponse.model_validate_json(raw),
+)
+
+organization_cache = TwoLevelCache(
+    "organization",
+    dump=lambda org: org.model_dump_json(),
+    load=OrganizationResponse.model_validate_json,
+    local_ttl=settings.ORG_CACHE_LOCAL_TTL_SECONDS,
+    local_max_size=settings.ORG_CACHE_LOCAL_MAX_SIZE,
+    redis_ttl=settings.ORG_CACHE_REDIS_TTL_SECONDS,
+    enabled=settings.ORG_CACHE_ENABLED,
+)
 
 
 class OrganizationService:
@@ -11,13 +33,24 @@ class OrganizationService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.org_repo = OrganizationRepository(db)
+        self.user_repo = UserRepository(db)
     
+    @singleflight("organization.get", lambda organization_id: ("organization", organization_id), ORGANIZATION_CODEC)
     async def get_organization(
         self,
         organization_id: int
-    ) -> Optional[Organization]:
-        """Get organization by ID."""
-        return await self.org_repo.get_by_id(organization_id, organization_id)
+    ) -> Optional[OrganizationResponse]:
+        """Get organization by ID (cached)."""
+        cached = await organization_cache.get(str(organization_id))
+        if cached is not None:
+            return cached
+        
+        org = await self.org_repo.get_by_id(organization_id, organization_id)
+        if org is None:
+            return None
+        result = OrganizationResponse.model_validate(org)
+        await organization_cache.populate(str(organization_id), result)
+        return result
     
     async def update_organization(
         self,
@@ -33,4 +66,28 @@ class OrganizationService:
             if existing and existing.id != organization_id:
                 raise ValueError(f"Organization with slug '{update_data['slug']}' already exists")
         
-        return await self.org_repo.update(organization_id, organization_id, update_data)
+        org = await self.org_repo.update(organization_id, organization_id, update_data)
+        if org is not None:
+            # Write through to every process
+            await organization_cache.set(str(organization_id), OrganizationResponse.model_validate(org))
+        return org
+    
+    async def delete_organization(self, organization_id: int) -> bool:
+        """
+        Delete an organization.
+        The tenant is soft-deleted (and hidden from every repository query) right away;
+        its users and tasks are purged in batches by a background job.
+        """
+        deleted = await self.org_repo.soft_delete(organization_id)
+        if deleted:
+            await organization_cache.invalidate(str(organization_id))
+            # Claims-only authentication never sees the deleted flag; revoke the tenant's tokens
+            for user_id, version in await self.user_repo.bump_organization_token_versions(organization_id):
+                await publish_token_version(user_id, version)
+            await enqueue_fair(
+                "purge_organization",
+                organization_id,
+                {"organization_id": organization_id},
+                queue=QUEUE_BULK
+            )
+        return deleted
@@ -1,11 +1,111 @@
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.task import Task
+from app.models.task import Task, TaskStatus, TaskPriority
 from app.repositories.task_repository import TaskRepository
 from app.repositories.user_repository import UserRepository
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
-from app.utils.pagination import PaginationParams, PaginatedResponse
-from app.workers.tasks import send_task_created_notification
+from app.repositories.task_event_repository import TaskEventRepository
+from app.config import settings
+from app.schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskChanges,
+    TaskFieldsResponse,
+    TaskEventResponse,
+    TaskHistory,
+    PaginatedTasks,
+    BoardColumn,
+    TaskBoard
+)
+from app.utils.pagination import PaginationParams, PaginatedResponse, encode_cursor, decode_cursor
+from app.utils.sync import SyncCursor, SyncTokenExpired, decode_sync_token, encode_sync_token
+from app.core.jobs import QUEUE_CRITICAL, enqueue_fair
+from app.core.cache import TenantVersionedCache
+from app.core.events import publish_task_event
+from app.core.singleflight import ResultCodec, singleflight
+from app.core.task_history import task_history_writer
+
+# Both the local and the Redis path of a flight return the response schema
+TASK_CODEC = ResultCodec(
+    dump=lambda task: task.model_dump_json() if task else "null",
+    load=lambda raw: None if raw == "null" else TaskResponse.model_validate_json(raw),
+)
+
+TASK_PAGE_CODEC = ResultCodec(
+    dump=lambda page: page.model_dump_json(),
+    load=lambda raw: PaginatedResponse[TaskResponse].model_validate_json(raw),
+)
+
+# Sparse results keep only the requested fields as "set"; exclude_unset preserves that
+TASK_FIELDS_CODEC = ResultCodec(
+    dump=lambda task: task.model_dump_json(exclude_unset=True) if task else "null",
+    load=lambda raw: None if raw == "null" else TaskFieldsResponse.model_validate_json(raw),
+)
+
+TASK_FIELDS_PAGE_CODEC = ResultCodec(
+    dump=lambda page: page.model_dump_json(exclude_unset=True),
+    load=lambda raw: PaginatedResponse[TaskFieldsResponse].model_validate_json(raw),
+)
+
+TASK_BOARD_CODEC = ResultCodec(
+    dump=lambda board: board.model_dump_json(),
+    load=lambda raw: TaskBoard.model_validate_json(raw),
+)
+
+TASK_FIELDS = tuple(TaskResponse.model_fields)
+
+# Serialized first pages of GET /tasks; every task write bumps the tenant's version
+task_list_cache = TenantVersionedCache(
+    name="task_list",
+    ttl=settings.TASK_LIST_CACHE_TTL_SECONDS,
+    local_ttl=settings.TASK_LIST_CACHE_LOCAL_TTL_SECONDS,
+    local_max_size=settings.TASK_LIST_CACHE_LOCAL_MAX_SIZE,
+    enabled=settings.TASK_LIST_CACHE_ENABLED,
+)
+
+
+def parse_task_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated `fields` parameter into TaskResponse field names
+    (in a fixed order, always including id). None means all fields.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(TASK_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown task fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in TASK_FIELDS if name in requested or name == "id")
+
+
+def _history_changes(values: dict) -> dict:
+    """Changed fields for the task history; description text is not copied, only flagged."""
+    changes = {name: value for name, value in values.items() if name != "description"}
+    if "description" in values:
+        changes["description_changed"] = True
+    return changes
+
+
+def _board_cursor(row) -> str:
+    return encode_cursor([row["priority"].value, row["updated_at"].isoformat(), row["id"]])
+
+
+def _board_item(row) -> TaskResponse:
+    # Rows come straight from typed columns, so skip validation
+    return TaskResponse.model_construct(**{name: row[name] for name in TASK_FIELDS})
+
+
+def _change_event(event_type: str, task: Task) -> dict:
+    """Compact change event for streaming clients (they refetch details if needed)."""
+    return {
+        "type": event_type,
+        "id": task.id,
+        "status": task.status.value,
+        "priority": task.priority.value,
+        "assignee_id": task.assignee_id,
+        "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+    }
 
 
 class TaskService:
@@ -42,38 +142,78 @@ class TaskService:
         )
         
         task = await self.task_repo.create(task)
+        await task_list_cache.bump(organization_id)
+        task_history_writer.record(
+            organization_id,
+            task.id,
+            "task.created",
+            _history_changes(data.model_dump(mode="json")),
+            actor_id=created_by_user_id
+        )
         
         # Trigger background notification
-        send_task_created_notification.delay(
-            task_id=task.id,
-            organization_id=organization_id
+        await enqueue_fair(
+            "send_task_created_notification",
+            organization_id,
+            {"task_id": task.id, "organization_id": organization_id},
+            queue=QUEUE_CRITICAL
         )
+        await publish_task_event(organization_id, _change_event("task.created", task))
         
         return task
     
+    @singleflight(
+        "task.get",
+        lambda task_id, organization_id: ("task", organization_id, task_id),
+        TASK_CODEC
+    )
     async def get_task(
         self,
         task_id: int,
         organization_id: int
-    ) -> Optional[Task]:
+    ) -> Optional[TaskResponse]:
         """Get a task by ID."""
-        return await self.task_repo.get_by_id(task_id, organization_id)
+        task = await self.task_repo.get_by_id(task_id, organization_id)
+        return TaskResponse.model_validate(task) if task else None
+    
+    @singleflight(
+        "task.get_fields",
+        lambda task_id, organization_id, fields: ("task", organization_id, task_id, ",".join(fields)),
+        TASK_FIELDS_CODEC
+    )
+    async def get_task_fields(
+        self,
+        task_id: int,
+        organization_id: int,
+        fields: Tuple[str, ...]
+    ) -> Optional[TaskFieldsResponse]:
+        """Get a task limited to `fields`; the other columns are not loaded."""
+        task = await self.task_repo.get_by_id_only(task_id, organization_id, fields)
+        if not task:
+            return None
+        return TaskFieldsResponse.model_construct(**{name: getattr(task, name) for name in fields})
     
+    @singleflight(
+        "task.list",
+        lambda organization_id, pagination: ("tasks", organization_id, pagination.page, pagination.page_size),
+        TASK_PAGE_CODEC
+    )
     async def list_tasks(
         self,
         organization_id: int,
         pagination: PaginationParams
     ) -> PaginatedResponse[TaskResponse]:
-        """List tasks with pagination."""
-        tasks = await self.task_repo.get_all(
+        """List tasks with pagination; descriptions are previews (TASK_DESCRIPTION_PREVIEW_LENGTH)."""
+        rows = await self.task_repo.get_all_rows(
             organization_id=organization_id,
             skip=pagination.offset,
-            limit=pagination.limit
+            limit=pagination.limit,
+            description_preview=settings.TASK_DESCRIPTION_PREVIEW_LENGTH or None
         )
         total = await self.task_repo.count(organization_id)
         
-        # Convert SQLAlchemy models to Pydantic schemas
-        task_responses = [TaskResponse.model_validate(task) for task in tasks]
+        # Rows come straight from typed columns, so skip validation
+        task_responses = [TaskResponse.model_construct(**row) for row in rows]
         
         return PaginatedResponse(
             items=task_responses,
@@ -82,11 +222,186 @@ class TaskService:
             page_size=pagination.page_size
         )
     
+    async def list_tasks_json(
+        self,
+        organization_id: int,
+        pagination: PaginationParams
+    ) -> str:
+        """
+        The serialized PaginatedTasks body of `list_tasks`. Pages up to
+        TASK_LIST_CACHE_MAX_PAGE are served from task_list_cache, so a hit
+        touches neither the database nor Pydantic.
+        """
+        version = None
+        key = f"p{pagination.page}:s{pagination.page_size}"
+        if pagination.page <= settings.TASK_LIST_CACHE_MAX_PAGE:
+            # Read before the query: a write racing with it lands in a newer version
+            version = await task_list_cache.version(organization_id)
+        if version is not None:
+            body = await task_list_cache.get(organization_id, version, key)
+            if body is not None:
+                return body
+        
+        result = await self.list_tasks(organization_id, pagination)
+        body = PaginatedTasks.model_construct(
+            items=result.items,
+            total=result.total,
+            page=result.page,
+            page_size=result.page_size,
+            pages=result.pages
+        ).model_dump_json()
+        
+        if version is not None:
+            await task_list_cache.set(organization_id, version, key, body)
+        return body
+    
+    @singleflight(
+        "task.list_fields",
+        lambda organization_id, pagination, fields: (
+            "tasks", organization_id, pagination.page, pagination.page_size, ",".join(fields)
+        ),
+        TASK_FIELDS_PAGE_CODEC
+    )
+    async def list_task_fields(
+        self,
+        organization_id: int,
+        pagination: PaginationParams,
+        fields: Tuple[str, ...]
+    ) -> PaginatedResponse[TaskFieldsResponse]:
+        """List tasks limited to `fields`; a requested description is returned in full."""
+        rows = await self.task_repo.get_all_rows(
+            organization_id=organization_id,
+            skip=pagination.offset,
+            limit=pagination.limit,
+            fields=fields
+        )
+        total = await self.task_repo.count(organization_id)
+        
+        return PaginatedResponse(
+            items=[TaskFieldsResponse.model_construct(**row) for row in rows],
+            total=total,
+            page=pagination.page,
+            page_size=pagination.page_size
+        )
+    
+    @singleflight(
+        "task.board",
+        lambda organization_id, per_column: ("board", organization_id, per_column),
+        TASK_BOARD_CODEC
+    )
+    async def get_board(
+        self,
+        organization_id: int,
+        per_column: int
+    ) -> TaskBoard:
+        """
+        Get the first `per_column` tasks of every status (highest priority, then most
+        recently updated first) with each column's total, from a single query.
+        Each column's `next_cursor` loads more with get_board_column.
+        """
+        rows = await self.task_repo.get_board_rows(
+            organization_id,
+            per_column,
+            description_preview=settings.TASK_DESCRIPTION_PREVIEW_LENGTH or None
+        )
+        
+        columns = {status: BoardColumn(status=status, total=0, items=[]) for status in TaskStatus}
+        for row in rows:
+            column = columns[row["status"]]
+            column.total = row["column_total"]
+            column.items.append(_board_item(row))
+            if row["position"] == per_column and row["column_total"] > per_column:
+                column.next_cursor = _board_cursor(row)
+        
+        return TaskBoard(columns=list(columns.values()))
+    
+    async def get_board_column(
+        self,
+        organization_id: int,
+        status: TaskStatus,
+        cursor: Optional[str],
+        limit: int
+    ) -> BoardColumn:
+        """Get the next tasks of one board column after a cursor from get_board or a previous call."""
+        after = None
+        if cursor:
+            values = decode_cursor(cursor)
+            try:
+                after = (TaskPriority(values[0]), datetime.fromisoformat(values[1]), int(values[2]))
+            except (IndexError, TypeError, ValueError) as e:
+                raise ValueError("Invalid cursor") from e
+        
+        rows = await self.task_repo.get_column_rows(
+            organization_id,
+            status,
+            after,
+            limit + 1,
+            description_preview=settings.TASK_DESCRIPTION_PREVIEW_LENGTH or None
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        return BoardColumn(
+            status=status,
+            items=[_board_item(row) for row in rows],
+            next_cursor=_board_cursor(rows[-1]) if has_more else None
+        )
+    
+    async def get_changes(
+        self,
+        organization_id: int,
+        since: Optional[str],
+        limit: int
+    ) -> TaskChanges:
+        """
+        Get tasks created/updated and deleted since a sync token.
+        A missing token starts a full sync; keep calling with `next_token` while `has_more`.
+        """
+        cursor = decode_sync_token(since)
+        until = await self.task_repo.get_sync_watermark(
+            timedelta(seconds=settings.TASK_SYNC_SAFETY_LAG_SECONDS)
+        )
+        
+        retention = timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+        if not cursor.is_initial and cursor.deleted_at < until - retention:
+            raise SyncTokenExpired("Sync token expired, a full sync is required")
+        
+        tasks = await self.task_repo.get_changed_since(
+            organization_id, cursor.updated_at, cursor.task_id, until, limit + 1
+        )
+        tasks_more = len(tasks) > limit
+        tasks = tasks[:limit]
+        
+        # A full sync has nothing to delete locally
+        tombstones = []
+        if not cursor.is_initial:
+            tombstones = await self.task_repo.get_tombstones_since(
+                organization_id, cursor.deleted_at, cursor.tombstone_id, until, limit + 1
+            )
+        tombstones_more = len(tombstones) > limit
+        tombstones = tombstones[:limit]
+        
+        # Feeds that are drained jump to the watermark so the next call starts there
+        next_cursor = SyncCursor(
+            updated_at=tasks[-1].updated_at if tasks_more else until,
+            task_id=tasks[-1].id if tasks_more else 0,
+            deleted_at=tombstones[-1].deleted_at if tombstones_more else until,
+            tombstone_id=tombstones[-1].id if tombstones_more else 0,
+        )
+        
+        return TaskChanges(
+            changed=[TaskResponse.model_validate(task) for task in tasks],
+            deleted=[tombstone.task_id for tombstone in tombstones],
+            next_token=encode_sync_token(next_cursor),
+            has_more=tasks_more or tombstones_more
+        )
+    
     async def update_task(
         self,
         task_id: int,
         organization_id: int,
-        data: TaskUpdate
+        data: TaskUpdate,
+        actor_id: Optional[int] = None
     ) -> Optional[Task]:
         """Update a task."""
         # Verify assignee if being updated
@@ -99,12 +414,58 @@ class TaskService:
                 raise ValueError("Assignee not found in your organization")
         
         update_data = data.dict(exclude_unset=True)
-        return await self.task_repo.update(task_id, organization_id, update_data)
+        task = await self.task_repo.update(task_id, organization_id, update_data)
+        if task:
+            await task_list_cache.bump(organization_id)
+            task_history_writer.record(
+                organization_id,
+                task_id,
+                "task.updated",
+                _history_changes(data.model_dump(mode="json", exclude_unset=True)),
+                actor_id=actor_id
+            )
+            await publish_task_event(organization_id, _change_event("task.updated", task))
+        return task
     
     async def delete_task(
         self,
         task_id: int,
-        organization_id: int
+        organization_id: int,
+        actor_id: Optional[int] = None
     ) -> bool:
         """Delete a task."""
-        return await self.task_repo.delete(task_id, organization_id)
+        deleted = await self.task_repo.delete(task_id, organization_id)
+        if deleted:
+            await task_list_cache.bump(organization_id)
+            task_history_writer.record(organization_id, task_id, "task.deleted", {}, actor_id=actor_id)
+            await publish_task_event(organization_id, {"type": "task.deleted", "id": task_id})
+        return deleted
+    
+    async def get_history(
+        self,
+        task_id: int,
+        organization_id: int,
+        cursor: Optional[str],
+        limit: int
+    ) -> TaskHistory:
+        """
+        Get a task's change history, newest first; pass `next_cursor` back for older events.
+        Events are written asynchronously, so the latest changes may take up to
+        TASK_HISTORY_FLUSH_INTERVAL_SECONDS to appear.
+        """
+        before = None
+        if cursor:
+            values = decode_cursor(cursor)
+            try:
+                before = (datetime.fromisoformat(values[0]), int(values[1]))
+            except (IndexError, TypeError, ValueError) as e:
+                raise ValueError("Invalid cursor") from e
+        
+        events = await TaskEventRepository(self.db).get_history(organization_id, task_id, before, limit + 1)
+        has_more = len(events) > limit
+        events = events[:limit]
+        
+        return TaskHistory(
+            items=[TaskEventResponse.model_validate(event) for event in events],
+            next_cursor=encode_cursor([events[-1].created_at.isoformat(), events[-1].id]) if has_more else None
+        )
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import Table, select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import shard_router
+from app.core.sharding import ShardRouter, TENANT_ACTIVE, TENANT_MOVING
+from app.models.organization import Organization
+from app.models.task import Task
+from app.models.user import User
+from app.models.webhook import WebhookEndpoint
+from app.models.task_event import TaskEvent
+from app.repositories.directory_repository import DirectoryRepository
+
+logger = logging.getLogger(__name__)
+
+# Writes that started before the bulk copy but committed after it carry an older
+# updated_at; re-copy rows changed within this margin to catch them.
+WRITE_TRANSACTION_MARGIN = timedelta(minutes=1)
+
+
+class TenantMoveService:
+    """
+    Moves one tenant between shards while it stays online.
+
+    1. Bulk copy the tenant's rows to the target shard (reads and writes continue).
+    2. Mark the tenant as moving, which makes it read-only (API requests and
+       worker writes alike), and wait one shard map cache TTL so processes that
+       missed the invalidation broadcast observe the freeze too.
+    3. Copy rows changed since the bulk copy started, and delete target rows
+       that no longer exist on the source.
+    4. Point the directory at the target shard and broadcast it, so writes
+       resume right away; the source copy is purged one cache TTL later, once
+       no process can still be reading it.
+    """
+
+    def __init__(self, router: ShardRouter = shard_router, batch_size: int = 1000):
+        self.router = router
+        self.batch_size = batch_size
+
+    async def move(self, organization_id: int, target_shard: str) -> None:
+        """Move a tenant to another shard."""
+        placement = await self.router.resolve(organization_id)
+        source_shard = placement.shard_key
+        if source_shard == target_shard:
+            logger.info(f"Organization {organization_id} already on shard '{target_shard}'")
+            return
+        if placement.is_moving:
+            raise ValueError(f"Organization {organization_id} is already being moved")
+
+        source = self.router.sessionmaker(source_shard)
+        target = self.router.sessionmaker(target_shard)
+
+        async with source() as src, target() as dst:
+            copy_started_at = (await src.execute(select(func.now()))).scalar_one()
+            await src.commit()
+            await self._copy_tenant(src, dst, organization_id)
+
+            await self._set_directory(organization_id, source_shard, TENANT_MOVING)
+            await asyncio.sleep(self.router.cache_ttl)
+
+            try:
+                await self._copy_tenant(src, dst, organization_id, changed_since=copy_started_at - WRITE_TRANSACTION_MARGIN)
+                # Children first, as in the purge
+                for table in (TaskEvent.__table__, Task.__table__, WebhookEndpoint.__table__, User.__table__):
+                    await self._drop_deleted_rows(src, dst, table, organization_id)
+            except Exception:
+                await self._set_directory(organization_id, source_shard, TENANT_ACTIVE)
+                raise
+
+            await self._set_directory(organization_id, target_shard, TENANT_ACTIVE)
+            await asyncio.sleep(self.router.cache_ttl)
+            await self._purge_source(src, organization_id)
+
+        logger.info(f"Moved organization {organization_id} from '{source_shard}' to '{target_shard}'")
+
+    async def _set_directory(self, organization_id: int, shard_key: str, status: str) -> None:
+        async with self.router.directory_sessionmaker() as session:
+            await DirectoryRepository(session).set_tenant_shard(organization_id, shard_key, status)
+        await self.router.publish_invalidation(organization_id)
+
+    async def _copy_tenant(
+        self,
+        src: AsyncSession,
+        dst: AsyncSession,
+        organization_id: int,
+        changed_since: Optional[datetime] = None
+    ) -> None:
+        org_filter = [Organization.__table__.c.id == organization_id]
+        user_filter = [User.__table__.c.organization_id == organization_id]
+        task_filter = [Task.__table__.c.organization_id == organization_id]
+        webhook_filter = [WebhookEndpoint.__table__.c.organization_id == organization_id]
+        event_filter = [TaskEvent.__table__.c.organization_id == organization_id]
+        if changed_since is not None:
+            org_filter.append(Organization.__table__.c.updated_at >= changed_since)
+            task_filter.append(Task.__table__.c.updated_at >= changed_since)
+            webhook_filter.append(WebhookEndpoint.__table__.c.updated_at >= changed_since)
+            # Task history is append-only
+            event_filter.append(TaskEvent.__table__.c.created_at >= changed_since)
+
+        # Users carry no updated_at, and there are few per tenant: always recopy them
+        await self._copy_table(src, dst, Organization.__table__, org_filter)
+        await self._copy_table(src, dst, User.__table__, user_filter)
+        await self._copy_table(src, dst, Task.__table__, task_filter)
+        await self._copy_table(src, dst, WebhookEndpoint.__table__, webhook_filter)
+        await self._copy_table(src, dst, TaskEvent.__table__, event_filter)
+
+    async def _copy_table(self, src: AsyncSession, dst: AsyncSession, table: Table, filters: list) -> None:
+        """Upsert matching rows into the target shard in keyset batches."""
+        last_id = 0
+        while True:
+            query = select(table).where(*filters, table.c.id > last_id).order_by(table.c.id).limit(self.batch_size)
+            rows = [dict(row) for row in (await src.execute(query)).mappings()]
+            if not rows:
+                break
+
+            owner = "id" if table.name == Organization.__tablename__ else "organization_id"
+            # The partitioned tables are keyed on their partition key plus id
+            conflict = {
+                Task.__tablename__: ["organization_id", "id"],
+                TaskEvent.__tablename__: ["created_at", "id"],
+            }.get(table.name, ["id"])
+            stmt = insert(table).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c[name] for name in conflict],
+                set_={c.name: stmt.excluded[c.name] for c in table.columns if c.name != "id"},
+                # Never overwrite another tenant's row: ids must be unique across shards
+                where=table.c[owner] == stmt.excluded[owner]
+            )
+            result = await dst.execute(stmt)
+            if result.rowcount != len(rows):
+                await dst.rollback()
+                raise RuntimeError(
+                    f"Id collision while copying '{table.name}' to the target shard; "
+                    f"shard sequences must use disjoint ranges"
+                )
+            await dst.commit()
+            last_id = rows[-1]["id"]
+
+    async def _drop_deleted_rows(self, src: AsyncSession, dst: AsyncSession, table: Table, organization_id: int) -> None:
+        """Delete the tenant's rows on the target that were removed from the source during the copy."""
+        last_id = 0
+        while True:
+            target_ids = list((await dst.execute(
+                select(table.c.id).where(
+                    table.c.organization_id == organization_id,
+                    table.c.id > last_id
+                ).order_by(table.c.id).limit(self.batch_size)
+            )).scalars())
+            if not target_ids:
+                break
+            source_ids = set((await src.execute(
+                select(table.c.id).where(table.c.organization_id == organization_id, table.c.id.in_(target_ids))
+            )).scalars())
+
+            stale_ids = [row_id for row_id in target_ids if row_id not in source_ids]
+            if stale_ids:
+                await dst.execute(delete(table).where(
+                    table.c.organization_id == organization_id,
+                    table.c.id.in_(stale_ids)
+                ))
+            await dst.commit()
+            last_id = target_ids[-1]
+
+    async def _purge_source(self, src: AsyncSession, organization_id: int) -> None:
+        """Remove the tenant's rows from the source shard in bounded batches."""
+        for table in (Task.__table__, TaskEvent.__table__, WebhookEndpoint.__table__, User.__table__):
+            while True:
+                batch = select(table.c.id).where(
+                    table.c.organization_id == organization_id
+                ).limit(self.batch_size).scalar_subquery()
+                result = await src.execute(delete(table).where(table.c.id.in_(batch)))
+                await src.commit()
+                if result.rowcount == 0:
+                    break
+
+        await src.execute(delete(Organization.__table__).where(Organization.__table__.c.id == organization_id))
+        await src.commit()
@@ -0,0 +1,78 @@
+import secrets
+import socket
+from typing import List, Optional
+from urllib.parse import urlsplit
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.net import port_for, resolve_public_address
+from app.models.webhook import WebhookEndpoint
+from app.repositories.webhook_repository import WebhookRepository
+from app.schemas.webhook import WebhookEndpointCreate, WebhookEndpointUpdate
+
+
+async def _check_url(url: str) -> None:
+    """
+    Reject endpoints whose host resolves to a loopback/private address unless
+    explicitly allowed (e.g. a local stub server). Deliveries check again
+    before sending, since DNS answers can change after registration.
+    """
+    if settings.WEBHOOK_ALLOW_PRIVATE_HOSTS:
+        return
+    parts = urlsplit(url)
+    try:
+        await resolve_public_address(parts.hostname or "", port_for(parts.scheme, parts.port))
+    except socket.gaierror:
+        raise ValueError("Webhook URL host could not be resolved")
+
+
+class WebhookService:
+    """Service for webhook endpoint operations."""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.webhook_repo = WebhookRepository(db)
+    
+    async def create_endpoint(
+        self,
+        organization_id: int,
+        data: WebhookEndpointCreate
+    ) -> WebhookEndpoint:
+        """Register a webhook endpoint with a freshly generated signing secret."""
+        await _check_url(str(data.url))
+        endpoint = WebhookEndpoint(
+            url=str(data.url),
+            secret=secrets.token_hex(32),
+            event_types=list(data.event_types),
+            is_active=data.is_active,
+            organization_id=organization_id
+        )
+        return await self.webhook_repo.create(endpoint)
+    
+    async def list_endpoints(self, organization_id: int) -> List[WebhookEndpoint]:
+        """List an organization's webhook endpoints."""
+        return await self.webhook_repo.get_all(organization_id=organization_id)
+    
+    async def get_endpoint(
+        self,
+        endpoint_id: int,
+        organization_id: int
+    ) -> Optional[WebhookEndpoint]:
+        """Get a webhook endpoint by ID."""
+        return await self.webhook_repo.get_by_id(endpoint_id, organization_id)
+    
+    async def update_endpoint(
+        self,
+        endpoint_id: int,
+        organization_id: int,
+        data: WebhookEndpointUpdate
+    ) -> Optional[WebhookEndpoint]:
+        """Update a webhook endpoint."""
+        update_data = data.model_dump(exclude_unset=True)
+        if update_data.get("url") is not None:
+            update_data["url"] = str(update_data["url"])
+            await _check_url(update_data["url"])
+        return await self.webhook_repo.update(endpoint_id, organization_id, update_data)
+    
+    async def delete_endpoint(self, endpoint_id: int, organization_id: int) -> bool:
+        """Delete a webhook endpoint."""
+        return await self.webhook_repo.delete(endpoint_id, organization_id)
@@ -1,3 +1,5 @@
+import base64
+import json
 from typing import TypeVar, Generic
 from pydantic import BaseModel
 
@@ -35,3 +37,20 @@ class PaginatedResponse(BaseModel, Generic[T]):
         if self.page_size == 0:
             return 0
         return (self.total + self.page_size - 1) // self.page_size
+
+
+def encode_cursor(values: list) -> str:
+    """Encode a keyset position (JSON-serializable values) as an opaque, URL-safe cursor."""
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Decode a cursor from encode_cursor; raises ValueError if it is malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
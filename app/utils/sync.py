@@ -0,0 +1,56 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class InvalidSyncToken(ValueError):
+    pass
+
+
+class SyncTokenExpired(InvalidSyncToken):
+    """The token predates tombstone retention; the client must do a full sync."""
+
+
+@dataclass
+class SyncCursor:
+    """Keyset positions in the task feed and the tombstone feed."""
+    updated_at: datetime = EPOCH
+    task_id: int = 0
+    deleted_at: datetime = EPOCH
+    tombstone_id: int = 0
+
+    @property
+    def is_initial(self) -> bool:
+        return self.updated_at == EPOCH and self.task_id == 0
+
+
+def encode_sync_token(cursor: SyncCursor) -> str:
+    """Encode a cursor as an opaque, URL-safe token."""
+    raw = json.dumps([
+        cursor.updated_at.isoformat(),
+        cursor.task_id,
+        cursor.deleted_at.isoformat(),
+        cursor.tombstone_id,
+    ], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: Optional[str]) -> SyncCursor:
+    """Decode a token (None means a first, full sync)."""
+    if not token:
+        return SyncCursor()
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        updated_at, task_id, deleted_at, tombstone_id = json.loads(raw)
+        return SyncCursor(
+            updated_at=datetime.fromisoformat(updated_at),
+            task_id=int(task_id),
+            deleted_at=datetime.fromisoformat(deleted_at),
+            tombstone_id=int(tombstone_id),
+        )
+    except (ValueError, TypeError) as e:
+        raise InvalidSyncToken("Invalid sync token") from e
@@ -0,0 +1,228 @@
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple, Type
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.database import Base, shard_router
+from app.core.redis import get_redis
+from app.repositories.base import BaseRepository
+from app.repositories.organization_repository import OrganizationRepository
+
+logger = logging.getLogger(__name__)
+
+RUN_STATUS_RUNNING = "running"
+RUN_STATUS_DONE = "done"
+
+# Checkpoints of finished runs are kept for inspection, then expire
+RUN_KEY_TTL_SECONDS = 7 * 24 * 3600
+
+
+class BatchJob(ABC):
+    """
+    A maintenance job that walks every organization's rows of `model`.
+    Rows are read in keyset chunks (id order) and handed to `process_chunk`;
+    counters it returns are checkpointed with the chunk and given to
+    `finish_tenant` once the organization is done. Jobs that need no rows
+    (only aggregates) override `next_chunk` instead.
+    """
+    name: str
+    model: Type[Base]
+    chunk_size: int = settings.BATCH_JOB_CHUNK_SIZE
+
+    def conditions(self) -> list:
+        """Extra filters on the rows to visit (evaluated per chunk)."""
+        return []
+
+    @abstractmethod
+    async def process_chunk(self, session: AsyncSession, organization_id: int, rows: list) -> Dict[str, int]:
+        """Handle one chunk of rows; returns counters to add to the tenant's totals."""
+
+    async def next_chunk(
+        self,
+        session: AsyncSession,
+        organization_id: int,
+        after_id: int
+    ) -> Tuple[Optional[int], Dict[str, int]]:
+        """Handle the chunk after `after_id`; returns its last id (None when the tenant is done) and counters."""
+        rows = await BaseRepository(self.model, session).get_chunk(
+            organization_id,
+            after_id,
+            self.chunk_size,
+            self.conditions()
+        )
+        if not rows:
+            return None, {}
+        return rows[-1].id, await self.process_chunk(session, organization_id, rows)
+
+    async def finish_tenant(self, organization_id: int, counters: Dict[str, int]) -> None:
+        pass
+
+
+batch_jobs: Dict[str, BatchJob] = {}
+
+
+def register_batch_job(job_class: Type[BatchJob]) -> Type[BatchJob]:
+    """Class decorator registering a batch job under its name."""
+    batch_jobs[job_class.name] = job_class()
+    return job_class
+
+
+def _run_key(job_name: str) -> str:
+    return f"batch:{job_name}:run"
+
+
+def _pending_key(job_name: str, run_id: str) -> str:
+    return f"batch:{job_name}:{run_id}:pending"
+
+
+def _lane_key(job_name: str, run_id: str, lane: int) -> str:
+    return f"batch:{job_name}:{run_id}:lane:{lane}"
+
+
+def _lease_key(job_name: str, run_id: str, lane: int) -> str:
+    return f"batch:{job_name}:{run_id}:lane:{lane}:lease"
+
+
+async def _lease_lanes(job_name: str, run_id: str, lanes: List[int]) -> Dict[int, str]:
+    """
+    Lease lanes to new owner tokens, skipping lanes whose lease is still held
+    (their task is queued or running). A lease lapses after BATCH_JOB_STALE_SECONDS
+    without progress; a task whose token no longer matches stops.
+    """
+    redis = await get_redis()
+    leases = {}
+    for lane in lanes:
+        token = uuid.uuid4().hex
+        if await redis.set(_lease_key(job_name, run_id, lane), token, nx=True, ex=settings.BATCH_JOB_STALE_SECONDS):
+            leases[lane] = token
+    return leases
+
+
+async def _active_organization_ids() -> List[int]:
+    """Organizations to visit, each on the shard that currently hosts it."""
+    organization_ids = []
+    for shard_key in shard_router.shard_keys:
+        async with shard_router.sessionmaker(shard_key)() as session:
+            ids = await OrganizationRepository(session).get_active_ids()
+        for organization_id in ids:
+            if (await shard_router.resolve(organization_id)).shard_key == shard_key:
+                organization_ids.append(organization_id)
+    return organization_ids
+
+
+async def start_batch_run(job_name: str) -> Optional[Tuple[str, Dict[int, str]]]:
+    """
+    Start a run of a job, or resume one whose lanes stopped reporting progress
+    (e.g. their messages were lost with a worker). Returns the run ID and the
+    lanes to schedule with their lease tokens, or None if a healthy run is
+    already in progress. Lanes still leased are not scheduled again.
+    """
+    if job_name not in batch_jobs:
+        raise ValueError(f"Unknown batch job '{job_name}'")
+
+    redis = await get_redis()
+    run_key = _run_key(job_name)
+    run = await redis.hgetall(run_key)
+    now = time.time()
+
+    if run.get("status") == RUN_STATUS_RUNNING:
+        if now - float(run["heartbeat"]) < settings.BATCH_JOB_STALE_SECONDS:
+            return None
+        lanes = [lane for lane in range(int(run["lanes"])) if not run.get(f"lane:{lane}:done")]
+        await redis.hset(run_key, "heartbeat", now)
+        leases = await _lease_lanes(job_name, run["run_id"], lanes)
+        logger.warning(f"[BATCH] Resuming stalled run {run['run_id']} of {job_name}, lanes {sorted(leases)}")
+        return run["run_id"], leases
+
+    organization_ids = await _active_organization_ids()
+    run_id = str(int(now))
+    lanes = min(settings.BATCH_JOB_MAX_PARALLEL, len(organization_ids))
+    if organization_ids:
+        await redis.rpush(_pending_key(job_name, run_id), *organization_ids)
+        await redis.expire(_pending_key(job_name, run_id), RUN_KEY_TTL_SECONDS)
+    await redis.delete(run_key)
+    await redis.hset(run_key, mapping={
+        "run_id": run_id,
+        "status": RUN_STATUS_RUNNING if lanes else RUN_STATUS_DONE,
+        "started_at": now,
+        "heartbeat": now,
+        "lanes": lanes,
+        "lanes_active": lanes,
+        "organizations": len(organization_ids),
+    })
+    logger.info(f"[BATCH] Started run {run_id} of {job_name}: {len(organization_ids)} organizations, {lanes} lanes")
+    return run_id, await _lease_lanes(job_name, run_id, list(range(lanes)))
+
+
+async def process_batch_lane(job_name: str, run_id: str, lane: int, lease: Optional[str]) -> bool:
+    """
+    Process up to BATCH_JOB_CHUNKS_PER_TASK chunks in one lane of a run.
+    A lane works through one organization at a time, taking the next one from
+    the run's pending list. Its position (organization and last id) is
+    checkpointed after every chunk, so a redelivered or resumed lane continues
+    where it stopped. Each chunk renews the lane's lease; a task holding an
+    outdated lease token stops. Returns whether the lane has more work.
+    """
+    job = batch_jobs[job_name]
+    redis = await get_redis()
+    run_key = _run_key(job_name)
+    lane_key = _lane_key(job_name, run_id, lane)
+    lease_key = _lease_key(job_name, run_id, lane)
+
+    if await redis.hget(run_key, "run_id") != run_id:
+        # Superseded by a newer run
+        return False
+
+    for _ in range(settings.BATCH_JOB_CHUNKS_PER_TASK):
+        if await redis.get(lease_key) != lease:
+            # The lease lapsed and the lane was handed to a resumed task
+            logger.warning(f"[BATCH] Lane {lane} of run {run_id} of {job_name} is leased elsewhere, stopping")
+            return False
+        await redis.expire(lease_key, settings.BATCH_JOB_STALE_SECONDS)
+
+        state = await redis.hgetall(lane_key)
+        if not state:
+            organization_id = await redis.lpop(_pending_key(job_name, run_id))
+            if organization_id is None:
+                await _finish_lane(job_name, run_id, lane)
+                return False
+            state = {"organization_id": organization_id, "after_id": "0"}
+            await redis.hset(lane_key, mapping=state)
+            await redis.expire(lane_key, RUN_KEY_TTL_SECONDS)
+
+        organization_id = int(state["organization_id"])
+        async with shard_router.session(organization_id, write=True) as session:
+            last_id, counters = await job.next_chunk(session, organization_id, int(state["after_id"]))
+
+        if last_id is None:
+            counters = {
+                field[len("count:"):]: int(value)
+                for field, value in state.items() if field.startswith("count:")
+            }
+            await job.finish_tenant(organization_id, counters)
+            await redis.delete(lane_key)
+            continue
+
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(lane_key, "after_id", last_id)
+            for name, value in (counters or {}).items():
+                pipe.hincrby(lane_key, f"count:{name}", value)
+            pipe.hset(run_key, "heartbeat", time.time())
+            await pipe.execute()
+
+    return True
+
+
+async def _finish_lane(job_name: str, run_id: str, lane: int) -> None:
+    redis = await get_redis()
+    run_key = _run_key(job_name)
+    await redis.delete(_lease_key(job_name, run_id, lane))
+    # Only the first delivery of a lane's completion counts
+    if not await redis.hsetnx(run_key, f"lane:{lane}:done", 1):
+        return
+    if await redis.hincrby(run_key, "lanes_active", -1) <= 0:
+        await redis.hset(run_key, mapping={"status": RUN_STATUS_DONE, "finished_at": time.time()})
+        await redis.expire(run_key, RUN_KEY_TTL_SECONDS)
+        logger.info(f"[BATCH] Run {run_id} of {job_name} finished")
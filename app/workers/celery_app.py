@@ -1,5 +1,16 @@
 from celery import Celery
+from celery.schedules import crontab
+from kombu import Queue
 from app.config import settings
+from app.core.jobs import (
+    BROKER_PRIORITY_STEPS,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    QUEUE_BULK,
+    QUEUE_CRITICAL,
+    QUEUE_DEFAULT
+)
 
 celery_app = Celery(
     "taskflow",
@@ -14,7 +25,61 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
-    task_track_started=True,
+    # Nothing reads task state or return values; tasks that need them opt in
+    task_track_started=False,
+    task_ignore_result=True,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
+    task_queues=(
+        # Explicit routing keys; otherwise every queue would bind the default key
+        Queue(QUEUE_CRITICAL, routing_key=QUEUE_CRITICAL),
+        Queue(QUEUE_DEFAULT, routing_key=QUEUE_DEFAULT),
+        Queue(QUEUE_BULK, routing_key=QUEUE_BULK),
+    ),
+    task_default_queue=QUEUE_DEFAULT,
+    task_default_priority=PRIORITY_NORMAL,
+    task_routes={
+        "send_task_created_notification": {"queue": QUEUE_CRITICAL, "priority": PRIORITY_HIGH},
+        "dispatch_fair_queue": {"queue": QUEUE_CRITICAL, "priority": PRIORITY_HIGH},
+        "purge_organization": {"queue": QUEUE_BULK, "priority": PRIORITY_LOW},
+        "deliver_webhook_events": {"queue": QUEUE_DEFAULT},
+        "retry_webhook_delivery": {"queue": QUEUE_DEFAULT, "priority": PRIORITY_LOW},
+        "run_batch_job": {"queue": QUEUE_BULK, "priority": PRIORITY_LOW},
+        "run_batch_lane": {"queue": QUEUE_BULK, "priority": PRIORITY_LOW},
+        "ensure_task_event_partitions": {"queue": QUEUE_BULK},
+    },
+    broker_transport_options={
+        "priority_steps": BROKER_PRIORITY_STEPS,
+        "sep": ":",
+        "queue_order_strategy": "priority",
+    },
+    # Prefetching would let a worker sit on low-priority jobs while urgent ones wait
+    worker_prefetch_multiplier=1,
+    beat_schedule={
+        # Safety net for fair-queued jobs whose dispatcher kick was lost
+        **{
+            f"dispatch-fair-{queue}": {
+                "task": "dispatch_fair_queue",
+                "schedule": 1.0,
+                "kwargs": {"queue": queue},
+            }
+            for queue in (QUEUE_CRITICAL, QUEUE_BULK)
+        },
+        # Chunked maintenance jobs (a run still in progress is left alone, a stalled one resumed)
+        "batch-purge-task-tombstones": {
+            "task": "run_batch_job",
+            "schedule": crontab(hour=3, minute=15),
+            "kwargs": {"job_name": "purge_task_tombstones"},
+        },
+        # Monthly task_events partitions, created well before they are needed
+        "task-event-partitions": {
+            "task": "ensure_task_event_partitions",
+            "schedule": crontab(hour=2, minute=30),
+        },
+        "batch-stale-task-rollup": {
+            "task": "run_batch_job",
+            "schedule": crontab(minute=0),
+            "kwargs": {"job_name": "stale_task_rollup"},
+        },
+    },
 )
@@ -0,0 +1,59 @@
+import json
+import logging
+from app.config import settings
+from app.core.jobs import BROKER_PRIORITY_STEPS, fair_jobs_prefix, fair_ring_key, send_job
+from app.core.metrics import metrics
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Take the next job of the organization at the head of the ring, and move that
+# organization to the tail if it has more jobs (jobs are queued by app.core.jobs.enqueue_fair).
+DEQUEUE_LUA = """
+local ring_key = KEYS[1]
+local jobs_prefix = ARGV[1]
+local organization_id = redis.call('LPOP', ring_key)
+if not organization_id then
+    return nil
+end
+local jobs_key = jobs_prefix .. organization_id
+local job = redis.call('LPOP', jobs_key)
+if redis.call('LLEN', jobs_key) > 0 then
+    redis.call('RPUSH', ring_key, organization_id)
+end
+return job
+"""
+
+
+async def broker_backlog(queue: str) -> int:
+    """Jobs already waiting in a Celery queue (the Redis transport keeps one list per priority step)."""
+    redis = await get_redis()
+    keys = [queue if step == 0 else f"{queue}:{step}" for step in BROKER_PRIORITY_STEPS]
+    lengths = [await redis.llen(key) for key in keys]
+    return sum(lengths)
+
+
+async def dispatch_fair(queue: str) -> int:
+    """
+    Move pending jobs of a queue to Celery, one organization at a time.
+    Only tops the broker queue up to CELERY_FAIR_DISPATCH_MAX_BACKLOG so that
+    ordering decisions stay here rather than in a long FIFO.
+    """
+    redis = await get_redis()
+    capacity = min(
+        settings.CELERY_FAIR_DISPATCH_BATCH_SIZE,
+        settings.CELERY_FAIR_DISPATCH_MAX_BACKLOG - await broker_backlog(queue)
+    )
+    dispatched = 0
+    while dispatched < capacity:
+        raw = await redis.eval(DEQUEUE_LUA, 1, fair_ring_key(queue), fair_jobs_prefix(queue))
+        if raw is None:
+            break
+        job = json.loads(raw)
+        send_job(job["task"], job["kwargs"], queue=queue, priority=job["priority"])
+        dispatched += 1
+
+    if dispatched:
+        metrics.increment("fair_queue_dispatched_total", dispatched, queue=queue)
+        logger.debug(f"Dispatched {dispatched} fair-queued jobs to {queue}")
+    return dispatched
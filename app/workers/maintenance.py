@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.redis import get_redis
+from app.models.task import Task, TaskStatus
+from app.models.task_tombstone import TaskTombstone
+from app.repositories.base import BaseRepository
+from app.repositories.task_repository import TaskRepository
+from app.workers.batch import BatchJob, register_batch_job
+
+
+def task_rollup_key(organization_id: int) -> str:
+    """Redis hash of per-tenant task aggregates maintained by batch jobs."""
+    return f"task_rollups:{organization_id}"
+
+
+@register_batch_job
+class PurgeTaskTombstones(BatchJob):
+    """Delete tombstones older than the delta-sync retention (expired sync tokens no longer need them)."""
+    name = "purge_task_tombstones"
+    model = TaskTombstone
+
+    def conditions(self) -> list:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+        return [TaskTombstone.deleted_at < cutoff]
+
+    async def process_chunk(self, session: AsyncSession, organization_id: int, rows: list) -> Dict[str, int]:
+        deleted = await TaskRepository(session).delete_tombstones([row.id for row in rows], organization_id)
+        return {"deleted": deleted}
+
+
+@register_batch_job
+class StaleTaskRollup(BatchJob):
+    """Count open tasks that have not been touched for STALE_TASK_DAYS, per tenant."""
+    name = "stale_task_rollup"
+    model = Task
+
+    def conditions(self) -> list:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.STALE_TASK_DAYS)
+        return [Task.status != TaskStatus.DONE, Task.updated_at < cutoff]
+
+    async def next_chunk(
+        self,
+        session: AsyncSession,
+        organization_id: int,
+        after_id: int
+    ) -> Tuple[Optional[int], Dict[str, int]]:
+        # Counted in SQL: no rows are loaded
+        stale, last_id = await BaseRepository(Task, session).count_chunk(
+            organization_id,
+            after_id,
+            self.chunk_size,
+            self.conditions()
+        )
+        return last_id, {"stale": stale}
+
+    async def process_chunk(self, session: AsyncSession, organization_id: int, rows: list) -> Dict[str, int]:
+        return {"stale": len(rows)}
+
+    async def finish_tenant(self, organization_id: int, counters: Dict[str, int]) -> None:
+        redis = await get_redis()
+        await redis.hset(task_rollup_key(organization_id), mapping={
+            "stale_open_tasks": counters.get("stale", 0),
+            "stale_computed_at": datetime.now(timezone.utc).isoformat(),
+        })
@@ -0,0 +1,18 @@
+import asyncio
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run_async(coro: Coroutine) -> Any:
+    """
+    Run a coroutine on this worker process's long-lived event loop.
+    Engines and the Redis client keep pooled connections bound to the loop that
+    opened them, so every task in a process must share one loop (asyncio.run
+    would create and close a new loop per task).
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
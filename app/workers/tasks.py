@@ -1,29 +1,45 @@
+import asyncio
 import logging
-from typing import Optional
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from datetime import date
+from typing import List, Optional
+from celery.signals import worker_process_shutdown
 from app.workers.celery_app import celery_app
+from app.workers.fair_queue import dispatch_fair
+from app.workers.batch import start_batch_run, process_batch_lane
+from app.workers import maintenance  # noqa: F401  (registers the batch jobs)
+from app.workers.runtime import run_async
+from app.workers.webhook_delivery import (
+    backoff_seconds,
+    buffer_webhook_event,
+    take_webhook_batch,
+    webhook_engine
+)
 from app.config import settings
+from app.core.database import shard_router
+from app.core.sharding import TenantMoving
+from app.core.redis import get_redis
 from app.models.task import Task
+from app.models.task_tombstone import TaskTombstone
+from app.models.task_event import TaskEvent
+from app.models.user import User
 from app.repositories.task_repository import TaskRepository
+from app.repositories.organization_repository import OrganizationRepository
+from app.repositories.directory_repository import DirectoryRepository
+from app.repositories.webhook_repository import WebhookRepository
+from app.repositories.task_event_repository import TaskEventRepository, next_month
 
 logger = logging.getLogger(__name__)
 
-# Create async engine for workers
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
-AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
 
 @celery_app.task(name="send_task_created_notification")
 def send_task_created_notification(task_id: int, organization_id: int):
     """
     Background task to send notification when a task is created.
-    In production, this would send an email/webhook.
-    For now, we log to console and Redis queue.
+    The event is buffered for batched delivery to the organization's webhooks;
+    email is still mocked (logged to console).
     """
-    import asyncio
-    
     async def _send_notification():
-        async with AsyncSessionLocal() as session:
+        async with shard_router.session(organization_id) as session:
             task_repo = TaskRepository(session)
             task = await task_repo.get_by_id(task_id, organization_id)
             
@@ -35,12 +51,8 @@ def send_task_created_notification(task_id: int, organization_id: int):
                     f"Assignee={task.assignee_id or 'Unassigned'}"
                 )
                 
-                # In production, you would:
-                # 1. Send email via SES/SendGrid
-                # 2. Send webhook to configured endpoints
-                # 3. Update notification queue in Redis
+                # In production, you would also send email via SES/SendGrid
                 
-                # Example mock implementation:
                 notification_data = {
                     "type": "task_created",
                     "task_id": task.id,
@@ -52,9 +64,200 @@ def send_task_created_notification(task_id: int, organization_id: int):
                 }
                 
                 logger.info(f"[MOCK EMAIL] Would send to assignee: {notification_data}")
+                
+                if await buffer_webhook_event(organization_id, {**notification_data, "type": "task.created"}):
+                    deliver_webhook_events.apply_async(
+                        kwargs={"organization_id": organization_id},
+                        countdown=settings.WEBHOOK_BATCH_WINDOW_MS / 1000
+                    )
                 return notification_data
             else:
                 logger.warning(f"Task {task_id} not found for notification")
                 return None
     
-    return asyncio.run(_send_notification())
+    return run_async(_send_notification())
+
+
+@celery_app.task(name="deliver_webhook_events")
+def deliver_webhook_events(organization_id: int):
+    """
+    Deliver a batch of a tenant's buffered events to each subscribed endpoint.
+    Endpoints are sent to concurrently; failed batches are retried per endpoint
+    with exponential backoff.
+    """
+    async def _deliver():
+        events, more = await take_webhook_batch(organization_id)
+        if more:
+            deliver_webhook_events.delay(organization_id=organization_id)
+        if not events:
+            return 0
+        
+        async with shard_router.session(organization_id) as session:
+            endpoints = await WebhookRepository(session).get_active_for_event(organization_id, "task.created")
+        
+        results = await asyncio.gather(*(
+            webhook_engine.deliver(endpoint.id, endpoint.url, endpoint.secret, events)
+            for endpoint in endpoints
+        ))
+        for endpoint, result in zip(endpoints, results):
+            if not result.ok and result.retryable:
+                retry_webhook_delivery.apply_async(
+                    kwargs={
+                        "endpoint_id": endpoint.id,
+                        "organization_id": organization_id,
+                        "events": events,
+                        "attempt": 1
+                    },
+                    countdown=backoff_seconds(1)
+                )
+            elif not result.ok:
+                logger.warning(f"[WEBHOOK] Endpoint {endpoint.id} rejected {len(events)} events: {result.error}")
+        return len(events)
+    
+    return run_async(_deliver())
+
+
+@celery_app.task(name="retry_webhook_delivery")
+def retry_webhook_delivery(endpoint_id: int, organization_id: int, events: List[dict], attempt: int):
+    """Retry a failed batch for one endpoint, backing off until WEBHOOK_MAX_ATTEMPTS."""
+    async def _retry():
+        async with shard_router.session(organization_id) as session:
+            endpoint = await WebhookRepository(session).get_by_id(endpoint_id, organization_id)
+        if endpoint is None or not endpoint.is_active:
+            return False
+        
+        result = await webhook_engine.deliver(endpoint.id, endpoint.url, endpoint.secret, events)
+        if result.ok:
+            return True
+        if result.retryable and attempt + 1 < settings.WEBHOOK_MAX_ATTEMPTS:
+            retry_webhook_delivery.apply_async(
+                kwargs={
+                    "endpoint_id": endpoint_id,
+                    "organization_id": organization_id,
+                    "events": events,
+                    "attempt": attempt + 1
+                },
+                countdown=backoff_seconds(attempt + 1)
+            )
+        else:
+            logger.warning(
+                f"[WEBHOOK] Dropping {len(events)} events for endpoint {endpoint_id} "
+                f"after {attempt + 1} attempts: {result.error}"
+            )
+        return False
+    
+    return run_async(_retry())
+
+
+@worker_process_shutdown.connect
+def close_webhook_client(**kwargs):
+    """Close the pooled webhook HTTP client with the worker process."""
+    run_async(webhook_engine.close())
+
+
+@celery_app.task(name="dispatch_fair_queue")
+def dispatch_fair_queue(queue: str):
+    """Hand fair-queued jobs of a queue to Celery, round-robin across organizations."""
+    return run_async(dispatch_fair(queue))
+
+
+@celery_app.task(name="run_batch_job")
+def run_batch_job(job_name: str):
+    """Start (or resume a stalled run of) a chunked maintenance job; see app/workers/batch.py."""
+    started = run_async(start_batch_run(job_name))
+    if started is None:
+        logger.info(f"[BATCH] {job_name} is already running")
+        return
+    run_id, leases = started
+    for lane, lease in leases.items():
+        run_batch_lane.delay(job_name=job_name, run_id=run_id, lane=lane, lease=lease)
+
+
+@celery_app.task(
+    name="run_batch_lane",
+    acks_late=True,
+    autoretry_for=(TenantMoving,),
+    default_retry_delay=settings.SHARD_MAP_CACHE_TTL_SECONDS,
+    max_retries=None
+)
+def run_batch_lane(job_name: str, run_id: str, lane: int, lease: Optional[str] = None):
+    """
+    Process a slice of one lane of a batch run, then re-queue the lane with its lease.
+    Short tasks let other jobs (and tenants) interleave with long maintenance runs.
+    A lane whose tenant is being moved between shards is retried after the move.
+    """
+    if run_async(process_batch_lane(job_name, run_id, lane, lease)):
+        run_batch_lane.delay(job_name=job_name, run_id=run_id, lane=lane, lease=lease)
+
+
+@celery_app.task(name="ensure_task_event_partitions")
+def ensure_task_event_partitions():
+    """Create the monthly task_events partitions for this month and the next TASK_HISTORY_PARTITIONS_AHEAD, on every shard."""
+    async def _ensure():
+        created = []
+        for shard_key in shard_router.shard_keys:
+            async with shard_router.sessionmaker(shard_key)() as session:
+                repo = TaskEventRepository(session)
+                month = date.today().replace(day=1)
+                for _ in range(settings.TASK_HISTORY_PARTITIONS_AHEAD + 1):
+                    created.append(f"{shard_key}:{await repo.create_month_partition(month)}")
+                    month = next_month(month)
+        logger.info(f"[PARTITIONS] task_events partitions ensured: {', '.join(created)}")
+    
+    run_async(_ensure())
+
+
+def purge_progress_key(organization_id: int) -> str:
+    """Redis hash tracking the purge of a deleted organization."""
+    return f"org_purge:{organization_id}"
+
+
+@celery_app.task(
+    name="purge_organization",
+    acks_late=True,
+    autoretry_for=(TenantMoving,),
+    default_retry_delay=settings.SHARD_MAP_CACHE_TTL_SECONDS,
+    max_retries=None
+)
+def purge_organization(organization_id: int):
+    """
+    Background task to purge a soft-deleted organization.
+    Children are deleted in bounded batches, one short transaction each, so the
+    job never loads rows into memory and can be safely re-run after a crash.
+    Progress is kept in the `org_purge:<organization_id>` Redis hash.
+    """
+    async def _purge():
+        redis = await get_redis()
+        progress_key = purge_progress_key(organization_id)
+        await redis.hset(progress_key, mapping={"status": "running"})
+        
+        async with shard_router.session(organization_id, write=True) as session:
+            org_repo = OrganizationRepository(session)
+            for model, field in (
+                (Task, "tasks_deleted"),
+                (TaskTombstone, "tombstones_deleted"),
+                (TaskEvent, "task_events_deleted"),
+                (User, "users_deleted")
+            ):
+                while True:
+                    deleted = await org_repo.delete_children_batch(
+                        model,
+                        organization_id,
+                        settings.ORG_PURGE_BATCH_SIZE
+                    )
+                    if deleted == 0:
+                        break
+                    await redis.hincrby(progress_key, field, deleted)
+            
+            await org_repo.hard_delete(organization_id)
+        
+        async with shard_router.directory_sessionmaker() as session:
+            await DirectoryRepository(session).remove_tenant(organization_id)
+        await shard_router.publish_invalidation(organization_id)
+        
+        await redis.hset(progress_key, mapping={"status": "done"})
+        progress = await redis.hgetall(progress_key)
+        logger.info(f"[PURGE] Organization {organization_id} purged: {progress}")
+        return progress
+    
+    return run_async(_purge())
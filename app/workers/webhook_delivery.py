@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import random
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+import httpx
+from app.config import settings
+from app.core.metrics import metrics
+from app.core.net import UnsafeAddress, port_for, resolve_public_address
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying; other 4xx mean the receiver rejected the payload
+RETRYABLE_STATUS_CODES = {408, 425, 429}
+
+
+def webhook_events_key(organization_id: int) -> str:
+    """Redis list buffering a tenant's events until the next batched delivery."""
+    return f"webhook_events:{organization_id}"
+
+
+def webhook_flush_key(organization_id: int) -> str:
+    """Set while a batched delivery of a tenant's events is scheduled."""
+    return f"webhook_flush:{organization_id}"
+
+
+async def buffer_webhook_event(organization_id: int, event: dict) -> bool:
+    """
+    Buffer an event for batched delivery.
+    Returns True when the caller must schedule the delivery (no flush pending yet).
+    """
+    redis = await get_redis()
+    await redis.rpush(webhook_events_key(organization_id), json.dumps(event, default=str))
+    return bool(await redis.set(
+        webhook_flush_key(organization_id), "1", nx=True, px=settings.WEBHOOK_BATCH_WINDOW_MS * 10
+    ))
+
+
+async def take_webhook_batch(organization_id: int) -> tuple[List[dict], bool]:
+    """Pop the next batch of buffered events; also returns whether more are left."""
+    redis = await get_redis()
+    # Cleared first, so an event buffered from now on schedules its own delivery
+    await redis.delete(webhook_flush_key(organization_id))
+    raw = await redis.lpop(webhook_events_key(organization_id), settings.WEBHOOK_BATCH_SIZE) or []
+    remaining = await redis.llen(webhook_events_key(organization_id))
+    return [json.loads(item) for item in raw], remaining > 0
+
+
+def backoff_seconds(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given (1-based) retry attempt."""
+    ceiling = min(settings.WEBHOOK_BACKOFF_MAX_SECONDS, settings.WEBHOOK_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def sign_payload(secret: str, timestamp: str, body: bytes) -> str:
+    """HMAC-SHA256 over "<timestamp>.<body>", as sent in X-Webhook-Signature."""
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+@dataclass
+class DeliveryResult:
+    ok: bool
+    retryable: bool = False
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint breaker: after `failure_threshold` consecutive failures the
+    endpoint is skipped for `reset_seconds`, then a single trial request decides
+    whether it closes again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at < self.reset_seconds or self.trial_in_flight:
+            return False
+        self.trial_in_flight = True
+        return True
+
+    def release(self) -> None:
+        """End a trial without an outcome (the attempt never reached the receiver)."""
+        self.trial_in_flight = False
+
+    def record(self, ok: bool) -> None:
+        self.trial_in_flight = False
+        if ok:
+            self.failures = 0
+            self.opened_at = None
+            return
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class WebhookDeliveryEngine:
+    """
+    Sends webhook batches over one pooled HTTP client per worker process.
+    Concurrency is capped per destination host so a slow receiver cannot tie
+    up every connection, and a circuit breaker per endpoint stops hammering
+    receivers that keep failing.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._breakers: Dict[int, CircuitBreaker] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=settings.WEBHOOK_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=settings.WEBHOOK_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.WEBHOOK_MAX_CONNECTIONS,
+                ),
+                follow_redirects=False,
+            )
+        return self._client
+
+    def _breaker(self, endpoint_id: int) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint_id)
+        if breaker is None:
+            breaker = CircuitBreaker(settings.WEBHOOK_CIRCUIT_FAILURE_THRESHOLD, settings.WEBHOOK_CIRCUIT_RESET_SECONDS)
+            self._breakers[endpoint_id] = breaker
+        return breaker
+
+    def _host_slot(self, host: str) -> asyncio.Semaphore:
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(settings.WEBHOOK_PER_HOST_CONCURRENCY)
+            self._host_slots[host] = slot
+        return slot
+
+    async def _pin_address(self, url: str) -> tuple[httpx.URL, dict]:
+        """
+        Resolve the endpoint's host now and send to the checked address, so a
+        DNS answer that changes after the check (rebinding) cannot redirect the
+        request to an internal service. Host header and TLS SNI keep the name.
+        """
+        target = httpx.URL(url)
+        if settings.WEBHOOK_ALLOW_PRIVATE_HOSTS:
+            return target, {}
+        address = await resolve_public_address(target.host, port_for(target.scheme, target.port))
+        return target.copy_with(host=address), {"sni_hostname": target.host}
+
+    async def deliver(self, endpoint_id: int, url: str, secret: str, events: List[dict]) -> DeliveryResult:
+        """POST one batch of events to an endpoint."""
+        breaker = self._breaker(endpoint_id)
+        if not breaker.allow():
+            metrics.increment("webhook_deliveries_total", outcome="circuit_open")
+            return DeliveryResult(ok=False, retryable=True, error="circuit open")
+
+        # Every path ends the attempt on the breaker, or a half-open trial would stay in flight for good
+        try:
+            result = await self._send(url, secret, events)
+        except UnsafeAddress as e:
+            breaker.release()
+            # Retrying cannot help; the endpoint URL has to change
+            metrics.increment("webhook_deliveries_total", outcome="blocked")
+            return DeliveryResult(ok=False, retryable=False, error=str(e))
+        except BaseException:
+            breaker.release()
+            raise
+
+        breaker.record(result.ok)
+        metrics.increment(
+            "webhook_deliveries_total",
+            outcome="success" if result.ok else ("retry" if result.retryable else "rejected")
+        )
+        if result.ok:
+            metrics.increment("webhook_events_delivered_total", len(events))
+        return result
+
+    async def _send(self, url: str, secret: str, events: List[dict]) -> DeliveryResult:
+        host = urlsplit(url).netloc
+        try:
+            target, extensions = await self._pin_address(url)
+        except socket.gaierror as e:
+            return DeliveryResult(ok=False, retryable=True, error=f"DNS lookup failed: {e}")
+
+        body = json.dumps({"events": events}, default=str).encode()
+        timestamp = str(int(time.time()))
+        headers = {
+            "Host": httpx.URL(url).netloc.decode("ascii"),
+            "Content-Type": "application/json",
+            "X-Webhook-Id": uuid.uuid4().hex,
+            "X-Webhook-Timestamp": timestamp,
+            "X-Webhook-Signature": sign_payload(secret, timestamp, body),
+        }
+
+        async with self._host_slot(host):
+            started = time.perf_counter()
+            try:
+                response = await self.client.post(target, content=body, headers=headers, extensions=extensions)
+            except httpx.HTTPError as e:
+                return DeliveryResult(ok=False, retryable=True, error=f"{type(e).__name__}: {e}")
+            finally:
+                metrics.observe("webhook_delivery_seconds", time.perf_counter() - started, host=host)
+
+        ok = response.is_success
+        return DeliveryResult(
+            ok=ok,
+            retryable=not ok and (response.status_code >= 500 or response.status_code in RETRYABLE_STATUS_CODES),
+            status_code=response.status_code,
+            error=None if ok else f"HTTP {response.status_code}",
+        )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+webhook_engine = WebhookDeliveryEngine()
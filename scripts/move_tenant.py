@@ -0,0 +1,43 @@
+"""
+Move one tenant (organization) to another database shard while it stays online.
+
+Usage:
+    python scripts/move_tenant.py <organization_id> <target_shard>
+
+The target shard must be configured in SHARD_DATABASE_URLS and migrated to head.
+The tenant is read-only for roughly SHARD_MAP_CACHE_TTL_SECONDS during the cut-over.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import shard_router
+from app.services.tenant_move_service import TenantMoveService
+
+
+async def move_tenant(organization_id: int, target_shard: str, batch_size: int):
+    """Move a tenant and dispose every shard engine afterwards."""
+    try:
+        await TenantMoveService(batch_size=batch_size).move(organization_id, target_shard)
+        print(f"✅ Organization {organization_id} now lives on shard '{target_shard}'")
+    except Exception as e:
+        print(f"❌ Error moving organization {organization_id}: {e}")
+        raise
+    finally:
+        await shard_router.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("organization_id", type=int)
+    parser.add_argument("target_shard")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(move_tenant(args.organization_id, args.target_shard, args.batch_size))
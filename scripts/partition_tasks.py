@@ -0,0 +1,205 @@
+"""
+Online conversion of the tasks table to hash partitions.
+
+Usage:
+    alembic upgrade 0003_partition_tasks_prepare
+    python scripts/partition_tasks.py backfill [--batch-size 5000]
+    python scripts/partition_tasks.py verify
+    alembic upgrade 0004_partition_tasks_swap
+    python scripts/partition_tasks.py explain --organization-id 1
+
+`backfill` copies rows from `tasks` into `tasks_partitioned` in keyset batches
+(one short transaction each; concurrent writes are mirrored by a trigger) and
+records the highest id it covered. `verify` checks both tables hold the same
+rows. `swap` swaps the tables when migration 0004 ran before the backfill and
+skipped it. `explain` runs the tenant-scoped TaskRepository queries under
+EXPLAIN and fails unless each plan touches exactly one partition.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import event, text
+from app.core.database import AsyncSessionLocal, engine
+from app.models.task import TaskStatus
+from app.repositories.task_repository import TaskRepository
+
+ROOT = Path(__file__).parent.parent
+SWAP_REVISION = "0004_partition_tasks_swap"
+
+COLUMNS = "id, title, description, status, priority, organization_id, assignee_id, created_at, updated_at"
+
+
+async def backfill(batch_size: int):
+    """Copy existing rows into the partitioned table."""
+    async with AsyncSessionLocal() as session:
+        max_id = (await session.execute(text("SELECT coalesce(max(id), 0) FROM tasks"))).scalar_one()
+        await session.commit()
+
+        last_id = 0
+        copied = 0
+        removed = 0
+        while last_id < max_id:
+            result = await session.execute(
+                text(
+                    f"INSERT INTO tasks_partitioned ({COLUMNS}) "
+                    f"SELECT {COLUMNS} FROM tasks WHERE id > :last_id AND id <= :upper "
+                    f"ON CONFLICT (organization_id, id) DO NOTHING"
+                ),
+                {"last_id": last_id, "upper": last_id + batch_size},
+            )
+            await session.commit()
+            copied += result.rowcount
+
+            # A row deleted while its batch was being copied can be resurrected; drop those
+            result = await session.execute(
+                text(
+                    "DELETE FROM tasks_partitioned p WHERE p.id > :last_id AND p.id <= :upper "
+                    "AND NOT EXISTS (SELECT 1 FROM tasks t WHERE t.id = p.id)"
+                ),
+                {"last_id": last_id, "upper": last_id + batch_size},
+            )
+            await session.commit()
+            removed += result.rowcount
+            last_id += batch_size
+            print(f"  copied up to id {min(last_id, max_id)} / {max_id} ({copied} rows inserted)")
+
+        # Later rows are mirrored by the trigger; the swap checks only those under its lock
+        await session.execute(
+            text("INSERT INTO tasks_partition_backfill (backfilled_through) VALUES (:max_id)"),
+            {"max_id": max_id},
+        )
+        await session.commit()
+        print(f"✅ Backfill done: {copied} rows copied, {removed} stale rows removed")
+
+
+async def verify() -> bool:
+    """Check that the partitioned table matches the old one."""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(text(
+            f"SELECT count(*) FROM ("
+            f"  (SELECT {COLUMNS} FROM tasks EXCEPT SELECT {COLUMNS} FROM tasks_partitioned)"
+            f"  UNION ALL"
+            f"  (SELECT {COLUMNS} FROM tasks_partitioned EXCEPT SELECT {COLUMNS} FROM tasks)"
+            f") AS diff"
+        ))
+        mismatches = result.scalar_one()
+
+    if mismatches:
+        print(f"❌ {mismatches} rows differ between tasks and tasks_partitioned")
+        return False
+    print("✅ tasks and tasks_partitioned hold the same rows")
+    return True
+
+
+async def swap() -> bool:
+    """Swap the tables with the checks of migration 0004, after it skipped the swap."""
+    alembic_config = Config(str(ROOT / "alembic.ini"))
+    alembic_config.set_main_option("script_location", str(ROOT / "alembic"))
+    migration = ScriptDirectory.from_config(alembic_config).get_revision(SWAP_REVISION).module
+
+    async with engine.begin() as connection:
+        if not await connection.run_sync(migration.swap_pending):
+            print("✅ tasks is already partitioned")
+            return True
+        if await connection.run_sync(migration.backfilled_through) is None:
+            print("❌ Run `python scripts/partition_tasks.py backfill` first")
+            return False
+        await connection.run_sync(migration.swap_tables)
+    print("✅ tasks_partitioned swapped in; the old table is kept as tasks_unpartitioned")
+    return True
+
+
+class _CapturedStatement(Exception):
+    def __init__(self, statement: str, parameters):
+        self.statement = statement
+        self.parameters = parameters
+
+
+def _capture(conn, cursor, statement, parameters, context, executemany):
+    raise _CapturedStatement(statement, parameters)
+
+
+def _count_partitions(plan: dict) -> set:
+    relations = set()
+    name = plan.get("Relation Name")
+    if name:
+        relations.add(name)
+    for child in plan.get("Plans", []):
+        relations |= _count_partitions(child)
+    return relations
+
+
+async def explain(organization_id: int) -> bool:
+    """Run the repository's tenant-scoped queries under EXPLAIN and check pruning."""
+    queries = {
+        "get_by_id": lambda repo: repo.get_by_id(1, organization_id),
+        "get_all": lambda repo: repo.get_all(organization_id, skip=0, limit=20),
+        "count": lambda repo: repo.count(organization_id),
+        "get_by_status": lambda repo: repo.get_by_status(organization_id, TaskStatus.TODO),
+        "get_by_assignee": lambda repo: repo.get_by_assignee(organization_id, 1),
+    }
+
+    ok = True
+    async with AsyncSessionLocal() as session:
+        for name, run in queries.items():
+            # Capture the exact SQL the repository issues instead of executing it
+            event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+            try:
+                await run(TaskRepository(session))
+                raise RuntimeError(f"{name} did not execute a statement")
+            except _CapturedStatement as captured:
+                statement, parameters = captured.statement, captured.parameters
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+            await session.rollback()
+
+            connection = await session.connection()
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = result.scalar_one()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            partitions = {
+                rel for rel in _count_partitions(plan[0]["Plan"]) if rel.startswith("tasks_p")
+            }
+
+            if len(partitions) == 1:
+                print(f"✅ {name}: pruned to {partitions.pop()}")
+            else:
+                ok = False
+                print(f"❌ {name}: touches {len(partitions)} partitions {sorted(partitions)}")
+            await session.rollback()
+    return ok
+
+
+async def main(args) -> int:
+    try:
+        if args.command == "backfill":
+            await backfill(args.batch_size)
+            return 0
+        if args.command == "verify":
+            return 0 if await verify() else 1
+        if args.command == "swap":
+            return 0 if await swap() else 1
+        return 0 if await explain(args.organization_id) else 1
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    backfill_parser = subparsers.add_parser("backfill")
+    backfill_parser.add_argument("--batch-size", type=int, default=5000)
+    subparsers.add_parser("verify")
+    subparsers.add_parser("swap")
+    explain_parser = subparsers.add_parser("explain")
+    explain_parser.add_argument("--organization-id", type=int, required=True)
+
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,105 @@
+"""
+Local webhook receiver for exercising webhook delivery.
+
+Usage:
+    python scripts/webhook_stub_server.py [--port 9000] [--secret S] [--fail-rate 0.2] [--delay 0.1]
+    python scripts/webhook_stub_server.py --self-test 200 [--fail-rate 0.2]
+
+Register http://localhost:9000/hooks as an endpoint (with WEBHOOK_ALLOW_PRIVATE_HOSTS=true)
+and create tasks; each delivered batch is printed. With --secret, signatures are verified
+(401 on mismatch). --self-test sends batches through the delivery engine to an in-process
+stub and prints the delivery metrics, without Celery or a database.
+"""
+import argparse
+import asyncio
+import hmac
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def make_handler(secret: str | None, fail_rate: float, delay: float, quiet: bool):
+    class WebhookHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if delay:
+                time.sleep(delay)
+
+            if secret is not None:
+                from app.workers.webhook_delivery import sign_payload
+                expected = sign_payload(secret, self.headers.get("X-Webhook-Timestamp", ""), body)
+                if not hmac.compare_digest(expected, self.headers.get("X-Webhook-Signature", "")):
+                    self.send_response(401)
+                    self.end_headers()
+                    return
+
+            if random.random() < fail_rate:
+                self.send_response(503)
+                self.end_headers()
+                return
+
+            if not quiet:
+                events = json.loads(body)["events"]
+                print(f"📨 {self.headers.get('X-Webhook-Id')}: {len(events)} events")
+                for event in events:
+                    print(f"   {event.get('type')} task={event.get('task_id')} org={event.get('organization_id')}")
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return WebhookHandler
+
+
+async def self_test(port: int, batches: int, secret: str):
+    """Deliver batches concurrently through the engine and report the metrics it recorded."""
+    from app.core.metrics import metrics
+    from app.workers.webhook_delivery import webhook_engine
+
+    url = f"http://127.0.0.1:{port}/hooks"
+    events = [{"type": "task.created", "task_id": i, "organization_id": 1} for i in range(10)]
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        webhook_engine.deliver(1, url, secret, events) for _ in range(batches)
+    ))
+    elapsed = time.perf_counter() - started
+    await webhook_engine.close()
+
+    delivered = sum(1 for result in results if result.ok)
+    print(f"✅ {delivered}/{batches} batches delivered in {elapsed:.2f}s")
+    print(json.dumps(metrics.snapshot(), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--secret", default=None, help="Verify signatures with this endpoint secret")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before answering")
+    parser.add_argument("--self-test", type=int, default=0, metavar="BATCHES")
+    args = parser.parse_args()
+
+    secret = args.secret or ("stub-secret" if args.self_test else None)
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", args.port),
+        make_handler(secret, args.fail_rate, args.delay, quiet=bool(args.self_test))
+    )
+
+    if args.self_test:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        asyncio.run(self_test(args.port, args.self_test, secret))
+        server.shutdown()
+    else:
+        print(f"🚀 Webhook stub listening on http://127.0.0.1:{args.port}/hooks")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -1,14 +1,18 @@
 """
 Pytest configuration and fixtures.
 """
+from itertools import count
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.core.database import Base, get_db
 from app.config import settings
+from app.models.task import Task
 
 # Test database URL (use in-memory SQLite for testing)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -22,6 +26,16 @@ TestSessionLocal = async_sessionmaker(
     test_engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# Task ids come from a PostgreSQL sequence, and SQLite cannot autoincrement the
+# composite (organization_id, id) key; number tasks created in tests here
+_task_ids = count(1)
+
+
+@event.listens_for(Task, "before_insert")
+def _assign_task_id(mapper, connection, task):
+    if task.id is None:
+        task.id = next(_task_ids)
+
 
 @pytest.fixture
 async def db_session():
@@ -34,6 +48,8 @@ async def db_session():
     
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    # Each test runs in its own event loop; don't carry the connection (and its thread) over
+    await test_engine.dispose()
 
 
 @pytest.fixture
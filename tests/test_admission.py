@@ -0,0 +1,166 @@
+"""
+Tests for the admission controller behind LoadSheddingMiddleware.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core.admission import (
+    AdmissionController,
+    Overloaded,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    _Waiter,
+    admission_controller,
+)
+
+
+def make_controller(**overrides) -> AdmissionController:
+    options = dict(
+        initial_limit=1,
+        min_limit=1,
+        max_limit=100,
+        queue_size=1,
+        queue_timeout=1.0,
+        tolerance=1.5,
+        smoothing=1.0,
+        window_seconds=60.0,
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+async def queue_request(controller: AdmissionController, priority: int) -> asyncio.Task:
+    """Start a request that waits for a slot and holds it until cancelled."""
+    async def run():
+        async with controller.admit(priority):
+            await asyncio.Event().wait()
+
+    task = asyncio.create_task(run())
+    await asyncio.sleep(0)
+    return task
+
+
+async def test_waiter_is_admitted_when_a_slot_frees():
+    controller = make_controller()
+    async with controller.admit():
+        waiter = await queue_request(controller, PRIORITY_NORMAL)
+        assert controller.queued == 1
+
+    await asyncio.sleep(0)
+    assert controller.queued == 0
+    assert controller.in_flight == 1
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert controller.in_flight == 0
+
+
+async def test_full_queue_rejects_same_priority():
+    controller = make_controller()
+    async with controller.admit():
+        waiter = await queue_request(controller, PRIORITY_NORMAL)
+        with pytest.raises(Overloaded) as exc:
+            async with controller.admit(PRIORITY_NORMAL):
+                pass
+        assert exc.value.reason == "queue_full"
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+
+async def test_higher_priority_displaces_newest_lower_priority_waiter():
+    controller = make_controller(queue_size=2)
+    async with controller.admit():
+        normal = await queue_request(controller, PRIORITY_NORMAL)
+        low = await queue_request(controller, PRIORITY_LOW)
+        high = await queue_request(controller, PRIORITY_HIGH)
+
+        with pytest.raises(Overloaded) as exc:
+            await low
+        assert exc.value.reason == "displaced"
+        assert not normal.done()
+        assert controller.queued == 2
+
+    # The high-priority request was queued last but is served first
+    await asyncio.sleep(0)
+    assert not high.done() and controller.in_flight == 1 and controller.queued == 1
+    for task in (normal, high):
+        task.cancel()
+    await asyncio.gather(normal, high, return_exceptions=True)
+    assert controller.in_flight == 0 and controller.queued == 0
+
+
+async def test_waiter_times_out_and_leaves_the_queue():
+    controller = make_controller(queue_timeout=0.01)
+    async with controller.admit():
+        with pytest.raises(Overloaded) as exc:
+            async with controller.admit():
+                pass
+        assert exc.value.reason == "queue_timeout"
+        assert controller.queued == 0
+    assert controller.in_flight == 0
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    controller = make_controller()
+    async with controller.admit():
+        waiter = await queue_request(controller, PRIORITY_NORMAL)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert controller.queued == 0
+        assert controller.in_flight == 1
+    assert controller.in_flight == 0
+
+
+async def test_slot_handed_to_an_abandoning_waiter_is_passed_on():
+    controller = make_controller(queue_size=2)
+    loop = asyncio.get_running_loop()
+    controller._take_slot()
+    first = _Waiter(PRIORITY_NORMAL, 0, loop.create_future())
+    second = _Waiter(PRIORITY_NORMAL, 1, loop.create_future())
+    controller._queue.extend([first, second])
+
+    # The slot is handed to the first waiter in the same tick it times out
+    controller._release(0.01)
+    assert first.future.done() and controller.in_flight == 1
+    controller._abandon(first)
+
+    assert second.future.done() and second.future.exception() is None
+    assert controller.in_flight == 1
+    assert controller.queued == 0
+
+
+def test_limit_shrinks_when_latency_rises():
+    controller = make_controller(initial_limit=10, window_seconds=0)
+    controller._record(0.01)
+    assert controller.limit == 10
+
+    controller._record(1.0)
+    assert controller.min_limit <= controller.limit < 10
+
+
+def test_limit_grows_only_while_it_is_used():
+    controller = make_controller(initial_limit=10, window_seconds=0)
+    controller._record(0.01)
+
+    controller._record(0.01)
+    assert controller.limit == 10
+
+    controller._window_peak = 10
+    controller._record(0.01)
+    assert 10 < controller.limit <= controller.max_limit
+
+
+async def test_shed_response_carries_cors_headers(client, monkeypatch):
+    @asynccontextmanager
+    async def overloaded(priority):
+        raise Overloaded("queue_full")
+        yield
+
+    monkeypatch.setattr(admission_controller, "admit", overloaded)
+    response = await client.get("/api/v1/tasks", headers={"Origin": "http://example.test"})
+
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+    assert "access-control-allow-origin" in response.headers
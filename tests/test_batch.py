@@ -0,0 +1,154 @@
+"""
+Tests for POST /api/v1/batch.
+"""
+import pytest
+from sqlalchemy import select
+
+from app.api.deps import get_current_user
+from app.config import settings
+import app.core.database as database
+from app.core.database import get_db, shard_router
+from app.core.tenant_limiter import tenant_limiter
+from app.main import app
+from app.models.organization import Organization
+from app.models.task import Task
+from app.models.user import User, UserRole
+from app.services.task_service import TaskService
+from tests.conftest import TestSessionLocal
+
+BATCH_URL = "/api/v1/batch"
+
+
+@pytest.fixture
+async def organization(db_session):
+    org = Organization(id=1, name="Acme", slug="acme")
+    db_session.add(org)
+    db_session.add(User(id=1, email="a@acme.test", hashed_password="x", role=UserRole.ADMIN, organization_id=1))
+    await db_session.commit()
+    return org
+
+
+@pytest.fixture
+async def tasks(db_session, organization):
+    created = [Task(title=f"task {n}", organization_id=organization.id) for n in range(2)]
+    db_session.add_all(created)
+    await db_session.commit()
+    return created
+
+
+@pytest.fixture
+def sessions_opened(client, monkeypatch):
+    """Authenticate as the seeded admin and count the sessions the real get_db opens."""
+    monkeypatch.setattr(settings, "TASK_HISTORY_ENABLED", False)
+    opened = []
+
+    def sessionmaker(shard_key):
+        def open_session():
+            session = TestSessionLocal()
+            opened.append(session)
+            return session
+        return open_session
+
+    async def override_get_current_user():
+        return User(id=1, email="a@acme.test", role=UserRole.ADMIN, organization_id=1, token_version=0)
+
+    monkeypatch.setattr(shard_router, "sessionmaker", sessionmaker)
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    return opened
+
+
+async def run_batch(client, *requests):
+    response = await client.post(BATCH_URL, json={"requests": list(requests)})
+    assert response.status_code == 200
+    return response.json()["responses"]
+
+
+async def test_requests_run_in_order(client, tasks, sessions_opened):
+    task_id = tasks[0].id
+    responses = await run_batch(
+        client,
+        {"id": "rename", "method": "PATCH", "path": f"/api/v1/tasks/{task_id}", "body": {"title": "renamed"}},
+        {"id": "read", "path": f"/api/v1/tasks/{task_id}"},
+        {"id": "delete", "method": "DELETE", "path": f"/api/v1/tasks/{task_id}"},
+        {"id": "gone", "path": f"/api/v1/tasks/{task_id}"},
+    )
+
+    assert [item["id"] for item in responses] == ["rename", "read", "delete", "gone"]
+    assert [item["status"] for item in responses] == [200, 200, 204, 404]
+    assert responses[1]["body"]["title"] == "renamed"
+
+
+async def test_writes_share_the_batch_session(client, tasks, sessions_opened):
+    responses = await run_batch(
+        client,
+        *({"method": "PATCH", "path": f"/api/v1/tasks/{task.id}", "body": {"title": "x"}} for task in tasks)
+    )
+
+    assert [item["status"] for item in responses] == [200, 200]
+    # Only the batch's own session: sequential writes reuse it
+    assert len(sessions_opened) == 1
+
+
+async def test_concurrent_reads_get_their_own_sessions(client, tasks, sessions_opened):
+    responses = await run_batch(client, *({"path": f"/api/v1/tasks/{task.id}"} for task in tasks))
+
+    assert [item["status"] for item in responses] == [200, 200]
+    assert len(sessions_opened) == 1 + len(tasks)
+
+
+@pytest.mark.parametrize("tenant_limit, expected_sessions", [(2, 3), (1, 1)])
+async def test_reads_run_on_the_capacity_the_batch_holds(
+    client, tasks, sessions_opened, monkeypatch, tenant_limit, expected_sessions
+):
+    # The batch takes the tenant's whole limit; its reads must not wait for more
+    monkeypatch.setattr(database, "get_request_organization_id", lambda request: 1)
+    monkeypatch.setattr(tenant_limiter, "default_limit", tenant_limit)
+    monkeypatch.setattr(tenant_limiter, "timeout", 0.1)
+
+    responses = await run_batch(client, *({"path": f"/api/v1/tasks/{task.id}"} for task in tasks))
+
+    assert [item["status"] for item in responses] == [200, 200]
+    # Without spare capacity the reads run one by one on the batch's session
+    assert len(sessions_opened) == expected_sessions
+    assert tenant_limiter.in_use(1) == 0
+
+
+async def test_shared_session_is_rolled_back_after_a_server_error(client, db_session, tasks, sessions_opened, monkeypatch):
+    update_task = TaskService.update_task
+
+    async def failing_update(self, task_id, organization_id, data, actor_id=None):
+        if data.title == "boom":
+            self.db.add(Task(title="half-written", organization_id=organization_id))
+            await self.db.flush()
+            raise RuntimeError("boom")
+        return await update_task(self, task_id, organization_id, data, actor_id=actor_id)
+
+    monkeypatch.setattr(TaskService, "update_task", failing_update)
+    responses = await run_batch(
+        client,
+        {"method": "PATCH", "path": f"/api/v1/tasks/{tasks[0].id}", "body": {"title": "boom"}},
+        {"method": "PATCH", "path": f"/api/v1/tasks/{tasks[1].id}", "body": {"title": "after"}},
+    )
+
+    assert [item["status"] for item in responses] == [500, 200]
+    titles = (await db_session.execute(select(Task.title).execution_options(populate_existing=True))).scalars().all()
+    assert "half-written" not in titles
+    assert "after" in titles
+
+
+@pytest.mark.parametrize(
+    "item, expected_status",
+    [
+        ({"path": "/health"}, 400),
+        ({"method": "POST", "path": "/api/v1/batch", "body": {"requests": []}}, 400),
+        ({"path": "/api/v1/unknown"}, 404),
+        ({"method": "DELETE", "path": "/api/v1/tasks"}, 405),
+        ({"method": "POST", "path": "/api/v1/tasks", "body": {}}, 422),
+    ],
+)
+async def test_invalid_items_fail_alone(client, tasks, sessions_opened, item, expected_status):
+    responses = await run_batch(client, item, {"path": f"/api/v1/tasks/{tasks[0].id}"})
+
+    assert responses[0]["status"] == expected_status
+    assert responses[1]["status"] == 200
@@ -0,0 +1,33 @@
+"""
+Tests for the chunked maintenance jobs.
+"""
+from datetime import datetime, timedelta, timezone
+
+from app.models.organization import Organization
+from app.models.task import Task, TaskStatus
+from app.workers.maintenance import StaleTaskRollup
+
+
+async def test_stale_rollup_counts_chunks_in_sql(db_session, monkeypatch):
+    db_session.add(Organization(id=1, name="Acme", slug="acme"))
+    old = datetime.now(timezone.utc) - timedelta(days=365)
+    db_session.add_all([
+        Task(title="stale", organization_id=1, updated_at=old),
+        Task(title="done", organization_id=1, status=TaskStatus.DONE, updated_at=old),
+        Task(title="fresh", organization_id=1),
+        Task(title="stale", organization_id=1, updated_at=old),
+        Task(title="stale", organization_id=1, updated_at=old),
+    ])
+    await db_session.commit()
+    job = StaleTaskRollup()
+    monkeypatch.setattr(job, "chunk_size", 2)
+
+    chunks = []
+    after_id = 0
+    while True:
+        after_id, counters = await job.next_chunk(db_session, 1, after_id)
+        if after_id is None:
+            break
+        chunks.append(counters["stale"])
+
+    assert chunks == [2, 1]
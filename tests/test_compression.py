@@ -0,0 +1,93 @@
+"""
+Tests for response compression and Accept-Encoding negotiation.
+"""
+import gzip
+
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.config import settings
+from app.middleware.compression import CompressionMiddleware, negotiate_encoding
+
+LARGE = "x" * 4096
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip", "gzip"),
+    ("br, gzip", "br"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("gzip;q=0, br", "br"),
+    ("*", "zstd"),
+    ("*, zstd;q=0", "br"),
+    ("identity", None),
+    ("gzip;q=0", None),
+    ("GZIP ; q=0.8", "gzip"),
+    ("gzip;q=bogus, br", "br"),
+    ("", None),
+])
+def test_negotiation_honours_q_values_then_server_preference(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, ["zstd", "br", "gzip"]) == expected
+
+
+async def stream(request):
+    async def chunks():
+        for _ in range(3):
+            yield LARGE
+    return StreamingResponse(chunks(), media_type="application/json")
+
+
+@pytest.fixture
+async def raw_client(monkeypatch):
+    # brotli and zstandard are optional; pin the server to gzip so results do not depend on them
+    monkeypatch.setattr(settings, "COMPRESSION_ALGORITHMS", ["gzip"])
+    compressed_app = Starlette(routes=[
+        Route("/large", lambda request: PlainTextResponse(LARGE)),
+        Route("/small", lambda request: JSONResponse({"ok": True})),
+        Route("/binary", lambda request: PlainTextResponse(LARGE, media_type="application/octet-stream")),
+        Route("/events", lambda request: PlainTextResponse(LARGE, media_type="text/event-stream")),
+        Route("/stream", stream),
+    ])
+    compressed_app.add_middleware(CompressionMiddleware)
+    async with AsyncClient(app=compressed_app, base_url="http://test") as client:
+        yield client
+
+
+async def get_raw(client: AsyncClient, path: str, accept_encoding: str):
+    """Fetch without letting httpx decode the body."""
+    async with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        body = b"".join([chunk async for chunk in response.aiter_raw()])
+    return response, body
+
+
+async def test_large_text_is_gzipped(raw_client):
+    response, body = await get_raw(raw_client, "/large", "gzip, br;q=0.5")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert int(response.headers["content-length"]) == len(body)
+    assert gzip.decompress(body).decode() == LARGE
+
+
+@pytest.mark.parametrize("path, accept_encoding", [
+    ("/small", "gzip"),
+    ("/binary", "gzip"),
+    ("/events", "gzip"),
+    ("/large", "identity"),
+    ("/large", "br"),
+])
+async def test_responses_pass_through_unencoded(raw_client, path, accept_encoding):
+    response, body = await get_raw(raw_client, path, accept_encoding)
+
+    assert "content-encoding" not in response.headers
+    assert body == (b'{"ok":true}' if path == "/small" else LARGE.encode())
+
+
+async def test_streaming_response_is_compressed_chunk_by_chunk(raw_client):
+    response, body = await get_raw(raw_client, "/stream", "gzip")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(body).decode() == LARGE * 3
@@ -0,0 +1,36 @@
+"""
+Tests for the /metrics endpoint and per-tenant metric labels.
+"""
+import pytest
+
+from app.config import settings
+from app.core.metrics import MetricsRegistry
+
+
+async def test_metrics_not_served_without_a_configured_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    response = await client.get("/metrics")
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong", "Basic s3cret"])
+async def test_metrics_rejects_missing_or_wrong_token(client, monkeypatch, authorization):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    headers = {"Authorization": authorization} if authorization else {}
+    response = await client.get("/metrics", headers=headers)
+    assert response.status_code == 401
+
+
+async def test_metrics_served_with_the_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    response = await client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert set(response.json()) == {"counters", "gauges", "summaries"}
+
+
+def test_tenant_labels_are_capped():
+    registry = MetricsRegistry(tenant_label_limit=2, pinned_tenants=[99])
+
+    assert [registry.tenant_label(org) for org in (1, 2, 3, 1)] == ["1", "2", "other", "1"]
+    # Pinned tenants keep their own series whatever the cap
+    assert registry.tenant_label(99) == "99"
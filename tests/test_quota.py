@@ -0,0 +1,116 @@
+"""
+Tests for the Redis sliding-window request quota.
+"""
+import time
+
+import pytest
+import redis.asyncio as redis
+
+from app.config import settings
+from app.core.quota import SLIDING_WINDOW_LUA, SlidingWindowQuota
+
+
+def make_quota(limit: int = 100, batch_size: int = 5, headroom: float = 0.2) -> SlidingWindowQuota:
+    return SlidingWindowQuota(
+        window_seconds=60,
+        plan_limits={"free": limit},
+        default_plan="free",
+        local_batch_size=batch_size,
+        local_headroom_ratio=headroom,
+    )
+
+
+class FakeScript:
+    """Stands in for the registered Lua script: records calls and answers with preset results."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+async def test_locally_admitted_requests_are_charged_on_the_next_redis_call():
+    quota = make_quota(limit=100, batch_size=3)
+    quota._script = FakeScript([1, 1], [1, 5])
+
+    assert (await quota.charge("org:1", "free")).allowed
+    for _ in range(3):
+        assert (await quota.charge("org:1", "free")).allowed
+    decision = await quota.charge("org:1", "free")
+
+    assert decision.allowed and decision.remaining == 95
+    (first_keys, first_args), (keys, args) = quota._script.calls
+    # Both windows of a key share a cluster hash slot
+    assert keys[0].startswith("quota:{org:1}:") and keys[1].startswith("quota:{org:1}:")
+    assert first_args[3] == 0 and args[3] == 3
+
+
+async def test_rejection_blocks_the_key_locally():
+    quota = make_quota(limit=10)
+    quota._script = FakeScript([0, 10])
+
+    first = await quota.charge("org:1", "free")
+    second = await quota.charge("org:1", "free")
+
+    assert not first.allowed and not second.allowed
+    assert second.remaining == 0
+    assert len(quota._script.calls) == 1
+
+
+async def test_redis_failure_fails_open_and_keeps_pending_charges():
+    quota = make_quota(limit=100, batch_size=2)
+    quota._script = FakeScript([1, 1], ConnectionError("down"), [1, 4])
+    await quota.charge("org:1", "free")
+    for _ in range(2):
+        await quota.charge("org:1", "free")
+
+    assert (await quota.charge("org:1", "free")).allowed
+    assert (await quota.charge("org:1", "free")).allowed
+
+    # The requests admitted before the outage are charged once Redis answers again
+    assert quota._script.calls[2][1][3] == 2
+
+
+@pytest.fixture
+async def redis_client():
+    client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    try:
+        await client.ping()
+    except (redis.ConnectionError, OSError):
+        await client.close()
+        pytest.skip("Redis is not reachable at REDIS_URL")
+    prefix = f"test-quota:{time.time_ns()}"
+    yield client, prefix
+    keys = await client.keys(f"{prefix}:*")
+    if keys:
+        await client.delete(*keys)
+    await client.close()
+
+
+async def test_lua_script_weights_the_previous_window(redis_client):
+    client, prefix = redis_client
+    script = client.register_script(SLIDING_WINDOW_LUA)
+    current, previous = f"{prefix}:current", f"{prefix}:previous"
+    await client.set(previous, 10)
+
+    # A quarter into the window, 75% of the previous window still counts: 7 used
+    assert await script(keys=[current, previous], args=[10, 1000, 250, 0]) == [1, 8]
+    assert await script(keys=[current, previous], args=[10, 1000, 250, 0]) == [1, 9]
+    assert await script(keys=[current, previous], args=[10, 1000, 250, 0]) == [1, 10]
+    assert await script(keys=[current, previous], args=[10, 1000, 250, 0]) == [0, 10]
+
+
+async def test_lua_script_charges_pending_requests_even_when_rejecting(redis_client):
+    client, prefix = redis_client
+    script = client.register_script(SLIDING_WINDOW_LUA)
+    current, previous = f"{prefix}:current", f"{prefix}:previous"
+
+    assert await script(keys=[current, previous], args=[5, 1000, 0, 5]) == [0, 5]
+    assert int(await client.get(current)) == 5
+    assert 0 < await client.pttl(current) <= 2000
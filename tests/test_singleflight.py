@@ -0,0 +1,33 @@
+"""
+Tests for single-flight coalescing of service reads.
+"""
+import asyncio
+
+from app.core.singleflight import singleflight
+
+
+class Reader:
+    def __init__(self):
+        self.calls = []
+
+    @singleflight("test.read", lambda item_id, organization_id: ("item", organization_id, item_id))
+    async def read(self, item_id: int, organization_id: int) -> tuple:
+        self.calls.append((organization_id, item_id))
+        await asyncio.sleep(0.01)
+        return organization_id, item_id
+
+
+async def test_identical_calls_share_one_read():
+    reader = Reader()
+    results = await asyncio.gather(reader.read(1, 7), reader.read(1, organization_id=7))
+
+    assert results == [(7, 1), (7, 1)]
+    assert reader.calls == [(7, 1)]
+
+
+async def test_key_separates_tenants():
+    reader = Reader()
+    results = await asyncio.gather(reader.read(1, 7), reader.read(1, 8))
+
+    assert results == [(7, 1), (8, 1)]
+    assert sorted(reader.calls) == [(7, 1), (8, 1)]
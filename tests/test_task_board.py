@@ -0,0 +1,70 @@
+"""
+Tests for the task board and its column cursors.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.api.deps import get_current_user
+from app.main import app
+from app.models.organization import Organization
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.models.user import User, UserRole
+from app.services.task_service import TaskService
+from app.utils.pagination import decode_cursor, encode_cursor
+
+T0 = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def board(db_session):
+    """Four to-do tasks in board order: high first, then the most recently updated."""
+    db_session.add(Organization(id=1, name="Acme", slug="acme"))
+    db_session.add_all([
+        Task(title="low", organization_id=1, priority=TaskPriority.LOW, updated_at=T0),
+        Task(title="high", organization_id=1, priority=TaskPriority.HIGH, updated_at=T0 - timedelta(days=1)),
+        Task(title="medium new", organization_id=1, priority=TaskPriority.MEDIUM, updated_at=T0),
+        Task(title="medium old", organization_id=1, priority=TaskPriority.MEDIUM, updated_at=T0 - timedelta(hours=1)),
+        Task(title="done", organization_id=1, status=TaskStatus.DONE, updated_at=T0),
+    ])
+    await db_session.commit()
+
+
+async def test_column_cursor_continues_the_board(db_session, board):
+    service = TaskService(db_session)
+    first = await service.get_board(1, per_column=2)
+    todo = next(column for column in first.columns if column.status == TaskStatus.TODO)
+    assert [item.title for item in todo.items] == ["high", "medium new"]
+    assert todo.total == 4
+
+    titles, cursor = [], todo.next_cursor
+    while cursor:
+        column = await service.get_board_column(1, TaskStatus.TODO, cursor, limit=1)
+        titles += [item.title for item in column.items]
+        cursor = column.next_cursor
+
+    assert titles == ["medium old", "low"]
+
+
+def test_board_cursor_carries_the_sort_key():
+    priority, updated_at, task_id = decode_cursor(encode_cursor(["high", T0.isoformat(), 3]))
+
+    assert (TaskPriority(priority), datetime.fromisoformat(updated_at), task_id) == (TaskPriority.HIGH, T0, 3)
+
+
+@pytest.mark.parametrize("cursor", [
+    "%%%",
+    encode_cursor({"priority": "high"}),
+    encode_cursor(["urgent", T0.isoformat(), 1]),
+    encode_cursor(["high", "yesterday", 1]),
+    encode_cursor(["high", T0.isoformat()]),
+])
+async def test_malformed_column_cursor_is_a_bad_request(client, board, cursor):
+    async def override_get_current_user():
+        return User(id=1, email="a@acme.test", role=UserRole.ADMIN, organization_id=1, token_version=0)
+
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    response = await client.get("/api/v1/tasks/board/todo", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
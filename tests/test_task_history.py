@@ -0,0 +1,68 @@
+"""
+Tests for the buffered task history writer.
+"""
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+import app.core.task_history as task_history
+from app.core.metrics import metrics
+from app.core.sharding import TenantPlacement
+from app.core.task_history import TaskHistoryWriter, shard_router
+
+
+@pytest.fixture
+def failing_insert(monkeypatch):
+    """Route every organization to one shard and make its insert raise the given error."""
+    failure = {}
+
+    async def resolve(organization_id):
+        return TenantPlacement(shard_key="default")
+
+    @asynccontextmanager
+    async def session():
+        yield None
+
+    class Repository:
+        def __init__(self, session):
+            pass
+
+        async def insert_many(self, events, batch_size):
+            raise failure["error"]
+
+    monkeypatch.setattr(shard_router, "resolve", resolve)
+    monkeypatch.setattr(shard_router, "sessionmaker", lambda shard_key: session)
+    monkeypatch.setattr(task_history, "TaskEventRepository", Repository)
+    metrics.reset()
+    return failure
+
+
+def dropped() -> float:
+    return sum(c["value"] for c in metrics.snapshot()["counters"] if c["name"] == "task_history_dropped_total")
+
+
+def writer_with_events(count: int) -> TaskHistoryWriter:
+    writer = TaskHistoryWriter()
+    writer._buffer = [{"organization_id": 1, "task_id": n, "event_type": "updated"} for n in range(count)]
+    return writer
+
+
+async def test_transient_failure_is_retried(failing_insert):
+    failing_insert["error"] = OperationalError("INSERT", {}, ConnectionResetError())
+    writer = writer_with_events(2)
+
+    await writer.flush()
+
+    assert len(writer._buffer) == 2
+    assert dropped() == 0
+
+
+async def test_rejected_events_are_dropped(failing_insert):
+    failing_insert["error"] = IntegrityError("INSERT", {}, Exception("no partition of relation \"task_events\""))
+    writer = writer_with_events(2)
+
+    await writer.flush()
+
+    assert writer._buffer == []
+    assert dropped() == 2
@@ -0,0 +1,115 @@
+"""
+Tests for delta sync (GET /api/v1/tasks/changes): sync tokens and the watermark.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.api.deps import get_current_user
+from app.main import app
+from app.models.organization import Organization
+from app.models.task import Task
+from app.models.user import User, UserRole
+from app.repositories.task_repository import TaskRepository
+from app.services.task_service import TaskService
+from app.utils.sync import (
+    EPOCH,
+    InvalidSyncToken,
+    SyncCursor,
+    SyncTokenExpired,
+    decode_sync_token,
+    encode_sync_token,
+)
+
+T0 = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def organization(db_session):
+    db_session.add(Organization(id=1, name="Acme", slug="acme"))
+    await db_session.commit()
+
+
+@pytest.fixture
+def watermark(monkeypatch):
+    """Pin the sync watermark: changes at or after it are left for a later call."""
+    current = {"until": T0}
+
+    async def get_sync_watermark(self, lag):
+        return current["until"]
+
+    monkeypatch.setattr(TaskRepository, "get_sync_watermark", get_sync_watermark)
+    return current
+
+
+async def add_task(db_session, title: str, updated_at: datetime) -> Task:
+    task = Task(title=title, organization_id=1, updated_at=updated_at)
+    db_session.add(task)
+    await db_session.commit()
+    return task
+
+
+def test_sync_token_round_trip():
+    cursor = SyncCursor(updated_at=T0, task_id=7, deleted_at=T0 + timedelta(seconds=1), tombstone_id=3)
+
+    assert decode_sync_token(encode_sync_token(cursor)) == cursor
+    assert decode_sync_token(None).is_initial
+    assert decode_sync_token(None).deleted_at == EPOCH
+
+
+@pytest.mark.parametrize("token", ["not-a-token", "WzEsMl0", encode_sync_token(SyncCursor())[:-3]])
+def test_malformed_sync_token_is_rejected(token):
+    with pytest.raises(InvalidSyncToken):
+        decode_sync_token(token)
+
+
+async def test_changes_stop_at_the_watermark_and_resume_there(db_session, organization, watermark):
+    await add_task(db_session, "early", T0 - timedelta(minutes=2))
+    await add_task(db_session, "settled", T0 - timedelta(minutes=1))
+    await add_task(db_session, "in flight", T0 + timedelta(seconds=1))
+    service = TaskService(db_session)
+
+    first = await service.get_changes(1, None, limit=10)
+    assert [task.title for task in first.changed] == ["early", "settled"]
+    assert not first.has_more
+    # A drained feed resumes from the watermark, not from its last row
+    assert decode_sync_token(first.next_token).updated_at == T0
+
+    watermark["until"] = T0 + timedelta(minutes=1)
+    second = await service.get_changes(1, first.next_token, limit=10)
+    assert [task.title for task in second.changed] == ["in flight"]
+
+
+async def test_changes_are_paged_by_updated_at_and_id(db_session, organization, watermark):
+    same_time = T0 - timedelta(minutes=1)
+    for title in ("a", "b", "c"):
+        await add_task(db_session, title, same_time)
+    service = TaskService(db_session)
+
+    titles, token = [], None
+    while True:
+        page = await service.get_changes(1, token, limit=2)
+        titles += [task.title for task in page.changed]
+        token = page.next_token
+        if not page.has_more:
+            break
+
+    assert titles == ["a", "b", "c"]
+
+
+async def test_token_older_than_tombstone_retention_expires(db_session, organization, watermark):
+    long_ago = T0 - timedelta(days=90)
+    stale = encode_sync_token(SyncCursor(updated_at=long_ago, task_id=1, deleted_at=long_ago))
+
+    with pytest.raises(SyncTokenExpired):
+        await TaskService(db_session).get_changes(1, stale, limit=10)
+
+
+async def test_invalid_token_is_a_bad_request(client, organization):
+    async def override_get_current_user():
+        return User(id=1, email="a@acme.test", role=UserRole.ADMIN, organization_id=1, token_version=0)
+
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    response = await client.get("/api/v1/tasks/changes", params={"since": "not-a-token"})
+
+    assert response.status_code == 400
@@ -0,0 +1,79 @@
+"""
+Tests for the per-tenant database concurrency limiter.
+"""
+import asyncio
+
+import pytest
+
+from app.core.tenant_limiter import TenantConcurrencyLimiter, TenantLimitExceeded
+
+
+def make_limiter(limit: int = 2, timeout: float = 1.0) -> TenantConcurrencyLimiter:
+    return TenantConcurrencyLimiter(default_limit=limit, overrides={}, timeout=timeout)
+
+
+async def hold(limiter: TenantConcurrencyLimiter, weight: int, order: list, release: asyncio.Event) -> None:
+    async with limiter.acquire(1, weight):
+        order.append(weight)
+        await release.wait()
+
+
+async def test_waiters_are_served_in_arrival_order():
+    limiter = make_limiter(limit=2)
+    release = asyncio.Event()
+    order = []
+    async with limiter.acquire(1, 1):
+        heavy = asyncio.create_task(hold(limiter, 2, order, release))
+        await asyncio.sleep(0)
+        light = asyncio.create_task(hold(limiter, 1, order, release))
+        await asyncio.sleep(0.01)
+        # The light waiter would fit next to the holder, but the heavy one came first
+        assert order == []
+
+    await asyncio.sleep(0.01)
+    assert order == [2]
+    release.set()
+    await asyncio.gather(heavy, light)
+    assert order == [2, 1]
+    assert limiter.in_use(1) == 0
+    assert limiter._tenants == {}
+
+
+async def test_weight_is_capped_at_the_tenant_limit():
+    limiter = make_limiter(limit=2)
+    async with limiter.acquire(1, 5) as held:
+        assert held == 2
+        assert limiter.in_use(1) == 2
+
+
+async def test_timed_out_waiter_is_dropped_and_unblocks_the_queue():
+    limiter = make_limiter(limit=2, timeout=0.01)
+    release = asyncio.Event()
+    order = []
+    async with limiter.acquire(1, 1):
+        light = asyncio.create_task(hold(limiter, 1, order, release))
+        with pytest.raises(TenantLimitExceeded):
+            async with limiter.acquire(1, 2):
+                pass
+        release.set()
+        await light
+    assert order == [1]
+    assert limiter._tenants == {}
+
+
+async def test_idle_tenant_is_dropped_after_a_timeout():
+    limiter = make_limiter(limit=1, timeout=0.01)
+    holder = asyncio.Event()
+
+    async def occupy():
+        async with limiter.acquire(1):
+            await holder.wait()
+
+    task = asyncio.create_task(occupy())
+    await asyncio.sleep(0)
+    with pytest.raises(TenantLimitExceeded):
+        async with limiter.acquire(1):
+            pass
+    holder.set()
+    await task
+    assert limiter._tenants == {}
@@ -0,0 +1,54 @@
+"""
+Tests for webhook delivery: destination checks and the per-endpoint circuit breaker.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from app.config import settings
+from app.workers.webhook_delivery import WebhookDeliveryEngine
+
+
+def half_open(engine: WebhookDeliveryEngine, endpoint_id: int):
+    breaker = engine._breaker(endpoint_id)
+    breaker.failures = settings.WEBHOOK_CIRCUIT_FAILURE_THRESHOLD
+    breaker.opened_at = time.monotonic() - settings.WEBHOOK_CIRCUIT_RESET_SECONDS - 1
+    return breaker
+
+
+def test_api_does_not_import_the_delivery_engine():
+    code = "import sys, app.main; print(sorted(m for m in ('httpx', 'celery', 'app.workers') if m in sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=os.environ.copy()
+    ).stdout
+    assert output.strip() == "[]"
+
+
+async def test_blocked_trial_frees_the_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_ALLOW_PRIVATE_HOSTS", False)
+    engine = WebhookDeliveryEngine()
+    breaker = half_open(engine, 1)
+
+    result = await engine.deliver(1, "http://127.0.0.1/hook", "secret", [{"id": 1}])
+
+    assert not result.ok and not result.retryable
+    assert not breaker.trial_in_flight
+    # The next attempt (e.g. after the URL was fixed) gets its trial
+    assert breaker.allow()
+
+
+async def test_cancelled_trial_frees_the_breaker():
+    engine = WebhookDeliveryEngine()
+    breaker = half_open(engine, 1)
+
+    async def cancelled(*args):
+        raise asyncio.CancelledError
+
+    engine._send = cancelled
+    with pytest.raises(asyncio.CancelledError):
+        await engine.deliver(1, "https://hooks.example.com/", "secret", [])
+    assert not breaker.trial_in_flight